@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 import copy
+import functools
 from enum import Enum, unique
+import concurrent.futures
 import logging
 import json
-from collections import OrderedDict, Counter, deque
-from typing import Union, Optional, List, Set, Dict
+import os
+import threading
+from array import array
+from collections import OrderedDict, deque
+from itertools import zip_longest
+from typing import Union, Optional, List, Set, FrozenSet, Dict, Iterator, Tuple, NamedTuple, Callable
 import secrets
 import random
 
 from EntranceShuffle import door_addresses, indirect_connections
 from Utils import int16_as_bytes
-from Items import item_name_groups
+from Items import item_name_groups, item_ids, progressive_item_tiers
+from RuleObjects import always_accessible, allow_all_items, never_always_allow
 
 
 class World(object):
@@ -54,12 +61,20 @@ class World(object):
         self.shops = []
         self.itempool = []
         self.seed = None
+        self.derived_from_seed = None
         self.precollected_items = []
         self.state = CollectionState(self)
         self._cached_entrances = None
         self._cached_locations = None
+        self._location_positions: Optional[Dict[Location, int]] = None
+        self._filled_locations: Dict[int, Set[Location]] = {}
+        self._unfilled_locations: Dict[int, Set[Location]] = {}
+        self._unfilled_dungeon_locations: Dict[int, Set[Location]] = {}
+        self._item_locations: Dict[Tuple[str, int], Set[Location]] = {}
+        self._progressive_tiers: Dict[int, Dict[str, ProgressiveTiers]] = {}
         self._entrance_cache = {}
         self._location_cache = {}
+        self._dungeon_cache: Dict[Tuple[str, int], Dungeon] = {}
         self.required_locations = []
         self.light_world_light_cone = False
         self.dark_world_light_cone = False
@@ -82,6 +97,8 @@ class World(object):
             def set_player_attr(attr, val):
                 self.__dict__.setdefault(attr, {})[player] = val
             set_player_attr('_region_cache', {})
+            set_player_attr('event_locations', {})
+            set_player_attr('event_log', [])
             set_player_attr('player_names', [])
             set_player_attr('remote_items', False)
             set_player_attr('required_medallions', ['Ether', 'Quake'])
@@ -152,6 +169,19 @@ class World(object):
         for region in regions if regions else self.regions:
             region.world = self
             self._region_cache[region.player][region.name] = region
+            for location in region.locations:
+                self.update_event_location(location)
+
+    def update_event_location(self, location: Location):
+        """Keeps event_locations, the filled event locations of each player, up to date. Locations that become events
+        are also appended to event_log, so each CollectionState can pick up the ones it hasn't seen yet."""
+        events = self.event_locations[location.player]
+        if location.event and location.item is not None:
+            if location not in events:
+                events[location] = None
+                self.event_log[location.player].append(location)
+        else:
+            events.pop(location, None)
 
     def _recache(self):
         """Rebuild world cache"""
@@ -164,6 +194,9 @@ class World(object):
             for r_location in region.locations:
                 self._location_cache[r_location.name, player] = r_location
 
+        for dungeon in self.dungeons:
+            self._dungeon_cache[dungeon.name, dungeon.player] = dungeon
+
     def get_regions(self, player=None):
         return self.regions if player is None else self._region_cache[player].values()
 
@@ -230,71 +263,71 @@ class World(object):
         raise KeyError('No such location %s for player %d' % (location, player))
 
     def get_dungeon(self, dungeonname: str, player: int) -> Dungeon:
-        for dungeon in self.dungeons:
-            if dungeon.name == dungeonname and dungeon.player == player:
-                return dungeon
-        raise KeyError('No such dungeon %s for player %d' % (dungeonname, player))
+        try:
+            return self._dungeon_cache[dungeonname, player]
+        except KeyError:
+            self._recache()
+            try:
+                return self._dungeon_cache[dungeonname, player]
+            except KeyError:
+                raise KeyError('No such dungeon %s for player %d' % (dungeonname, player))
 
     def _debug_get_dungeon(self, dungeonname: str, player: int) -> Dungeon:
         if type(dungeonname) != str:
             raise TypeError(f"expected str, got {type(dungeonname)} instead")
-        for dungeon in self.dungeons:
-            if dungeon.name == dungeonname and dungeon.player == player:
-                return dungeon
+        try:
+            return self._dungeon_cache[(dungeonname, player)]
+        except KeyError:
+            for dungeon in self.dungeons:
+                if dungeon.name == dungeonname and dungeon.player == player:
+                    self._dungeon_cache[(dungeonname, player)] = dungeon
+                    return dungeon
         raise KeyError('No such dungeon %s for player %d' % (dungeonname, player))
 
-    def get_all_state(self, keys=False) -> CollectionState:
+    def get_progressive_tiers(self, player: int) -> Dict[str, ProgressiveTiers]:
+        """Resolution table of the player's progressive items, by item name."""
+        tiers = self._progressive_tiers.get(player, None)
+        if tiers is None:
+            requirements = self.difficulty_requirements.get(player, None)
+            tiers = self._progressive_tiers[player] = {}
+            for item, (names, limit_name) in progressive_item_tiers.items():
+                limit = len(names)
+                if limit_name and requirements:
+                    limit = min(getattr(requirements, limit_name), limit)
+                    if limit_name == 'progressive_bow_limit' and (self.swords[player] == 'swordless' or
+                                                                  self.logic[player] == 'noglitches'):
+                        # the rom hands out silvers for ganon anyway, as they are needed to beat him in this logic
+                        limit = max(limit, 2)
+                tiers[item] = ProgressiveTiers(names, tuple(item_ids[name] for name in names), limit)
+        return tiers
+
+    def get_all_state(self, keys=False, player: Optional[int] = None) -> CollectionState:
+        """State with every item still in the pool, only those of player if given. A single player's all state is
+        enough to find what that player's own rules can reach, and costs the same no matter how many players there
+        are."""
         ret = CollectionState(self)
+        players = range(1, self.players + 1) if player is None else (player,)
+
+        progressive_tiers = {player: self.get_progressive_tiers(player) for player in range(1, self.players + 1)}
 
         def soft_collect(item):
-            if item.name.startswith('Progressive '):
-                if 'Sword' in item.name:
-                    if ret.has('Golden Sword', item.player):
-                        pass
-                    elif ret.has('Tempered Sword', item.player) and self.difficulty_requirements[
-                        item.player].progressive_sword_limit >= 4:
-                        ret.prog_items['Golden Sword', item.player] += 1
-                    elif ret.has('Master Sword', item.player) and self.difficulty_requirements[
-                        item.player].progressive_sword_limit >= 3:
-                        ret.prog_items['Tempered Sword', item.player] += 1
-                    elif ret.has('Fighter Sword', item.player) and self.difficulty_requirements[item.player].progressive_sword_limit >= 2:
-                        ret.prog_items['Master Sword', item.player] += 1
-                    elif self.difficulty_requirements[item.player].progressive_sword_limit >= 1:
-                        ret.prog_items['Fighter Sword', item.player] += 1
-                elif 'Glove' in item.name:
-                    if ret.has('Titans Mitts', item.player):
-                        pass
-                    elif ret.has('Power Glove', item.player):
-                        ret.prog_items['Titans Mitts', item.player] += 1
-                    else:
-                        ret.prog_items['Power Glove', item.player] += 1
-                elif 'Shield' in item.name:
-                    if ret.has('Mirror Shield', item.player):
-                        pass
-                    elif ret.has('Red Shield', item.player) and self.difficulty_requirements[item.player].progressive_shield_limit >= 3:
-                        ret.prog_items['Mirror Shield', item.player] += 1
-                    elif ret.has('Blue Shield', item.player)  and self.difficulty_requirements[item.player].progressive_shield_limit >= 2:
-                        ret.prog_items['Red Shield', item.player] += 1
-                    elif self.difficulty_requirements[item.player].progressive_shield_limit >= 1:
-                        ret.prog_items['Blue Shield', item.player] += 1
-                elif 'Bow' in item.name:
-                    if ret.has('Silver', item.player):
-                        pass
-                    elif ret.has('Bow', item.player) and self.difficulty_requirements[item.player].progressive_bow_limit >= 2:
-                        ret.prog_items['Silver Bow', item.player] += 1
-                    elif self.difficulty_requirements[item.player].progressive_bow_limit >= 1:
-                        ret.prog_items['Bow', item.player] += 1
+            tiers = progressive_tiers[item.player].get(item.name, None)
+            if tiers:
+                tier = ret.next_progressive_tier(tiers, item.player)
+                if tier:
+                    ret.prog_items.add(tier, item.player)
             elif item.name.startswith('Bottle'):
                 if ret.bottle_count(item.player) < self.difficulty_requirements[item.player].progressive_bottle_limit:
-                    ret.prog_items[item.name, item.player] += 1
+                    ret.prog_items.add(item.name, item.player)
             elif item.advancement or item.smallkey or item.bigkey:
-                ret.prog_items[item.name, item.player] += 1
+                ret.prog_items.add(item.name, item.player)
 
         for item in self.itempool:
-            soft_collect(item)
+            if player is None or item.player == player:
+                soft_collect(item)
 
         if keys:
-            for p in range(1, self.players + 1):
+            for p in players:
                 from Items import ItemFactory
                 for item in ItemFactory(
                         ['Small Key (Hyrule Castle)', 'Big Key (Eastern Palace)', 'Big Key (Desert Palace)',
@@ -310,15 +343,15 @@ class World(object):
                             'Small Key (Ganons Tower)'] * 4,
                         p):
                     soft_collect(item)
-        ret.sweep_for_events()
+        ret.sweep_for_events(players=players)
         return ret
 
     def get_items(self) -> list:
         return [loc.item for loc in self.get_filled_locations()] + self.itempool
 
     def find_items(self, item, player: int) -> list:
-        return [location for location in self.get_locations() if
-                location.item is not None and location.item.name == item and location.item.player == player]
+        self._index_locations()
+        return self._sort_locations(self._item_locations.get((item, player), ()))
 
     def push_precollected(self, item: Item):
         item.world = self
@@ -358,33 +391,93 @@ class World(object):
 
     def clear_location_cache(self):
         self._cached_locations = None
+        self._location_positions = None
+
+    def clear_player_cache(self, player: int):
+        """Forgets the regions, entrances, locations, dungeons and events cached for player."""
+        self._region_cache[player] = {}
+        self.event_locations[player] = {}
+        self.event_log[player] = []
+        for cache in (self._entrance_cache, self._location_cache, self._dungeon_cache):
+            for key in [key for key in cache if key[1] == player]:
+                del cache[key]
+        self.clear_entrance_cache()
+        self.clear_location_cache()
+
+    def _index_locations(self):
+        """Builds the filled, unfilled and item name indexes if needed, Location.item keeps them up to date after."""
+        if self._location_positions is None:
+            locations = self.get_locations()
+            self._location_positions = {location: position for position, location in enumerate(locations)}
+            self._filled_locations = {player: set() for player in self.player_ids}
+            self._unfilled_locations = {player: set() for player in self.player_ids}
+            self._unfilled_dungeon_locations = {player: set() for player in self.player_ids}
+            self._item_locations = {}
+            for location in locations:
+                self.update_location_item(location, None)
+
+    def update_location_item(self, location: Location, old_item: Optional[Item]):
+        if self._location_positions is None or location not in self._location_positions:
+            return
+        if old_item is not None:
+            item_locations = self._item_locations.get((old_item.name, old_item.player))
+            if item_locations:
+                item_locations.discard(location)
+        item = location.item
+        if item is None:
+            self._filled_locations[location.player].discard(location)
+            self._unfilled_locations[location.player].add(location)
+            if location.parent_region.dungeon:
+                self._unfilled_dungeon_locations[location.player].add(location)
+        else:
+            self._unfilled_locations[location.player].discard(location)
+            self._unfilled_dungeon_locations[location.player].discard(location)
+            self._filled_locations[location.player].add(location)
+            self._item_locations.setdefault((item.name, item.player), set()).add(location)
+
+    def _sort_locations(self, locations) -> list:
+        """Indexed locations in get_locations order."""
+        return sorted(locations, key=self._location_positions.__getitem__)
+
+    def _per_player(self, filled: bool, player: Optional[int]) -> list:
+        self._index_locations()
+        index = self._filled_locations if filled else self._unfilled_locations
+        if player is not None:
+            return self._sort_locations(index[player])
+        return self._sort_locations([location for locations in index.values() for location in locations])
 
     def get_unfilled_locations(self, player=None) -> list:
-        if player is not None:
-            return [location for location in self.get_locations() if
-                    location.player == player and not location.item]
-        return [location for location in self.get_locations() if not location.item]
+        return self._per_player(False, player)
 
     def get_unfilled_dungeon_locations(self):
-        return [location for location in self.get_locations() if not location.item and location.parent_region.dungeon]
+        self._index_locations()
+        return self._sort_locations([location for locations in self._unfilled_dungeon_locations.values()
+                                     for location in locations])
 
     def get_filled_locations(self, player=None) -> list:
-        if player is not None:
-            return [location for location in self.get_locations() if
-                    location.player == player and location.item is not None]
-        return [location for location in self.get_locations() if location.item is not None]
+        return self._per_player(True, player)
+
+    def _reachable_region_locations(self, state: CollectionState, player: Optional[int]) -> list:
+        """Locations in regions state can reach, in get_locations order."""
+        self._index_locations()
+        locations = []
+        for player in self.player_ids if player is None else (player,):
+            if state.stale[player]:
+                state.update_reachable_regions(player)
+            locations.extend(location for region in state.reachable_regions[player] for location in region.locations
+                             if location in self._location_positions)
+        return self._sort_locations(locations)
 
     def get_reachable_locations(self, state=None, player=None) -> list:
         if state is None:
             state = self.state
-        return [location for location in self.get_locations() if
-                (player is None or location.player == player) and location.can_reach(state)]
+        return [location for location in self._reachable_region_locations(state, player) if location.can_reach(state)]
 
     def get_placeable_locations(self, state=None, player=None) -> list:
         if state is None:
             state = self.state
-        return [location for location in self.get_locations() if
-                (player is None or location.player == player) and location.item is None and location.can_reach(state)]
+        return [location for location in self._reachable_region_locations(state, player)
+                if location.item is None and location.can_reach(state)]
 
     def unlocks_new_location(self, item) -> bool:
         temp_state = self.state.copy()
@@ -411,48 +504,359 @@ class World(object):
             if self.has_beaten_game(self.state):
                 return True
             state = CollectionState(self)
-        prog_locations = {location for location in self.get_locations() if location.item is not None and (
-                    location.item.advancement or location.event) and location not in state.locations_checked}
-
-        while prog_locations:
-            sphere = []
-            # build up spheres of collection radius. Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
-            for location in prog_locations:
-                if location.can_reach(state):
-                    sphere.append(location)
-
-            if not sphere:
-                # ran out of places and did not finish yet, quit
-                return False
+        prog_locations = [location for location in self.get_filled_locations() if
+                          (location.item.advancement or location.event) and location not in state.locations_checked]
 
+        # build up spheres of collection radius. Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
+        for sphere in SphereIterator(state, prog_locations, until_beaten=True):
             for location in sphere:
-                prog_locations.remove(location)
                 state.collect(location.item, True, location)
 
-            if self.has_beaten_game(state):
-                return True
+        return self.has_beaten_game(state)
+
+class ProgItems(object):
+    """Item counts of a CollectionState. Each player has a compact array of counters indexed by Items.item_ids.
+    Can still be indexed with (item_name, player) tuples like the Counter it replaces.
+    Copies share the counters of each player until either side changes them."""
+    __slots__ = ('counters', 'shared')
+
+    def __init__(self, players: int):
+        empty = bytes(2 * len(item_ids))
+        self.counters: Dict[int, array] = {player: array('H', empty) for player in range(1, players + 1)}
+        self.shared: Set[int] = set()
+
+    def count(self, item: str, player: int) -> int:
+        index = item_ids.get(item)
+        if index is None:  # never collected by anyone
+            return 0
+        try:
+            return self.counters[player][index]
+        except IndexError:  # item name was interned after this counter was created
+            return 0
+
+    def add(self, item: str, player: int, amount: int = 1):
+        counter = self.counters[player]
+        if player in self.shared:
+            counter = self.counters[player] = counter[:]
+            self.shared.remove(player)
+        index = item_ids[item]
+        if index >= len(counter):
+            counter.frombytes(bytes(2 * (len(item_ids) - len(counter))))
+        counter[index] += amount
+
+    def clear(self, player: int):
+        self.counters[player] = array('H', bytes(2 * len(item_ids)))
+        self.shared.discard(player)
+
+    def copy(self) -> ProgItems:
+        ret = ProgItems.__new__(ProgItems)
+        ret.counters = self.counters.copy()
+        self.shared = set(self.counters)
+        ret.shared = set(self.counters)
+        return ret
+
+    def items(self) -> Iterator[Tuple[Tuple[str, int], int]]:
+        names = list(item_ids)
+        for player, counter in self.counters.items():
+            for index, count in enumerate(counter):
+                if count:
+                    yield (names[index], player), count
+
+    def __getitem__(self, key: Tuple[str, int]) -> int:
+        return self.count(*key)
+
+    def __setitem__(self, key: Tuple[str, int], value: int):
+        item, player = key
+        self.add(item, player, value - self.count(item, player))
+
+    def __delitem__(self, key: Tuple[str, int]):
+        self[key] = 0
+
+    def __contains__(self, key: Tuple[str, int]) -> bool:
+        return self.count(*key) > 0
+
+    def __eq__(self, other: ProgItems) -> bool:
+        return dict(self.items()) == dict(other.items())
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({dict(self.items())})'
+
+
+class _TracedCounter(object):
+    __slots__ = ('counter', 'player', 'trace')
+
+    def __init__(self, counter: array, player: int, trace: RuleTrace):
+        self.counter = counter
+        self.player = player
+        self.trace = trace
+
+    def __getitem__(self, index: int) -> int:
+        if self.player == self.trace.player:
+            self.trace.items.add(index)
+        else:
+            self.trace.volatile = True
+        return self.counter[index]
 
+    def __len__(self):
+        return len(self.counter)
+
+
+class _TracedCounters(dict):
+    def __init__(self, trace: RuleTrace):
+        super(_TracedCounters, self).__init__()
+        self.trace = trace
+
+    def __missing__(self, player: int) -> _TracedCounter:
+        counter = self[player] = _TracedCounter(self.trace.real_prog_items.counters[player], player, self.trace)
+        return counter
+
+
+class _TracedRegionSet(object):
+    __slots__ = ('regions', 'player', 'trace')
+
+    def __init__(self, regions: set, player: int, trace: RuleTrace):
+        self.regions = regions
+        self.player = player
+        self.trace = trace
+
+    def __contains__(self, region: Region) -> bool:
+        if region in self.regions:
+            return True
+        if self.player == self.trace.player:
+            self.trace.regions.add(region)
+        else:
+            self.trace.volatile = True
         return False
 
+    def __iter__(self):
+        self.trace.volatile = True
+        return iter(self.regions)
+
+    def __len__(self):
+        self.trace.volatile = True
+        return len(self.regions)
+
+    def copy(self) -> set:
+        self.trace.volatile = True
+        return self.regions.copy()
+
+
+class _TracedRegions(dict):
+    def __init__(self, trace: RuleTrace):
+        super(_TracedRegions, self).__init__()
+        self.trace = trace
+
+    def __missing__(self, player: int) -> _TracedRegionSet:
+        regions = self[player] = _TracedRegionSet(self.trace.real_reachable_regions[player], player, self.trace)
+        return regions
+
+
+class RuleTrace(object):
+    """Records the item counters and unreached regions of one player that access rules read while being evaluated.
+    Reads the trace can't attribute (other players, iterating regions, item placements) mark it volatile."""
+
+    def __init__(self, state: CollectionState, player: int):
+        self.state = state
+        self.player = player
+        self.items: Set[int] = set()
+        self.regions: Set[Region] = set()
+        self.volatile = False
+        self.real_prog_items = state.prog_items
+        self.real_reachable_regions = state.reachable_regions
+        self.prog_items = ProgItems.__new__(ProgItems)
+        self.prog_items.counters = _TracedCounters(self)
+        self.reachable_regions = _TracedRegions(self)
+
+    def resume(self):
+        state = self.state
+        state.prog_items, state.reachable_regions, state.trace = self.prog_items, self.reachable_regions, self
+
+    def pause(self):
+        state = self.state
+        state.prog_items, state.reachable_regions, state.trace = \
+            self.real_prog_items, self.real_reachable_regions, None
+
+    def access(self, spot) -> bool:
+        """Evaluates the access rule of spot, its parent region is expected to be reachable."""
+        self.items.clear()
+        self.regions.clear()
+        self.volatile = False
+        dependencies = getattr(spot.access_rule, 'dependencies', None)
+        if dependencies is not None:
+            # rule objects that only read item counts list those up front
+            for item, player in dependencies:
+                if player == self.player and item in item_ids:
+                    self.items.add(item_ids[item])
+                else:
+                    self.volatile = True
+            return spot.access_rule(self.state)
+        self.resume()
+        try:
+            return spot.access_rule(self.state)
+        finally:
+            self.pause()
+
+
+class BlockedConnectionIndex(object):
+    """Blocked connections of one player, keyed by the item ids and regions their access rules read when they last
+    failed. Connections with volatile rules are re-checked on every update."""
+    __slots__ = ('dependents', 'volatile', 'changed')
+
+    def __init__(self):
+        self.dependents: Dict[Union[int, Region], Set[Entrance]] = {}
+        self.volatile: Set[Entrance] = set()
+        self.changed: Set[int] = set()
+
+    def copy(self) -> BlockedConnectionIndex:
+        ret = BlockedConnectionIndex()
+        ret.dependents = {key: connections.copy() for key, connections in self.dependents.items()}
+        ret.volatile = self.volatile.copy()
+        ret.changed = self.changed.copy()
+        return ret
+
+    def add(self, connection: Entrance, trace: RuleTrace):
+        if trace.volatile:
+            self.volatile.add(connection)
+        else:
+            for key in trace.items:
+                self.dependents.setdefault(key, set()).add(connection)
+            for key in trace.regions:
+                self.dependents.setdefault(key, set()).add(connection)
+
+    def pop_dependents(self, key: Union[int, Region]) -> Set[Entrance]:
+        return self.dependents.pop(key, ())
+
+    def pop_outdated(self) -> Set[Entrance]:
+        outdated = self.volatile
+        self.volatile = set()
+        for key in self.changed:
+            outdated.update(self.pop_dependents(key))
+        self.changed.clear()
+        return outdated
+
+
+class PathDict(object):
+    """Spot to path mapping of a CollectionState, kept per player so copies can share the paths of each player until
+    either side records a new one."""
+    __slots__ = ('paths', 'shared')
+
+    def __init__(self, players: int):
+        self.paths: Dict[int, dict] = {player: {} for player in range(1, players + 1)}
+        self.shared: Set[int] = set()
+
+    def get(self, spot, default=None):
+        return self.paths[spot.player].get(spot, default)
+
+    def __getitem__(self, spot):
+        return self.paths[spot.player][spot]
+
+    def __setitem__(self, spot, path: tuple):
+        player = spot.player
+        if player in self.shared:
+            self.paths[player] = self.paths[player].copy()
+            self.shared.remove(player)
+        self.paths[player][spot] = path
+
+    def __contains__(self, spot) -> bool:
+        return spot in self.paths[spot.player]
+
+    def __len__(self):
+        return sum(len(paths) for paths in self.paths.values())
+
+    def copy(self) -> PathDict:
+        ret = PathDict.__new__(PathDict)
+        ret.paths = self.paths.copy()
+        self.shared = set(self.paths)
+        ret.shared = set(self.paths)
+        return ret
+
+
+class BlockedEventIndex(BlockedConnectionIndex):
+    """Uncollected event locations of one player, keyed by their parent region while that is unreachable and by what
+    their access rules read once it is reached. seen is how much of World.event_log has been taken in."""
+    __slots__ = ('seen',)
+
+    def __init__(self):
+        super(BlockedEventIndex, self).__init__()
+        self.seen = 0
+
+    def copy(self) -> BlockedEventIndex:
+        ret = BlockedEventIndex()
+        ret.dependents = {key: locations.copy() for key, locations in self.dependents.items()}
+        ret.volatile = self.volatile.copy()
+        ret.changed = self.changed.copy()
+        ret.seen = self.seen
+        return ret
+
+
 class CollectionState(object):
 
-    def __init__(self, parent: World):
-        self.prog_items = Counter()
+    def __init__(self, parent: World, record_paths: bool = False):
+        self.prog_items = ProgItems(parent.players)
         self.world = parent
         self.reachable_regions = {player: set() for player in range(1, parent.players + 1)}
         self.blocked_connections = {player: set() for player in range(1, parent.players + 1)}
+        self.blocked_index: Dict[int, Optional[BlockedConnectionIndex]] = \
+            {player: None for player in range(1, parent.players + 1)}
+        self.event_index: Dict[int, Optional[BlockedEventIndex]] = \
+            {player: None for player in range(1, parent.players + 1)}
+        self.trace: Optional[RuleTrace] = None
         self.events = set()
-        self.path = {}
+        # how each reached spot was reached, only kept when asked for as only the spoiler playthrough needs it
+        self.path: Optional[PathDict] = PathDict(parent.players) if record_paths else None
         self.locations_checked = set()
         self.stale = {player: True for player in range(1, parent.players + 1)}
+        # copy on write bookkeeping, see copy()
+        self.shared_players: Set[int] = set()
+        self.shared_checks = False
         for item in parent.precollected_items:
             self.collect(item, True)
 
     def update_reachable_regions(self, player: int):
-        self.stale[player] = False
+        outer_trace = self.trace
+        if outer_trace:
+            # another player's rule is being traced, their rules can't follow our reachability changes
+            outer_trace.pause()
+            outer_trace.volatile = True
+        try:
+            self._update_reachable_regions(player)
+        finally:
+            if outer_trace:
+                outer_trace.resume()
+
+    def _own_player(self, player: int):
+        """Makes the reachability data of player private to this state before changing it."""
+        if player in self.shared_players:
+            self.shared_players.remove(player)
+            self.reachable_regions[player] = self.reachable_regions[player].copy()
+            self.blocked_connections[player] = self.blocked_connections[player].copy()
+            index = self.blocked_index[player]
+            if index:
+                self.blocked_index[player] = index.copy()
+            events = self.event_index[player]
+            if events:
+                self.event_index[player] = events.copy()
+
+    def _own_checks(self):
+        if self.shared_checks:
+            self.shared_checks = False
+            self.events = self.events.copy()
+            self.locations_checked = self.locations_checked.copy()
+
+    def _update_reachable_regions(self, player: int):
+        self._own_player(player)
         rrp = self.reachable_regions[player]
         bc = self.blocked_connections[player]
-        queue = deque(self.blocked_connections[player])
+        index = self.blocked_index[player]
+        if index is None or not self.stale[player]:
+            # no index yet, or explicitly called after rules changed: re-check every blocked connection
+            index = self.blocked_index[player] = BlockedConnectionIndex()
+            queue = deque(bc)
+        else:
+            # only re-check connections whose rules read an item collected since the last update
+            queue = deque(index.pop_outdated())
+        self.stale[player] = False
+        events = self.event_index[player]
         start = self.world.get_region('Menu', player)
 
         # init on first call - this can't be done on construction since the regions don't exist yet
@@ -461,34 +865,52 @@ class CollectionState(object):
             bc.update(start.exits)
             queue.extend(start.exits)
 
+        trace = RuleTrace(self, player)
         # run BFS on all connections, and keep track of those blocked by missing items
         while queue:
             connection = queue.popleft()
             new_region = connection.connected_region
             if new_region in rrp:
-                bc.remove(connection)
+                bc.discard(connection)
+            elif connection not in bc:
+                continue
             elif connection.can_reach(self):
                 rrp.add(new_region)
                 bc.remove(connection)
                 bc.update(new_region.exits)
                 queue.extend(new_region.exits)
-                self.path[new_region] = (new_region.name, self.path.get(connection, None))
+                if self.path is not None:
+                    self.path[new_region] = (new_region.name, self.path.get(connection, None))
 
                 # Retry connections if the new region can unblock them
+                queue.extend(index.pop_dependents(new_region))
+                if events is not None:
+                    events.changed.add(new_region)
                 if new_region.name in indirect_connections:
                     new_entrance = self.world.get_entrance(indirect_connections[new_region.name], player)
                     if new_entrance in bc and new_entrance not in queue:
                         queue.append(new_entrance)
+            elif not trace.access(connection):
+                # evaluate again while tracing, only failed rules need to know what they depend on
+                index.add(connection, trace)
 
     def copy(self) -> CollectionState:
-        ret = CollectionState(self.world)
+        """Cheap copy, both states share the data of each player until one of them changes it."""
+        ret = CollectionState.__new__(CollectionState)
+        ret.world = self.world
         ret.prog_items = self.prog_items.copy()
-        ret.reachable_regions = {player: copy.copy(self.reachable_regions[player]) for player in
-                                 range(1, self.world.players + 1)}
-        ret.blocked_connections = {player: copy.copy(self.blocked_connections[player]) for player in range(1, self.world.players + 1)}
-        ret.events = copy.copy(self.events)
-        ret.path = copy.copy(self.path)
-        ret.locations_checked = copy.copy(self.locations_checked)
+        ret.reachable_regions = self.reachable_regions.copy()
+        ret.blocked_connections = self.blocked_connections.copy()
+        ret.blocked_index = self.blocked_index.copy()
+        ret.event_index = self.event_index.copy()
+        ret.trace = None
+        ret.events = self.events
+        ret.path = self.path.copy() if self.path is not None else None
+        ret.locations_checked = self.locations_checked
+        ret.stale = self.stale.copy()
+        self.shared_players = set(self.stale)
+        ret.shared_players = set(self.stale)
+        self.shared_checks = ret.shared_checks = True
         return ret
 
     def can_reach(self, spot, resolution_hint=None, player=None) -> bool:
@@ -503,7 +925,57 @@ class CollectionState(object):
                 spot = self.world.get_region(spot, player)
         return spot.can_reach(self)
 
-    def sweep_for_events(self, key_only: bool = False, locations=None):
+    def sweep_for_events(self, key_only: bool = False, locations=None, players=None):
+        if key_only or locations is not None:
+            self._sweep_locations(key_only, locations)
+            return
+        if players is None:
+            players = range(1, self.world.players + 1)
+        new_locations = True
+        while new_locations:
+            new_locations = []
+            for player in players:
+                new_locations.extend(self._reachable_events(player))
+            if new_locations:
+                self._own_checks()
+            for event in new_locations:
+                self.events.add(event)
+                self.collect(event.item, True, event)
+
+    def _reachable_events(self, player: int) -> List[Location]:
+        """Uncollected events of player that are reachable now, only looks at events that are new to this state or
+        that wait on a region or item that was reached or collected since they were last checked."""
+        index = self.event_index[player]
+        log = self.world.event_log[player]
+        if index is not None and index.seen == len(log) and not index.changed and not index.volatile:
+            return []
+        if self.stale[player]:
+            self.update_reachable_regions(player)
+        self._own_player(player)
+        index = self.event_index[player]
+        if index is None:
+            index = self.event_index[player] = BlockedEventIndex()
+            outdated = set(self.world.event_locations[player])
+        else:
+            outdated = index.pop_outdated()
+            outdated.update(log[index.seen:])
+        index.seen = len(log)
+
+        reachable = []
+        trace = RuleTrace(self, player)
+        for location in outdated:
+            if location in self.events or not location.event or location.item is None:
+                continue
+            region = location.parent_region
+            if not region.can_reach(self):
+                index.dependents.setdefault(region, set()).add(location)
+            elif location.access_rule(self) or trace.access(location):
+                reachable.append(location)
+            else:
+                index.add(location, trace)
+        return reachable
+
+    def _sweep_locations(self, key_only: bool = False, locations=None):
         if locations is None:
             locations = self.world.get_filled_locations()
         new_locations = True
@@ -514,19 +986,30 @@ class CollectionState(object):
                                     location.item.player] and location.item.bigkey))
                                 and location.can_reach(self)}
             new_locations = reachable_events - self.events
+            if new_locations:
+                self._own_checks()
             for event in new_locations:
                 self.events.add(event)
                 self.collect(event.item, True, event)
 
     def has(self, item, player: int, count: int = 1):
-        return self.prog_items[item, player] >= count
+        index = item_ids.get(item)
+        if index is None:
+            if self.trace:
+                # the reachability index can only follow item names that were interned
+                self.trace.volatile = True
+            return count <= 0
+        try:
+            return self.prog_items.counters[player][index] >= count
+        except IndexError:
+            return count <= 0
 
     def has_key(self, item, player, count: int = 1):
         if self.world.logic[player] == 'nologic':
             return True
         if self.world.keyshuffle[player] == "universal":
             return self.can_buy_unlimited('Small Key (Universal)', player)
-        return self.prog_items[item, player] >= count
+        return self.has(item, player, count)
 
     def can_buy_unlimited(self, item: str, player: int) -> bool:
         return any(shop.region.player == player and shop.has_unlimited(item) and shop.region.can_reach(self) for
@@ -537,7 +1020,7 @@ class CollectionState(object):
                    shop in self.world.shops)
 
     def item_count(self, item, player: int) -> int:
-        return self.prog_items[item, player]
+        return self.prog_items.count(item, player)
 
     def has_triforce_pieces(self, count: int, player: int) -> bool:
         return self.item_count('Triforce Piece', player) + self.item_count('Power Star', player) >= count
@@ -545,7 +1028,7 @@ class CollectionState(object):
     def has_crystals(self, count: int, player: int) -> bool:
         found: int = 0
         for crystalnumber in range(1, 8):
-            found += self.prog_items[f"Crystal {crystalnumber}", player]
+            found += self.prog_items.count(f"Crystal {crystalnumber}", player)
             if found >= count:
                 return True
         return False
@@ -559,14 +1042,14 @@ class CollectionState(object):
     def bottle_count(self, player: int) -> int:
         found: int = 0
         for bottlename in item_name_groups["Bottles"]:
-            found += self.prog_items[bottlename, player]
+            found += self.prog_items.count(bottlename, player)
         return found
 
     def has_bottles(self, bottles: int, player: int) -> bool:
         """Version of bottle_count that allows fast abort"""
         found: int = 0
         for bottlename in item_name_groups["Bottles"]:
-            found += self.prog_items[bottlename, player]
+            found += self.prog_items.count(bottlename, player)
             if found >= bottles:
                 return True
         return False
@@ -714,63 +1197,46 @@ class CollectionState(object):
             rules.append(self.has_Pearl(player))
         return all(rules)
 
+    def add_item(self, item_name: str, player: int):
+        self.prog_items.add(item_name, player)
+        self._own_player(player)
+        index = self.blocked_index[player]
+        if index:
+            index.changed.add(item_ids[item_name])
+        events = self.event_index[player]
+        if events:
+            events.changed.add(item_ids[item_name])
+
+    def progressive_level(self, tiers: ProgressiveTiers, player: int) -> int:
+        """Number of tiers the player has, going by the highest one they own."""
+        counter = self.prog_items.counters[player]
+        for level in range(len(tiers.ids), 0, -1):
+            if counter[tiers.ids[level - 1]]:
+                return level
+        return 0
+
+    def next_progressive_tier(self, tiers: ProgressiveTiers, player: int) -> Optional[str]:
+        """Tier another copy of the progressive item grants, None if the player is at the top or at the limit."""
+        level = self.progressive_level(tiers, player)
+        return tiers.names[level] if level < tiers.limit else None
+
     def collect(self, item: Item, event=False, location=None):
         if location:
+            self._own_checks()
             self.locations_checked.add(location)
         changed = False
-        if item.name.startswith('Progressive '):
-            if 'Sword' in item.name:
-                if self.has('Golden Sword', item.player):
-                    pass
-                elif self.has('Tempered Sword', item.player) and self.world.difficulty_requirements[
-                    item.player].progressive_sword_limit >= 4:
-                    self.prog_items['Golden Sword', item.player] += 1
-                    changed = True
-                elif self.has('Master Sword', item.player) and self.world.difficulty_requirements[item.player].progressive_sword_limit >= 3:
-                    self.prog_items['Tempered Sword', item.player] += 1
-                    changed = True
-                elif self.has('Fighter Sword', item.player) and self.world.difficulty_requirements[item.player].progressive_sword_limit >= 2:
-                    self.prog_items['Master Sword', item.player] += 1
-                    changed = True
-                elif self.world.difficulty_requirements[item.player].progressive_sword_limit >= 1:
-                    self.prog_items['Fighter Sword', item.player] += 1
-                    changed = True
-            elif 'Glove' in item.name:
-                if self.has('Titans Mitts', item.player):
-                    pass
-                elif self.has('Power Glove', item.player):
-                    self.prog_items['Titans Mitts', item.player] += 1
-                    changed = True
-                else:
-                    self.prog_items['Power Glove', item.player] += 1
-                    changed = True
-            elif 'Shield' in item.name:
-                if self.has('Mirror Shield', item.player):
-                    pass
-                elif self.has('Red Shield', item.player) and self.world.difficulty_requirements[item.player].progressive_shield_limit >= 3:
-                    self.prog_items['Mirror Shield', item.player] += 1
-                    changed = True
-                elif self.has('Blue Shield', item.player)  and self.world.difficulty_requirements[item.player].progressive_shield_limit >= 2:
-                    self.prog_items['Red Shield', item.player] += 1
-                    changed = True
-                elif self.world.difficulty_requirements[item.player].progressive_shield_limit >= 1:
-                    self.prog_items['Blue Shield', item.player] += 1
-                    changed = True
-            elif 'Bow' in item.name:
-                if self.has('Silver Bow', item.player):
-                    pass
-                elif self.has('Bow', item.player):
-                    self.prog_items['Silver Bow', item.player] += 1
-                    changed = True
-                else:
-                    self.prog_items['Bow', item.player] += 1
-                    changed = True
+        tiers = self.world.get_progressive_tiers(item.player).get(item.name, None)
+        if tiers:
+            tier = self.next_progressive_tier(tiers, item.player)
+            if tier:
+                self.add_item(tier, item.player)
+                changed = True
         elif item.name.startswith('Bottle'):
             if self.bottle_count(item.player) < self.world.difficulty_requirements[item.player].progressive_bottle_limit:
-                self.prog_items[item.name, item.player] += 1
+                self.add_item(item.name, item.player)
                 changed = True
         elif event or item.advancement:
-            self.prog_items[item.name, item.player] += 1
+            self.add_item(item.name, item.player)
             changed = True
 
         self.stale[item.player] = True
@@ -782,52 +1248,168 @@ class CollectionState(object):
     def remove(self, item):
         if item.advancement:
             to_remove = item.name
-            if to_remove.startswith('Progressive '):
-                if 'Sword' in to_remove:
-                    if self.has('Golden Sword', item.player):
-                        to_remove = 'Golden Sword'
-                    elif self.has('Tempered Sword', item.player):
-                        to_remove = 'Tempered Sword'
-                    elif self.has('Master Sword', item.player):
-                        to_remove = 'Master Sword'
-                    elif self.has('Fighter Sword', item.player):
-                        to_remove = 'Fighter Sword'
-                    else:
-                        to_remove = None
-                elif 'Glove' in item.name:
-                    if self.has('Titans Mitts', item.player):
-                        to_remove = 'Titans Mitts'
-                    elif self.has('Power Glove', item.player):
-                        to_remove = 'Power Glove'
-                    else:
-                        to_remove = None
-                elif 'Shield' in item.name:
-                    if self.has('Mirror Shield', item.player):
-                        to_remove = 'Mirror Shield'
-                    elif self.has('Red Shield', item.player):
-                        to_remove = 'Red Shield'
-                    elif self.has('Blue Shield', item.player):
-                        to_remove = 'Blue Shield'
-                    else:
-                        to_remove = 'None'
-                elif 'Bow' in item.name:
-                    if self.has('Silver Bow', item.player):
-                        to_remove = 'Silver Bow'
-                    elif self.has('Bow', item.player):
-                        to_remove = 'Bow'
-                    else:
-                        to_remove = None
+            tiers = self.world.get_progressive_tiers(item.player).get(to_remove, None)
+            if tiers:
+                level = self.progressive_level(tiers, item.player)
+                to_remove = tiers.names[level - 1] if level else None
 
             if to_remove is not None:
 
-                self.prog_items[to_remove, item.player] -= 1
-                if self.prog_items[to_remove, item.player] < 1:
-                    del (self.prog_items[to_remove, item.player])
+                if self.prog_items.count(to_remove, item.player):
+                    self.prog_items.add(to_remove, item.player, -1)
                 # invalidate caches, nothing can be trusted anymore now
                 self.reachable_regions[item.player] = set()
                 self.blocked_connections[item.player] = set()
+                self.blocked_index[item.player] = None
+                self.event_index[item.player] = None
+                self.shared_players.discard(item.player)
                 self.stale[item.player] = True
 
+    def forget(self, player: int):
+        """Drops everything collected for player, including events, and the reachability of player."""
+        self.prog_items.clear(player)
+        self.reachable_regions[player] = set()
+        self.blocked_connections[player] = set()
+        self.blocked_index[player] = None
+        self.event_index[player] = None
+        self.shared_players.discard(player)
+        self.stale[player] = True
+        if self.path is not None:
+            self.path.paths[player] = {}
+            self.path.shared.discard(player)
+        self.events = {location for location in self.events if location.player != player}
+        self.locations_checked = {location for location in self.locations_checked if location.player != player}
+        self.shared_checks = False
+
+
+class SphereIterator(object):
+    """Yields the spheres of locations reachable with state, each one containing the remaining locations that became
+    reachable since the previous sphere was taken, in the order they were given. Items are not collected here, the
+    caller collects whatever it wants from a sphere into state before asking for the next one.
+    Between spheres only the locations in newly reached regions, those whose access rules read a changed item or
+    region and those with volatile rules are tested again."""
+
+    def __init__(self, state: CollectionState, locations, until_beaten: bool = False):
+        self.state = state
+        self.until_beaten = until_beaten
+        self.remaining: Dict[Location, None] = dict.fromkeys(locations)
+        self.order: Dict[Location, int] = {location: index for index, location in enumerate(self.remaining)}
+        self.locations: Dict[int, List[Location]] = {}
+        for location in self.remaining:
+            self.locations.setdefault(location.player, []).append(location)
+        self.indexes: Dict[int, Optional[BlockedConnectionIndex]] = {player: None for player in self.locations}
+        self.seen_regions: Dict[int, set] = {}
+        self.seen_items: Dict[int, array] = {}
+
+    def __iter__(self) -> Iterator[List[Location]]:
+        world = self.state.world
+        while self.remaining and not (self.until_beaten and world.has_beaten_game(self.state)):
+            sphere = self.next_sphere()
+            if not sphere:
+                return
+            yield sphere
+
+    def discard(self, location: Location):
+        """Drops a location the caller has taken care of itself."""
+        self.remaining.pop(location, None)
+
+    def next_sphere(self) -> List[Location]:
+        """Takes the remaining locations that are reachable now, an empty list if there are none."""
+        state = self.state
+        remaining = self.remaining
+        sphere = []
+        for player in self.locations:
+            outdated = self._outdated(player)
+            if not outdated:
+                continue
+            index = self.indexes[player]
+            trace = RuleTrace(state, player)
+            for location in outdated:
+                if location not in remaining:
+                    continue
+                region = location.parent_region
+                if not region.can_reach(state):
+                    index.dependents.setdefault(region, set()).add(location)
+                elif location.access_rule(state) or trace.access(location):
+                    sphere.append(location)
+                else:
+                    index.add(location, trace)
+        sphere.sort(key=self.order.__getitem__)
+        for location in sphere:
+            del remaining[location]
+        return sphere
+
+    def unlocked_by(self, item: Item) -> Iterator[Location]:
+        """Remaining locations that collecting item would make reachable, tested on a copy of state. Only looks at
+        the locations whose access rules or parent regions depend on what item changes, so the last sphere should
+        have been taken since state changed."""
+        state = self.state
+        if state.stale[item.player]:
+            state.update_reachable_regions(item.player)
+        unlocked_state = state.copy()
+        unlocked_state.collect(item, True)
+        candidates = set()
+        for player, index in self.indexes.items():
+            if index is None:
+                candidates.update(self.locations[player])
+            else:
+                candidates.update(index.volatile)
+        index = self.indexes.get(item.player, None)
+        if index is not None:
+            blocked = unlocked_state.blocked_index[item.player]
+            if blocked is not None:
+                # state was up to date, so these are just the items collected above
+                changed = blocked.changed.copy()
+            else:
+                changed = [key for key, (count, unlocked_count) in enumerate(zip_longest(
+                    state.prog_items.counters[item.player], unlocked_state.prog_items.counters[item.player],
+                    fillvalue=0)) if count != unlocked_count]
+            for key in changed:
+                candidates.update(index.dependents.get(key, ()))
+            unlocked_state.update_reachable_regions(item.player)
+            for region in unlocked_state.reachable_regions[item.player].difference(
+                    state.reachable_regions[item.player]):
+                candidates.update(index.dependents.get(region, ()))
+        return (location for location in candidates if location in self.remaining and
+                location.can_reach(unlocked_state))
+
+    def _outdated(self, player: int):
+        """Remaining locations of player that need to be tested again, takes in what changed in state since the
+        last sphere."""
+        state = self.state
+        if state.stale[player]:
+            state.update_reachable_regions(player)
+        regions = state.reachable_regions[player]
+        items = state.prog_items.counters[player]
+        index = self.indexes[player]
+        seen_regions = self.seen_regions.get(player, None)
+        seen_items = self.seen_items.get(player, None)
+        if index is not None and not index.volatile and len(regions) == len(seen_regions) and items == seen_items:
+            return ()
+        self.seen_regions[player] = regions.copy()
+        self.seen_items[player] = items[:]
+
+        if index is not None and len(regions) >= len(seen_regions):
+            changed = []
+            for item, (count, seen) in enumerate(zip_longest(items, seen_items, fillvalue=0)):
+                if count < seen:
+                    break
+                elif count > seen:
+                    changed.append(item)
+            else:
+                outdated = index.volatile
+                index.volatile = set()
+                for item in changed:
+                    outdated.update(index.pop_dependents(item))
+                for region in regions.difference(seen_regions):
+                    outdated.update(index.pop_dependents(region))
+                return outdated
+
+        # first sphere, or items were removed from state: nothing known can be trusted
+        self.indexes[player] = BlockedConnectionIndex()
+        return self.locations[player]
+
+
 @unique
 class RegionType(Enum):
     LightWorld = 1
@@ -842,6 +1424,10 @@ class RegionType(Enum):
 
 
 class Region(object):
+    __slots__ = ('name', 'type', 'entrances', 'exits', 'locations', 'dungeon', 'shop', 'world', 'is_light_world',
+                 'is_dark_world', 'hint_text', 'player')
+    spot_type = 'Region'
+    recursion_count = 0
 
     def __init__(self, name: str, type, hint, player: int):
         self.name = name
@@ -854,9 +1440,7 @@ class Region(object):
         self.world = None
         self.is_light_world = False  # will be set after making connections.
         self.is_dark_world = False
-        self.spot_type = 'Region'
         self.hint_text = hint
-        self.recursion_count = 0
         self.player = player
 
     def can_reach(self, state):
@@ -867,16 +1451,14 @@ class Region(object):
     def can_reach_private(self, state: CollectionState):
         for entrance in self.entrances:
             if entrance.can_reach(state):
-                if not self in state.path:
+                if state.path is not None and self not in state.path:
                     state.path[self] = (self.name, state.path.get(entrance, None))
                 return True
         return False
 
     def can_fill(self, item: Item):
-        inside_dungeon_item = ((item.smallkey and not self.world.keyshuffle[item.player])
-                               or (item.bigkey and not self.world.bigkeyshuffle[item.player])
-                               or (item.map and not self.world.mapshuffle[item.player])
-                               or (item.compass and not self.world.compassshuffle[item.player]))
+        shuffle_setting = dungeon_item_shuffle_settings.get(item.type, None)
+        inside_dungeon_item = shuffle_setting is not None and not getattr(self.world, shuffle_setting)[item.player]
         sewer_hack = self.world.mode[item.player] == 'standard' and item.name == 'Small Key (Hyrule Castle)'
         if sewer_hack or inside_dungeon_item:
             return self.dungeon and self.dungeon.is_dungeon_item(item) and item.player == self.player
@@ -891,6 +1473,10 @@ class Region(object):
 
 
 class Entrance(object):
+    __slots__ = ('name', 'parent_region', 'connected_region', 'target', 'addresses', 'vanilla', 'access_rule', 'player',
+                 'hide_path')
+    spot_type = 'Entrance'
+    recursion_count = 0
 
     def __init__(self, player: int, name: str = '', parent=None):
         self.name = name
@@ -898,16 +1484,14 @@ class Entrance(object):
         self.connected_region = None
         self.target = None
         self.addresses = None
-        self.spot_type = 'Entrance'
-        self.recursion_count = 0
         self.vanilla = None
-        self.access_rule = lambda state: True
+        self.access_rule = always_accessible
         self.player = player
         self.hide_path = False
 
     def can_reach(self, state):
         if self.parent_region.can_reach(state) and self.access_rule(state):
-            if not self.hide_path and not self in state.path:
+            if state.path is not None and not self.hide_path and self not in state.path:
                 state.path[self] = (self.name, state.path.get(self.parent_region, (self.parent_region.name, None)))
             return True
 
@@ -927,6 +1511,12 @@ class Entrance(object):
         world = self.parent_region.world if self.parent_region else None
         return world.get_name_string_for_object(self) if world else f'{self.name} (Player {self.player})'
 
+
+# item type of each kind of dungeon item, with the World setting that lets it leave its dungeon
+dungeon_item_shuffle_settings = {'SmallKey': 'keyshuffle', 'BigKey': 'bigkeyshuffle', 'Map': 'mapshuffle',
+                                 'Compass': 'compassshuffle'}
+
+
 class Dungeon(object):
 
     def __init__(self, name: str, regions, big_key, small_keys, dungeon_items, player: int):
@@ -938,6 +1528,7 @@ class Dungeon(object):
         self.bosses = dict()
         self.player = player
         self.world = None
+        self._item_names = None
 
     @property
     def boss(self):
@@ -955,8 +1546,15 @@ class Dungeon(object):
     def all_items(self):
         return self.dungeon_items + self.keys
 
+    @property
+    def item_names(self) -> FrozenSet[str]:
+        """Names of all_items, computed on first use as the item lists don't change after create_dungeons."""
+        if self._item_names is None:
+            self._item_names = frozenset(dungeon_item.name for dungeon_item in self.all_items)
+        return self._item_names
+
     def is_dungeon_item(self, item: Item) -> bool:
-        return item.player == self.player and item.name in [dungeon_item.name for dungeon_item in self.all_items]
+        return item.player == self.player and item.name in self.item_names
 
     def __eq__(self, other: Item) -> bool:
         return self.name == other.name and self.player == other.player
@@ -978,28 +1576,53 @@ class Boss(object):
         return self.defeat_rule(state, self.player)
 
 class Location(object):
+    __slots__ = ('name', 'parent_region', '_item', 'crystal', 'address', 'player_address', 'hint_text', '_event',
+                 'locked', 'always_allow', 'access_rule', 'item_rule', 'player')
+    spot_type = 'Location'
+    recursion_count = 0
+
     def __init__(self, player: int, name: str = '', address=None, crystal: bool = False,
                  hint_text: Optional[str] = None, parent=None,
                  player_address=None):
         self.name = name
         self.parent_region = parent
-        self.item = None
+        self._item = None
         self.crystal = crystal
         self.address = address
         self.player_address = player_address
-        self.spot_type = 'Location'
         self.hint_text: str = hint_text if hint_text else name
-        self.recursion_count = 0
-        self.event = False
+        self._event = False
         self.locked = False
-        self.always_allow = lambda item, state: False
-        self.access_rule = lambda state: True
-        self.item_rule = lambda item: True
+        self.always_allow = never_always_allow
+        self.access_rule = always_accessible
+        self.item_rule = allow_all_items
         self.player = player
 
     def can_fill(self, state: CollectionState, item: Item, check_access=True) -> bool:
         return self.always_allow(state, item) or (self.parent_region.can_fill(item) and self.item_rule(item) and (not check_access or self.can_reach(state)))
 
+    @property
+    def item(self) -> Optional[Item]:
+        return self._item
+
+    @item.setter
+    def item(self, item: Optional[Item]):
+        old_item = self._item
+        self._item = item
+        if self.parent_region and self.parent_region.world:
+            self.parent_region.world.update_location_item(self, old_item)
+            self.parent_region.world.update_event_location(self)
+
+    @property
+    def event(self) -> bool:
+        return self._event
+
+    @event.setter
+    def event(self, event: bool):
+        self._event = event
+        if self.parent_region and self.parent_region.world:
+            self.parent_region.world.update_event_location(self)
+
     def can_reach(self, state: CollectionState) -> bool:
         # self.access_rule computes faster on average, so placing it first for faster abort
         if self.access_rule(state) and self.parent_region.can_reach(state):
@@ -1017,25 +1640,70 @@ class Location(object):
         return hash((self.name, self.player))
 
 
+class ProgressiveTiers(NamedTuple):
+    """Items a progressive item upgrades through, how many of them count under the player's difficulty."""
+    names: Tuple[str, ...]
+    ids: Tuple[int, ...]
+    limit: int
+
+
+class ItemTexts(NamedTuple):
+    """Hint and credit texts of an item type, shared by all items with the same texts."""
+    pedestal_hint: Optional[str]
+    pedestal_credit: Optional[str]
+    sickkid_credit: Optional[str]
+    zora_credit: Optional[str]
+    witch_credit: Optional[str]
+    fluteboy_credit: Optional[str]
+    hint_text: Optional[str]
+
+
+_item_texts: Dict[tuple, ItemTexts] = {}
+
+
 class Item(object):
+    __slots__ = ('name', 'advancement', 'priority', 'type', 'code', 'texts', 'location', 'world', 'player')
 
     def __init__(self, name='', advancement=False, priority=False, type=None, code=None, pedestal_hint=None, pedestal_credit=None, sickkid_credit=None, zora_credit=None, witch_credit=None, fluteboy_credit=None, hint_text=None, player=None):
         self.name = name
         self.advancement = advancement
         self.priority = priority
         self.type = type
-        self.pedestal_hint_text = pedestal_hint
-        self.pedestal_credit_text = pedestal_credit
-        self.sickkid_credit_text = sickkid_credit
-        self.zora_credit_text = zora_credit
-        self.magicshop_credit_text = witch_credit
-        self.fluteboy_credit_text = fluteboy_credit
-        self.hint_text = hint_text
+        texts = (pedestal_hint, pedestal_credit, sickkid_credit, zora_credit, witch_credit, fluteboy_credit, hint_text)
+        self.texts = _item_texts.get(texts) or _item_texts.setdefault(texts, ItemTexts(*texts))
         self.code = code
         self.location = None
         self.world = None
         self.player = player
 
+    @property
+    def pedestal_hint_text(self) -> Optional[str]:
+        return self.texts.pedestal_hint
+
+    @property
+    def pedestal_credit_text(self) -> Optional[str]:
+        return self.texts.pedestal_credit
+
+    @property
+    def sickkid_credit_text(self) -> Optional[str]:
+        return self.texts.sickkid_credit
+
+    @property
+    def zora_credit_text(self) -> Optional[str]:
+        return self.texts.zora_credit
+
+    @property
+    def magicshop_credit_text(self) -> Optional[str]:
+        return self.texts.witch_credit
+
+    @property
+    def fluteboy_credit_text(self) -> Optional[str]:
+        return self.texts.fluteboy_credit
+
+    @property
+    def hint_text(self) -> Optional[str]:
+        return self.texts.hint_text
+
     @property
     def crystal(self) -> bool:
         return self.type == 'Crystal'
@@ -1065,7 +1733,7 @@ class Item(object):
 
 # have 6 address that need to be filled
 class Crystal(Item):
-    pass
+    __slots__ = ()
 
 @unique
 class ShopType(Enum):
@@ -1203,29 +1871,26 @@ class Spoiler(object):
         self.startinventory = list(map(str, self.world.precollected_items))
 
         self.locations = OrderedDict()
-        listed_locations = set()
-
-        lw_locations = [loc for loc in self.world.get_locations() if loc not in listed_locations and loc.parent_region and loc.parent_region.type == RegionType.LightWorld]
-        self.locations['Light World'] = OrderedDict([(str(location), str(location.item) if location.item is not None else 'Nothing') for location in lw_locations])
-        listed_locations.update(lw_locations)
-
-        dw_locations = [loc for loc in self.world.get_locations() if loc not in listed_locations and loc.parent_region and loc.parent_region.type == RegionType.DarkWorld]
-        self.locations['Dark World'] = OrderedDict([(str(location), str(location.item) if location.item is not None else 'Nothing') for location in dw_locations])
-        listed_locations.update(dw_locations)
-
-        cave_locations = [loc for loc in self.world.get_locations() if loc not in listed_locations and loc.parent_region and loc.parent_region.type == RegionType.Cave]
-        self.locations['Caves'] = OrderedDict([(str(location), str(location.item) if location.item is not None else 'Nothing') for location in cave_locations])
-        listed_locations.update(cave_locations)
-
+        # one pass sorting locations into areas, dungeons are told apart by name and player like Dungeon.__eq__ does
+        areas = [(area, []) for area in ('Light World', 'Dark World', 'Caves')]
+        area_types = dict(zip((RegionType.LightWorld, RegionType.DarkWorld, RegionType.Cave), areas))
+        dungeon_areas = {}
         for dungeon in self.world.dungeons:
-            dungeon_locations = [loc for loc in self.world.get_locations() if loc not in listed_locations and loc.parent_region and loc.parent_region.dungeon == dungeon]
-            self.locations[str(dungeon)] = OrderedDict([(str(location), str(location.item) if location.item is not None else 'Nothing') for location in dungeon_locations])
-            listed_locations.update(dungeon_locations)
-
-        other_locations = [loc for loc in self.world.get_locations() if loc not in listed_locations]
+            areas.append((str(dungeon), []))
+            dungeon_areas.setdefault((dungeon.name, dungeon.player), areas[-1])
+        other_locations = []
+        for location in self.world.get_locations():
+            region = location.parent_region
+            if region and region.type in area_types:
+                area_types[region.type][1].append(location)
+            elif region and region.dungeon and (region.dungeon.name, region.dungeon.player) in dungeon_areas:
+                dungeon_areas[region.dungeon.name, region.dungeon.player][1].append(location)
+            else:
+                other_locations.append(location)
         if other_locations:
-            self.locations['Other Locations'] = OrderedDict([(str(location), str(location.item) if location.item is not None else 'Nothing') for location in other_locations])
-            listed_locations.update(other_locations)
+            areas.append(('Other Locations', other_locations))
+        for area, locations in areas:
+            self.locations[area] = OrderedDict([(str(location), str(location.item) if location.item is not None else 'Nothing') for location in locations])
 
         self.shops = []
         for shop in self.world.shops:
@@ -1313,133 +1978,174 @@ class Spoiler(object):
                          'shop_shuffle': self.world.shop_shuffle,
                          'shuffle_prizes': self.world.shuffle_prizes,
                          'sprite_pool': self.world.sprite_pool,
-                         'restrict_dungeon_item_on_boss': self.world.restrict_dungeon_item_on_boss
+                         'restrict_dungeon_item_on_boss': self.world.restrict_dungeon_item_on_boss,
+                         'derived_from_seed': self.world.derived_from_seed
                          }
 
+    def json_sections(self) -> List[Tuple[bool, str, Callable[[], object]]]:
+        """The entries of to_json in order as (needs_hashes, key, value) triples, value returning None for entries
+        that are left out. parse_data has to be called first."""
+        def hashes():
+            if self.hashes:
+                return {f"{self.world.player_names[player][team]} (Team {team+1})": hash
+                        for (player, team), hash in self.hashes.items()}
+
+        sections = [(False, 'Entrances', lambda: list(self.entrances.values()))]
+        sections.extend((False, area, functools.partial(self.locations.get, area)) for area in self.locations)
+        sections.extend([(False, 'Starting Inventory', lambda: self.startinventory),
+                         (False, 'Special', lambda: self.medallions),
+                         (True, 'Hashes', hashes),
+                         (False, 'Shops', lambda: self.shops or None),
+                         (False, 'playthrough', lambda: self.playthrough),
+                         (False, 'paths', lambda: self.paths),
+                         (False, 'Bosses', lambda: self.bosses),
+                         (False, 'meta', lambda: self.metadata)])
+        return sections
+
     def to_json(self):
         self.parse_data()
         out = OrderedDict()
-        out['Entrances'] = list(self.entrances.values())
-        out.update(self.locations)
-        out['Starting Inventory'] = self.startinventory
-        out['Special'] = self.medallions
-        if self.hashes:
-            out['Hashes'] = {f"{self.world.player_names[player][team]} (Team {team+1})": hash for (player, team), hash in self.hashes.items()}
-        if self.shops:
-            out['Shops'] = self.shops
-        out['playthrough'] = self.playthrough
-        out['paths'] = self.paths
-        out['Bosses'] = self.bosses
-        out['meta'] = self.metadata
+        for _, key, value in self.json_sections():
+            value = value()
+            if value is not None:
+                out[key] = value
 
         return json.dumps(out)
 
-    def to_file(self, filename):
+    def to_json_lines(self, filename):
+        """Writes the entries of to_json as one JSON object per line, so they can be read one at a time."""
         self.parse_data()
+        with open(filename, 'w', encoding="utf-8") as outfile:
+            for _, key, value in self.json_sections():
+                outfile.write(json_line(key, value))
 
+    def text_sections(self) -> List[Tuple[bool, Callable[[], str]]]:
+        """The text of to_file in order as (needs_hashes, text) pairs, with a section per player for their settings and
+        bosses. parse_data has to be called first."""
         def bool_to_text(variable: Union[bool, str]) -> str:
             if type(variable) == str:
                 return variable
             return 'Yes' if variable else 'No'
 
-        with open(filename, 'w', encoding="utf-8-sig") as outfile:
-            outfile.write(
-                'ALttP Berserker\'s Multiworld Version %s  -  Seed: %s\n\n' % (
-                    self.metadata['version'], self.world.seed))
-            outfile.write('Filling Algorithm:               %s\n' % self.world.algorithm)
-            outfile.write('Players:                         %d\n' % self.world.players)
-            outfile.write('Teams:                           %d\n' % self.world.teams)
-            for player in range(1, self.world.players + 1):
-                if self.world.players > 1:
-                    outfile.write('\nPlayer %d: %s\n' % (player, self.world.get_player_names(player)))
-                for team in range(self.world.teams):
-                    outfile.write('%s%s\n' % (
-                        f"Hash - {self.world.player_names[player][team]} (Team {team + 1}): " if self.world.teams > 1 else 'Hash: ',
-                        self.hashes[player, team]))
-                outfile.write('Logic:                           %s\n' % self.metadata['logic'][player])
-                outfile.write('Dark Room Logic:                 %s\n' % self.metadata['dark_room_logic'][player])
-                outfile.write('Restricted Boss Drops:           %s\n' %
-                              bool_to_text(self.metadata['restrict_dungeon_item_on_boss'][player]))
-                if self.world.players > 1:
-                    outfile.write('Progression Balanced:            %s\n' % (
-                        'Yes' if self.metadata['progression_balancing'][player] else 'No'))
-                outfile.write('Mode:                            %s\n' % self.metadata['mode'][player])
-                outfile.write('Retro:                           %s\n' %
-                              ('Yes' if self.metadata['retro'][player] else 'No'))
-                outfile.write('Swords:                          %s\n' % self.metadata['weapons'][player])
-                outfile.write('Goal:                            %s\n' % self.metadata['goal'][player])
-                if "triforce" in self.metadata["goal"][player]:  # triforce hunt
-                    outfile.write("Pieces available for Triforce:   %s\n" %
-                                  self.metadata['triforce_pieces_available'][player])
-                    outfile.write("Pieces required for Triforce:    %s\n" %
-                                  self.metadata["triforce_pieces_required"][player])
-                outfile.write('Difficulty:                      %s\n' % self.metadata['item_pool'][player])
-                outfile.write('Item Functionality:              %s\n' % self.metadata['item_functionality'][player])
-                outfile.write('Item Progression:                %s\n' % self.metadata['progressive'][player])
-                outfile.write('Entrance Shuffle:                %s\n' % self.metadata['shuffle'][player])
-                outfile.write('Crystals required for GT:        %s\n' % self.metadata['gt_crystals'][player])
-                outfile.write('Crystals required for Ganon:     %s\n' % self.metadata['ganon_crystals'][player])
-                outfile.write('Pyramid hole pre-opened:         %s\n' % (
-                    'Yes' if self.metadata['open_pyramid'][player] else 'No'))
-                outfile.write('Accessibility:                   %s\n' % self.metadata['accessibility'][player])
-                outfile.write('Map shuffle:                     %s\n' %
-                              ('Yes' if self.metadata['mapshuffle'][player] else 'No'))
-                outfile.write('Compass shuffle:                 %s\n' %
-                              ('Yes' if self.metadata['compassshuffle'][player] else 'No'))
-                outfile.write(
-                    'Small Key shuffle:               %s\n' % (bool_to_text(self.metadata['keyshuffle'][player])))
-                outfile.write('Big Key shuffle:                 %s\n' % (
-                    'Yes' if self.metadata['bigkeyshuffle'][player] else 'No'))
-                outfile.write('Shop inventory shuffle:          %s\n' %
-                              bool_to_text("i" in self.metadata["shop_shuffle"][player]))
-                outfile.write('Shop price shuffle:              %s\n' %
-                              bool_to_text("p" in self.metadata["shop_shuffle"][player]))
-                outfile.write('Shop upgrade shuffle:            %s\n' %
-                              bool_to_text("u" in self.metadata["shop_shuffle"][player]))
-                outfile.write('Boss shuffle:                    %s\n' % self.metadata['boss_shuffle'][player])
-                outfile.write(
-                    'Enemy shuffle:                   %s\n' % bool_to_text(self.metadata['enemy_shuffle'][player]))
-                outfile.write('Enemy health:                    %s\n' % self.metadata['enemy_health'][player])
-                outfile.write('Enemy damage:                    %s\n' % self.metadata['enemy_damage'][player])
-                outfile.write(f'Killable thieves:                {bool_to_text(self.metadata["killable_thieves"][player])}\n')
-                outfile.write(f'Shuffled tiles:                  {bool_to_text(self.metadata["tile_shuffle"][player])}\n')
-                outfile.write(f'Shuffled bushes:                 {bool_to_text(self.metadata["bush_shuffle"][player])}\n')
-                outfile.write(
-                    'Hints:                           %s\n' % ('Yes' if self.metadata['hints'][player] else 'No'))
-                outfile.write('Beemizer:                        %s\n' % self.metadata['beemizer'][player])
-                outfile.write('Pot shuffle                      %s\n'
-                              % ('Yes' if self.metadata['shufflepots'][player] else 'No'))
-                outfile.write('Prize shuffle                    %s\n' %
-                              self.metadata['shuffle_prizes'][player])
-            if self.entrances:
-                outfile.write('\n\nEntrances:\n\n')
-                outfile.write('\n'.join(['%s%s %s %s' % (f'{self.world.get_player_names(entry["player"])}: '
-                                                         if self.world.players > 1 else '', entry['entrance'],
-                                                         '<=>' if entry['direction'] == 'both' else
-                                                         '<=' if entry['direction'] == 'exit' else '=>',
-                                                         entry['exit']) for entry in self.entrances.values()]))
-            outfile.write('\n\nMedallions:\n')
+        def header() -> str:
+            text = 'ALttP Berserker\'s Multiworld Version %s  -  Seed: %s\n\n' % (
+                self.metadata['version'], self.world.seed)
+            if self.world.derived_from_seed is not None:
+                text += 'Derived from seed %s, which failed to generate\n\n' % self.world.derived_from_seed
+            text += 'Filling Algorithm:               %s\n' % self.world.algorithm
+            text += 'Players:                         %d\n' % self.world.players
+            text += 'Teams:                           %d\n' % self.world.teams
+            return text
+
+        def player_hashes(player: int) -> str:
+            lines = []
+            if self.world.players > 1:
+                lines.append('\nPlayer %d: %s\n' % (player, self.world.get_player_names(player)))
+            for team in range(self.world.teams):
+                lines.append('%s%s\n' % (
+                    f"Hash - {self.world.player_names[player][team]} (Team {team + 1}): " if self.world.teams > 1 else 'Hash: ',
+                    self.hashes[player, team]))
+            return ''.join(lines)
+
+        def player_settings(player: int) -> str:
+            lines = []
+            lines.append('Logic:                           %s\n' % self.metadata['logic'][player])
+            lines.append('Dark Room Logic:                 %s\n' % self.metadata['dark_room_logic'][player])
+            lines.append('Restricted Boss Drops:           %s\n' %
+                         bool_to_text(self.metadata['restrict_dungeon_item_on_boss'][player]))
+            if self.world.players > 1:
+                lines.append('Progression Balanced:            %s\n' % (
+                    'Yes' if self.metadata['progression_balancing'][player] else 'No'))
+            lines.append('Mode:                            %s\n' % self.metadata['mode'][player])
+            lines.append('Retro:                           %s\n' %
+                         ('Yes' if self.metadata['retro'][player] else 'No'))
+            lines.append('Swords:                          %s\n' % self.metadata['weapons'][player])
+            lines.append('Goal:                            %s\n' % self.metadata['goal'][player])
+            if "triforce" in self.metadata["goal"][player]:  # triforce hunt
+                lines.append("Pieces available for Triforce:   %s\n" %
+                             self.metadata['triforce_pieces_available'][player])
+                lines.append("Pieces required for Triforce:    %s\n" %
+                             self.metadata["triforce_pieces_required"][player])
+            lines.append('Difficulty:                      %s\n' % self.metadata['item_pool'][player])
+            lines.append('Item Functionality:              %s\n' % self.metadata['item_functionality'][player])
+            lines.append('Item Progression:                %s\n' % self.metadata['progressive'][player])
+            lines.append('Entrance Shuffle:                %s\n' % self.metadata['shuffle'][player])
+            lines.append('Crystals required for GT:        %s\n' % self.metadata['gt_crystals'][player])
+            lines.append('Crystals required for Ganon:     %s\n' % self.metadata['ganon_crystals'][player])
+            lines.append('Pyramid hole pre-opened:         %s\n' % (
+                'Yes' if self.metadata['open_pyramid'][player] else 'No'))
+            lines.append('Accessibility:                   %s\n' % self.metadata['accessibility'][player])
+            lines.append('Map shuffle:                     %s\n' %
+                         ('Yes' if self.metadata['mapshuffle'][player] else 'No'))
+            lines.append('Compass shuffle:                 %s\n' %
+                         ('Yes' if self.metadata['compassshuffle'][player] else 'No'))
+            lines.append(
+                'Small Key shuffle:               %s\n' % (bool_to_text(self.metadata['keyshuffle'][player])))
+            lines.append('Big Key shuffle:                 %s\n' % (
+                'Yes' if self.metadata['bigkeyshuffle'][player] else 'No'))
+            lines.append('Shop inventory shuffle:          %s\n' %
+                         bool_to_text("i" in self.metadata["shop_shuffle"][player]))
+            lines.append('Shop price shuffle:              %s\n' %
+                         bool_to_text("p" in self.metadata["shop_shuffle"][player]))
+            lines.append('Shop upgrade shuffle:            %s\n' %
+                         bool_to_text("u" in self.metadata["shop_shuffle"][player]))
+            lines.append('Boss shuffle:                    %s\n' % self.metadata['boss_shuffle'][player])
+            lines.append(
+                'Enemy shuffle:                   %s\n' % bool_to_text(self.metadata['enemy_shuffle'][player]))
+            lines.append('Enemy health:                    %s\n' % self.metadata['enemy_health'][player])
+            lines.append('Enemy damage:                    %s\n' % self.metadata['enemy_damage'][player])
+            lines.append(f'Killable thieves:                {bool_to_text(self.metadata["killable_thieves"][player])}\n')
+            lines.append(f'Shuffled tiles:                  {bool_to_text(self.metadata["tile_shuffle"][player])}\n')
+            lines.append(f'Shuffled bushes:                 {bool_to_text(self.metadata["bush_shuffle"][player])}\n')
+            lines.append(
+                'Hints:                           %s\n' % ('Yes' if self.metadata['hints'][player] else 'No'))
+            lines.append('Beemizer:                        %s\n' % self.metadata['beemizer'][player])
+            lines.append('Pot shuffle                      %s\n'
+                         % ('Yes' if self.metadata['shufflepots'][player] else 'No'))
+            lines.append('Prize shuffle                    %s\n' %
+                         self.metadata['shuffle_prizes'][player])
+            return ''.join(lines)
+
+        def entrances() -> str:
+            if not self.entrances:
+                return ''
+            return '\n\nEntrances:\n\n' + '\n'.join(['%s%s %s %s' % (f'{self.world.get_player_names(entry["player"])}: '
+                                                                  if self.world.players > 1 else '', entry['entrance'],
+                                                                  '<=>' if entry['direction'] == 'both' else
+                                                                  '<=' if entry['direction'] == 'exit' else '=>',
+                                                                  entry['exit']) for entry in self.entrances.values()])
+
+        def medallions_and_inventory() -> str:
+            text = '\n\nMedallions:\n'
             for dungeon, medallion in self.medallions.items():
-                outfile.write(f'\n{dungeon}: {medallion}')
+                text += f'\n{dungeon}: {medallion}'
             if self.startinventory:
-                outfile.write('\n\nStarting Inventory:\n\n')
-                outfile.write('\n'.join(self.startinventory))
-            outfile.write('\n\nLocations:\n\n')
-            outfile.write('\n'.join(['%s: %s' % (location, item) for grouping in self.locations.values() for (location, item) in grouping.items()]))
-            outfile.write('\n\nShops:\n\n')
-            outfile.write('\n'.join("{} [{}]\n    {}".format(shop['location'], shop['type'], "\n    ".join(item for item in [shop.get('item_0', None), shop.get('item_1', None), shop.get('item_2', None)] if item)) for shop in self.shops))
-            for player in range(1, self.world.players + 1):
-                if self.world.boss_shuffle[player] != 'none':
-                    bossmap = self.bosses[str(player)] if self.world.players > 1 else self.bosses
-                    outfile.write(f'\n\nBosses{(f" ({self.world.get_player_names(player)})" if self.world.players > 1 else "")}:\n')
-                    outfile.write('    '+'\n    '.join([f'{x}: {y}' for x, y in bossmap.items()]))
-            outfile.write('\n\nPlaythrough:\n\n')
-            outfile.write('\n'.join(['%s: {\n%s\n}' % (sphere_nr, '\n'.join(['  %s: %s' % (location, item) for (location, item) in sphere.items()] if sphere_nr != '0' else [f'  {item}' for item in sphere])) for (sphere_nr, sphere) in self.playthrough.items()]))
+                text += '\n\nStarting Inventory:\n\n'
+                text += '\n'.join(self.startinventory)
+            return text
+
+        def locations() -> str:
+            return '\n\nLocations:\n\n' + '\n'.join(['%s: %s' % (location, item) for grouping in self.locations.values() for (location, item) in grouping.items()])
+
+        def shops() -> str:
+            return '\n\nShops:\n\n' + '\n'.join("{} [{}]\n    {}".format(shop['location'], shop['type'], "\n    ".join(item for item in [shop.get('item_0', None), shop.get('item_1', None), shop.get('item_2', None)] if item)) for shop in self.shops)
+
+        def bosses(player: int) -> str:
+            if self.world.boss_shuffle[player] == 'none':
+                return ''
+            bossmap = self.bosses[str(player)] if self.world.players > 1 else self.bosses
+            return f'\n\nBosses{(f" ({self.world.get_player_names(player)})" if self.world.players > 1 else "")}:\n' + \
+                '    '+'\n    '.join([f'{x}: {y}' for x, y in bossmap.items()])
+
+        def playthrough() -> str:
+            text = '\n\nPlaythrough:\n\n'
+            text += '\n'.join(['%s: {\n%s\n}' % (sphere_nr, '\n'.join(['  %s: %s' % (location, item) for (location, item) in sphere.items()] if sphere_nr != '0' else [f'  {item}' for item in sphere])) for (sphere_nr, sphere) in self.playthrough.items()])
             if self.unreachables:
-                outfile.write('\n\nUnreachable Items:\n\n')
-                outfile.write('\n'.join(['%s: %s' % (unreachable.item, unreachable) for unreachable in self.unreachables]))
-            outfile.write('\n\nPaths:\n\n')
+                text += '\n\nUnreachable Items:\n\n'
+                text += '\n'.join(['%s: %s' % (unreachable.item, unreachable) for unreachable in self.unreachables])
+            return text
 
+        def paths() -> str:
             path_listings = []
             for location, path in sorted(self.paths.items()):
                 path_lines = []
@@ -1450,4 +2156,107 @@ class Spoiler(object):
                         path_lines.append(region)
                 path_listings.append("{}\n        {}".format(location, "\n   =>   ".join(path_lines)))
 
-            outfile.write('\n'.join(path_listings))
+            return '\n\nPaths:\n\n' + '\n'.join(path_listings)
+
+        players = range(1, self.world.players + 1)
+        sections = [(False, header)]
+        for player in players:
+            sections.append((True, functools.partial(player_hashes, player)))
+            sections.append((False, functools.partial(player_settings, player)))
+        sections.extend([(False, entrances), (False, medallions_and_inventory), (False, locations), (False, shops)])
+        sections.extend((False, functools.partial(bosses, player)) for player in players)
+        sections.extend([(False, playthrough), (False, paths)])
+        return sections
+
+    def to_file(self, filename):
+        self.parse_data()
+        with open(filename, 'w', encoding="utf-8-sig") as outfile:
+            for _, text in self.text_sections():
+                outfile.write(text())
+
+
+def json_line(key: str, value: Callable[[], object]) -> str:
+    """key and the result of value as a line of JSON, empty if the result is None."""
+    value = value()
+    return '' if value is None else json.dumps({key: value}) + '\n'
+
+
+class SpoilerWriter(object):
+    """Writes a spoiler as text like Spoiler.to_file, and optionally as JSON lines like Spoiler.to_json_lines, section
+    by section. Every section is formatted on executor as soon as the writer is created, except those showing rom
+    hashes, which wait for hashes_done. Each formatted section is written out as soon as the ones before it are."""
+
+    def __init__(self, spoiler: Spoiler, filename: str, json_filename: Optional[str] = None, executor=None):
+        spoiler.parse_data()
+        self.executor = executor
+        # sections finish on executor threads, which write them out as they do
+        self.lock = threading.RLock()
+        self.closed = False
+        self.outputs = [(open(filename, 'w', encoding="utf-8-sig"), deque(spoiler.text_sections()))]
+        if json_filename:
+            self.outputs.append((open(json_filename, 'w', encoding="utf-8"),
+                                 deque((needs_hashes, functools.partial(json_line, key, value))
+                                       for needs_hashes, key, value in spoiler.json_sections())))
+        self.pending = [deque() for _ in self.outputs]
+        self.have_hashes = False
+        self._submit()
+
+    def _submit(self):
+        with self.lock:
+            for (_, sections), pending in zip(self.outputs, self.pending):
+                while sections and (self.have_hashes or not sections[0][0]):
+                    _, text = sections.popleft()
+                    if self.executor:
+                        text = self.executor.submit(text)
+                        text.add_done_callback(self._section_done)
+                    pending.append(text)
+            self.write_ready()
+
+    def _section_done(self, future):
+        self.write_ready()
+
+    def hashes_done(self):
+        """Lets the sections showing rom hashes be formatted, Spoiler.hashes must not change after this."""
+        self.have_hashes = True
+        self._submit()
+
+    def write_ready(self):
+        """Writes the sections that are formatted and not preceded by one that isn't."""
+        with self.lock:
+            if self.closed:
+                return
+            for (outfile, _), pending in zip(self.outputs, self.pending):
+                while pending and (not self.executor or pending[0].done()):
+                    text = pending.popleft()
+                    outfile.write(text.result() if self.executor else text())
+
+    def close(self):
+        """Waits for and writes all remaining sections, the files are removed if that fails."""
+        try:
+            if not self.have_hashes:
+                self.hashes_done()
+            if self.executor:
+                # without holding the lock, the executor threads need it to finish the sections they write
+                concurrent.futures.wait([text for pending in self.pending for text in list(pending)])
+            with self.lock:
+                for (outfile, _), pending in zip(self.outputs, self.pending):
+                    while pending:
+                        text = pending.popleft()
+                        outfile.write(text.result() if self.executor else text())
+        except BaseException:
+            self.abort()
+            raise
+        self._close_files()
+
+    def abort(self):
+        """Closes and removes the spoiler files without writing the remaining sections, for when generating failed."""
+        self._close_files()
+        for outfile, _ in self.outputs:
+            if os.path.exists(outfile.name):
+                os.remove(outfile.name)
+
+    def _close_files(self):
+        with self.lock:
+            self.closed = True
+            for outfile, _ in self.outputs:
+                outfile.close()
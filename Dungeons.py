@@ -43,6 +43,7 @@ def create_dungeons(world, player):
     GT.bosses['top'] = BossFactory('Moldorm', player)
 
     world.dungeons += [ES, EP, DP, ToH, AT, PoD, TT, SW, SP, IP, MM, TR, GT]
+    world.clear_location_cache()  # the location indexes tell dungeon locations apart by their region's dungeon
 
 def fill_dungeons(world):
     #All chests on the freebes list locked behind a key in room with no other exit
@@ -310,6 +310,39 @@ def parse_arguments(argv, no_defaults=False):
     parser.add_argument('--skip_progression_balancing', action='store_true', default=defval(False),
                         help="Skip Multiworld Progression balancing.")
     parser.add_argument('--skip_playthrough', action='store_true', default=defval(False))
+    parser.add_argument('--generation_attempts', default=defval(1), type=lambda value: max(int(value), 1),
+                        help='''\
+                             If the seed fails to generate, use the first of this many
+                             attempts with seeds derived from it that succeeds. The attempts
+                             run in parallel processes. Has no effect on race roms.
+                             (default: %(default)s)
+                             ''')
+    parser.add_argument('--parallel_setup', action='store_true', default=defval(False),
+                        help='''\
+                             Create the regions, entrances and item pool of each player
+                             in parallel processes. Each player uses a random stream of
+                             their own, so a seed generates differently than without
+                             this option. Has no effect on race roms.
+                             ''')
+    parser.add_argument('--timing', action='store_true', default=defval(False),
+                        help='''\
+                             Write the wall time, cpu time, peak memory and counters of
+                             rule evaluations, reachability updates, state copies and
+                             sweeps of each generation stage to a _Timing.json file next
+                             to the spoiler. Counting slows down the generation.
+                             ''')
+    parser.add_argument('--json_spoiler', action='store_true', default=defval(False),
+                        help='''\
+                             With --create_spoiler, also output the spoiler as a
+                             _Spoiler.jsonl file, with one JSON object per section, so it
+                             can be read a section at a time.
+                             ''')
+    parser.add_argument('--profile', default=defval(None), choices=['cprofile', 'pyinstrument'],
+                        help='''\
+                             Profile each generation stage, writing one profile per
+                             stage next to the spoiler. pyinstrument needs to be
+                             installed separately.
+                             ''')
     parser.add_argument('--enemizercli', default=defval('EnemizerCLI/EnemizerCLI.Core'))
     parser.add_argument('--shufflebosses', default=defval('none'), choices=['none', 'basic', 'normal', 'chaos',
                                                                             "singularity"])
@@ -1,20 +1,52 @@
 import logging
 import typing
 
-from BaseClasses import CollectionState
+from BaseClasses import CollectionState, SphereIterator, Item, RuleTrace
+from RuleObjects import never_always_allow
 
 
 class FillError(RuntimeError):
     pass
 
-def fill_restrictive(world, base_state: CollectionState, locations, itempool, single_player_placement=False):
-    def sweep_from_pool():
-        new_state = base_state.copy()
-        for item in itempool:
-            new_state.collect(item, True)
+class ExplorationStates(object):
+    """The maximum exploration states of fill_restrictive: base_state with every item still in the pool collected,
+    swept. As the pool only shrinks, the state of a round is a superset of the states of all later rounds, so the
+    later rounds' states are built first, from an empty pool upwards, and kept as swept checkpoints every few rounds.
+    A round then copies the checkpoint of the nearest later round and only collects and sweeps the difference.
+
+    Sweeping is a fixpoint, so this ends up in the same state as collecting the whole pool from scratch."""
+
+    def __init__(self, base_state: CollectionState, rounds: typing.List[typing.List[Item]]):
+        """rounds are the items each round takes out of the pool, in order."""
+        self.rounds = rounds
+        self.interval = max(1, int(len(rounds) ** 0.5))
+        self.checkpoints: typing.Dict[int, CollectionState] = {}
+        state = base_state.copy()
+        for index in reversed(range(len(rounds))):
+            if index % self.interval == self.interval - 1 or index == len(rounds) - 1:
+                state.sweep_for_events()
+                self.checkpoints[index] = state
+                state = state.copy()
+            for item in rounds[index]:
+                state.collect(item, True)
+
+    def state(self, index: int) -> CollectionState:
+        """State of round index, after its items left the pool."""
+        checkpoint_index = min(index - index % self.interval + self.interval - 1, len(self.rounds) - 1)
+        for passed in [passed for passed in self.checkpoints if passed < checkpoint_index]:
+            del self.checkpoints[passed]
+        checkpoint = self.checkpoints[checkpoint_index]
+        # events placed since remain valid for every later round, keep them on the checkpoint
+        checkpoint.sweep_for_events()
+        new_state = checkpoint.copy()
+        for later_round in self.rounds[index + 1:checkpoint_index + 1]:
+            for item in later_round:
+                new_state.collect(item, True)
         new_state.sweep_for_events()
         return new_state
 
+
+def fill_restrictive(world, base_state: CollectionState, locations, itempool, single_player_placement=False):
     unplaced_items = []
 
     no_access_checks = {}
@@ -25,41 +57,96 @@ def fill_restrictive(world, base_state: CollectionState, locations, itempool, si
         else:
             reachable_items.setdefault(item.player, []).append(item)
 
+    # items taken out of the pool in each round, the loop below takes them in the same order
+    rounds = []
     for player_items in [no_access_checks, reachable_items]:
-        while any(player_items.values()) and locations:
-            items_to_place = [[itempool.remove(items[-1]), items.pop()][-1] for items in player_items.values() if items]
-
-            maximum_exploration_state = sweep_from_pool()
-            has_beaten_game = world.has_beaten_game(maximum_exploration_state)
-
-            for item_to_place in items_to_place:
-                perform_access_check = True
-                if world.accessibility[item_to_place.player] == 'none':
-                    perform_access_check = not world.has_beaten_game(maximum_exploration_state, item_to_place.player) if single_player_placement else not has_beaten_game
-                for location in locations:
-                    if (not single_player_placement or location.player == item_to_place.player)\
-                            and location.can_fill(maximum_exploration_state, item_to_place, perform_access_check):
+        remaining = [items.copy() for items in player_items.values()]
+        while any(remaining):
+            rounds.append([items.pop() for items in remaining if items])
+    exploration_states = ExplorationStates(base_state, rounds)
+    round_index = 0
+
+    # locations in their shuffled order, by player for single player placement. Placed locations and items are only
+    # marked while filling and taken out of locations and itempool once at the end.
+    candidates = {}
+    for location in locations:
+        candidates.setdefault(location.player if single_player_placement else None, []).append(location)
+    placed_counts = dict.fromkeys(candidates, 0)
+    placed = set()
+    taken = set()
+
+    try:
+        for player_items in [no_access_checks, reachable_items]:
+            while any(player_items.values()) and len(placed) < len(locations):
+                items_to_place = [items.pop() for items in player_items.values() if items]
+                taken.update(items_to_place)
+
+                maximum_exploration_state = exploration_states.state(round_index)
+                round_index += 1
+                has_beaten_game = world.has_beaten_game(maximum_exploration_state)
+                # reachability of the locations checked so far this round, the same state is used for all its items.
+                # Rules reading item placements are volatile and checked again, as this round's placements change them.
+                reachable = set()
+                unreachable = set()
+                traces = {}
+
+                for item_to_place in items_to_place:
+                    perform_access_check = True
+                    if world.accessibility[item_to_place.player] == 'none':
+                        perform_access_check = not world.has_beaten_game(maximum_exploration_state, item_to_place.player) if single_player_placement else not has_beaten_game
+                    # same outcome as location.can_fill, with the access check last and remembered
+                    for location in candidates.get(item_to_place.player if single_player_placement else None, ()):
+                        if location in placed:
+                            continue
+                        if location.always_allow is not never_always_allow and \
+                                location.always_allow(maximum_exploration_state, item_to_place):
+                            spot_to_fill = location
+                            break
+                        if perform_access_check and location in unreachable:
+                            continue
+                        if not location.parent_region.can_fill(item_to_place) or not location.item_rule(item_to_place):
+                            continue
+                        if perform_access_check and location not in reachable:
+                            trace = traces.get(location.player)
+                            if not trace:
+                                trace = traces[location.player] = RuleTrace(maximum_exploration_state,
+                                                                            location.player)
+                            can_reach = trace.access(location) and \
+                                location.parent_region.can_reach(maximum_exploration_state)
+                            if not trace.volatile:
+                                (reachable if can_reach else unreachable).add(location)
+                            if not can_reach:
+                                continue
                         spot_to_fill = location
                         break
 
-                else:
-                    # we filled all reachable spots. Maybe the game can be beaten anyway?
-                    unplaced_items.insert(0, item_to_place)
-                    if world.accessibility[item_to_place.player] != 'none' and world.can_beat_game():
-                        logging.warning(
-                            f'Not all items placed. Game beatable anyway. (Could not place {item_to_place})')
-                        continue
-                    placements = []
-                    for region in world.regions:
-                        for location in region.locations:
-                            if location.item and not location.event:
-                                placements.append(location)
-                    raise FillError(f'No more spots to place {item_to_place}, locations {locations} are invalid. '
-                                    f'Already placed {len(placements)}: {", ".join(placements)}')
-
-                world.push_item(spot_to_fill, item_to_place, False)
-                locations.remove(spot_to_fill)
-                spot_to_fill.event = True
+                    else:
+                        # we filled all reachable spots. Maybe the game can be beaten anyway?
+                        unplaced_items.insert(0, item_to_place)
+                        if world.accessibility[item_to_place.player] != 'none' and world.can_beat_game():
+                            logging.warning(
+                                f'Not all items placed. Game beatable anyway. (Could not place {item_to_place})')
+                            continue
+                        placements = []
+                        for region in world.regions:
+                            for location in region.locations:
+                                if location.item and not location.event:
+                                    placements.append(location)
+                        remaining = [location for location in locations if location not in placed]
+                        raise FillError(f'No more spots to place {item_to_place}, locations {remaining} are invalid. '
+                                        f'Already placed {len(placements)}: {", ".join(placements)}')
+
+                    world.push_item(spot_to_fill, item_to_place, False)
+                    placed.add(spot_to_fill)
+                    spot_to_fill.event = True
+                    key = spot_to_fill.player if single_player_placement else None
+                    placed_counts[key] += 1
+                    if placed_counts[key] * 2 > len(candidates[key]):
+                        candidates[key] = [location for location in candidates[key] if location not in placed]
+                        placed_counts[key] = 0
+    finally:
+        locations[:] = [location for location in locations if location not in placed]
+        itempool[:] = [item for item in itempool if item not in taken]
 
     itempool.extend(unplaced_items)
 
@@ -177,23 +264,41 @@ def flood_items(world):
     # sweep once to pick up preplaced items
     world.state.sweep_for_events()
 
+    # grows with world.state, items can be placed at the reachable unfilled locations and those with always_allow rules
+    reachability = SphereIterator(world.state, world.get_locations())
+    reachable_locations = []
+    fill_locations = [location for location in world.get_unfilled_locations() if
+                      location.always_allow is not never_always_allow]
+
+    def pick(locations, accept) -> typing.Optional[int]:
+        # same as taking the first accepted location of a shuffled list, without shuffling all of it
+        untried = len(locations)
+        while untried:
+            index = world.random.randrange(untried)
+            untried -= 1
+            locations[index], locations[untried] = locations[untried], locations[index]
+            if accept(locations[untried]):
+                return untried
+        return None
+
     # fill world from top of itempool while we can
     while not progress_done:
-        location_list = world.get_unfilled_locations()
-        world.random.shuffle(location_list)
-        spot_to_fill = None
-        for location in location_list:
-            if location.can_fill(world.state, itempool[0]):
-                spot_to_fill = location
-                break
-
-        if spot_to_fill:
+        sphere = reachability.next_sphere()
+        reachable_locations.extend(sphere)
+        fill_locations.extend(location for location in sphere if location.item is None and
+                              location.always_allow is never_always_allow)
+
+        index = pick(fill_locations, lambda location: location.can_fill(world.state, itempool[0]))
+        if index is not None:
+            spot_to_fill = fill_locations[index]
+            fill_locations[index] = fill_locations[-1]
+            fill_locations.pop()
             item = itempool.pop(0)
             world.push_item(spot_to_fill, item, True)
             continue
 
         # ran out of spots, check if we need to step in and correct things
-        if len(world.get_reachable_locations()) == len(world.get_locations()):
+        if not reachability.remaining:
             progress_done = True
             continue
 
@@ -203,7 +308,7 @@ def flood_items(world):
         for item in itempool:
             if item.advancement:
                 candidate_item_to_place = item
-                if world.unlocks_new_location(item):
+                if any(location.item is None for location in reachability.unlocked_by(item)):
                     item_to_place = item
                     break
 
@@ -215,17 +320,17 @@ def flood_items(world):
                 raise FillError('No more progress items left to place.')
 
         # find item to replace with progress item
-        location_list = world.get_reachable_locations()
-        world.random.shuffle(location_list)
-        for location in location_list:
-            if location.item is not None and not location.item.advancement and not location.item.priority and not location.item.smallkey and not location.item.bigkey:
-                # safe to replace
-                replace_item = location.item
-                replace_item.location = None
-                itempool.append(replace_item)
-                world.push_item(location, item_to_place, True)
-                itempool.remove(item_to_place)
-                break
+        index = pick(reachable_locations, lambda location: location.item is not None and
+                     not location.item.advancement and not location.item.priority and
+                     not location.item.smallkey and not location.item.bigkey)
+        if index is not None:
+            # safe to replace
+            location = reachable_locations[index]
+            replace_item = location.item
+            replace_item.location = None
+            itempool.append(replace_item)
+            world.push_item(location, item_to_place, True)
+            itempool.remove(item_to_place)
 
 def balance_multiworld_progression(world):
     balanceable_players = {player for player in range(1, world.players + 1) if world.progression_balancing[player]}
@@ -237,6 +342,8 @@ def balance_multiworld_progression(world):
         checked_locations = []
         unchecked_locations = world.get_locations().copy()
         world.random.shuffle(unchecked_locations)
+        spheres = SphereIterator(state, unchecked_locations)
+        unchecked_locations = spheres.remaining
 
         reachable_locations_count = {player: 0 for player in range(1, world.players + 1)}
 
@@ -244,10 +351,13 @@ def balance_multiworld_progression(world):
             sphere_state.sweep_for_events(key_only=True, locations=locations)
             return [loc for loc in locations if sphere_state.can_reach(loc)]
 
+        def get_next_sphere(sphere_state, sphere_iterator):
+            sphere_state.sweep_for_events(key_only=True, locations=sphere_iterator.remaining)
+            return sphere_iterator.next_sphere()
+
         while True:
-            sphere_locations = get_sphere_locations(state, unchecked_locations)
+            sphere_locations = get_next_sphere(state, spheres)
             for location in sphere_locations:
-                unchecked_locations.remove(location)
                 reachable_locations_count[location.player] += 1
 
             if checked_locations:
@@ -256,7 +366,8 @@ def balance_multiworld_progression(world):
                                      reachables < threshold and player in balanceable_players]
                 if balancing_players:
                     balancing_state = state.copy()
-                    balancing_unchecked_locations = unchecked_locations.copy()
+                    balancing_spheres = SphereIterator(balancing_state, unchecked_locations)
+                    balancing_unchecked_locations = balancing_spheres.remaining
                     balancing_reachables = reachable_locations_count.copy()
                     balancing_sphere = sphere_locations.copy()
                     candidate_items = []
@@ -268,9 +379,8 @@ def balance_multiworld_progression(world):
                                 balancing_state.collect(location.item, True, location)
                                 if location.item.player in balancing_players and not location.locked:
                                     candidate_items.append(location)
-                        balancing_sphere = get_sphere_locations(balancing_state, balancing_unchecked_locations)
+                        balancing_sphere = get_next_sphere(balancing_state, balancing_spheres)
                         for location in balancing_sphere:
-                            balancing_unchecked_locations.remove(location)
                             balancing_reachables[location.player] += 1
                         if world.has_beaten_game(balancing_state) or all(
                                 [reachables >= threshold for reachables in balancing_reachables.values()]):
@@ -320,7 +430,7 @@ def balance_multiworld_progression(world):
                     if replaced_items:
                         for location in get_sphere_locations(state, [l for l in unlocked_locations if
                                                                      l.player in balancing_players]):
-                            unchecked_locations.remove(location)
+                            spheres.discard(location)
                             reachable_locations_count[location.player] += 1
                             sphere_locations.append(location)
 
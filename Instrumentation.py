@@ -0,0 +1,179 @@
+"""Per stage timing, counters and optional profiling of a generation, see GenerationStats."""
+from __future__ import annotations
+import collections
+import functools
+import json
+import sys
+import threading
+import time
+import typing
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import BaseClasses
+import Dungeons
+import Fill
+import ItemPool
+
+profilers = ('cprofile', 'pyinstrument')
+
+# (owner, attribute, counter) of the functions that are counted while stats are collected
+counted_functions = (
+    (BaseClasses.Entrance, 'can_reach', 'entrance rule evaluations'),
+    (BaseClasses.Location, 'can_reach', 'location rule evaluations'),
+    (BaseClasses.RuleTrace, 'access', 'traced rule evaluations'),
+    (BaseClasses.CollectionState, 'copy', 'state copies'),
+    (BaseClasses.CollectionState, 'collect', 'items collected'),
+)
+
+# (owner, attribute, counter) of the functions that are counted and timed, only the outermost of nested calls is timed
+timed_functions = (
+    (BaseClasses.CollectionState, 'update_reachable_regions', 'update_reachable_regions'),
+    (BaseClasses.CollectionState, 'sweep_for_events', 'sweeps'),
+    (BaseClasses.SphereIterator, 'next_sphere', 'spheres'),
+    (BaseClasses.World, 'can_beat_game', 'can_beat_game'),
+    # the modules importing fill_restrictive by name hold bindings of their own
+    (Fill, 'fill_restrictive', 'fill_restrictive'),
+    (Dungeons, 'fill_restrictive', 'fill_restrictive'),
+    (ItemPool, 'fill_restrictive', 'fill_restrictive'),
+)
+
+
+def peak_rss() -> typing.Optional[float]:
+    """Peak RSS of this process in MiB, None where the resource module is unavailable."""
+    if resource is None:
+        return None
+    kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        kib //= 1024  # ru_maxrss is in bytes there
+    return kib / 1024
+
+
+class StageProfiler(object):
+    """Profiles one stage with cProfile or pyinstrument, writing the result to path."""
+
+    def __init__(self, kind: str, path: str):
+        self.kind = kind
+        if kind == 'cprofile':
+            import cProfile
+            self.path = path + '.prof'
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif kind == 'pyinstrument':
+            try:
+                import pyinstrument
+            except ImportError:
+                raise RuntimeError('Profiling with pyinstrument requires the pyinstrument package.')
+            self.path = path + '.html'
+            self.profiler = pyinstrument.Profiler()
+            self.profiler.start()
+        else:
+            raise ValueError(f'Unknown profiler {kind}, expected one of {", ".join(profilers)}.')
+
+    def stop(self):
+        if self.kind == 'cprofile':
+            self.profiler.disable()
+            self.profiler.dump_stats(self.path)
+        else:
+            self.profiler.stop()
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(self.profiler.output_html())
+
+
+class GenerationStats(object):
+    """Wall time, cpu time, peak RSS and counters of each stage of a generation. Stages follow each other,
+    starting one ends the previous one. Counting functions patches them process wide until close(), so only one
+    GenerationStats should count at a time."""
+
+    def __init__(self, count: bool = False, profiler: typing.Optional[str] = None,
+                 profile_path: typing.Optional[str] = None):
+        self.stages: typing.List[dict] = []
+        self.counters: typing.Counter[str] = collections.Counter()
+        self.times: typing.Counter[str] = collections.Counter()
+        self.profiler_kind = profiler
+        self.profile_path = profile_path
+        self.profiler: typing.Optional[StageProfiler] = None
+        self.current: typing.Optional[dict] = None
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.patched: typing.List[typing.Tuple[object, str, object]] = []
+        self.depth = threading.local()
+        if count:
+            self._patch()
+
+    def start_stage(self, name: str):
+        self.end_stage()
+        self.current = {'name': name, 'wall': time.perf_counter(), 'cpu': time.process_time(),
+                        'counters': self.counters.copy(), 'times': self.times.copy()}
+        if self.profiler_kind:
+            file_name = f'{self.profile_path}_{len(self.stages) + 1:02}_{name.replace(" ", "_")}'
+            self.profiler = StageProfiler(self.profiler_kind, file_name)
+
+    def end_stage(self):
+        if self.profiler:
+            self.profiler.stop()
+            self.profiler = None
+        stage, self.current = self.current, None
+        if stage:
+            stage['wall'] = time.perf_counter() - stage['wall']
+            stage['cpu'] = time.process_time() - stage['cpu']
+            stage['peak_rss'] = peak_rss()
+            stage['counters'] = dict(self.counters - stage['counters'])
+            stage['times'] = dict(self.times - stage['times'])
+            self.stages.append(stage)
+
+    def close(self):
+        """Ends the current stage and restores the counted functions, can be called more than once."""
+        self.end_stage()
+        for owner, attribute, original in reversed(self.patched):
+            setattr(owner, attribute, original)
+        self.patched.clear()
+
+    def to_dict(self) -> dict:
+        return {'wall': time.perf_counter() - self.start_wall,
+                'cpu': time.process_time() - self.start_cpu,
+                'peak_rss': peak_rss(),
+                'counters': dict(self.counters),
+                'times': dict(self.times),
+                'stages': self.stages}
+
+    def to_file(self, filename: str):
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def _patch(self):
+        counters = self.counters
+        times = self.times
+        depth = self.depth
+
+        def counted(function, counter):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                counters[counter] += 1
+                return function(*args, **kwargs)
+            return wrapper
+
+        def timed(function, counter):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                counters[counter] += 1
+                nested = getattr(depth, counter, 0)
+                if nested:
+                    return function(*args, **kwargs)
+                setattr(depth, counter, 1)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    times[counter] += time.perf_counter() - start
+                    setattr(depth, counter, 0)
+            return wrapper
+
+        for functions, wrap in ((counted_functions, counted), (timed_functions, timed)):
+            for owner, attribute, counter in functions:
+                original = owner.__dict__[attribute]
+                self.patched.append((owner, attribute, original))
+                setattr(owner, attribute, wrap(original, counter))
@@ -1,4 +1,5 @@
 from collections import namedtuple
+import functools
 import logging
 
 from BaseClasses import Region, RegionType, ShopType, Location, TakeAny
@@ -167,6 +168,10 @@ difficulties = {
 }
 
 
+def can_complete_triforce_hunt(state, player: int) -> bool:
+    return state.has_triforce_pieces(state.world.treasure_hunt_count[player], player)
+
+
 def generate_itempool(world, player: int):
     if world.difficulty[player] not in difficulties:
         raise NotImplementedError(f"Diffulty {world.difficulty[player]}")
@@ -189,7 +194,8 @@ def generate_itempool(world, player: int):
         region = world.get_region('Light World', player)
 
         loc = Location(player, "Murahdahla", parent=region)
-        loc.access_rule = lambda state: state.has_triforce_pieces(state.world.treasure_hunt_count[player], player)
+        # not a lambda, so the location can be pickled when players are built in parallel
+        loc.access_rule = functools.partial(can_complete_triforce_hunt, player=player)
 
         region.locations.append(loc)
         world.dynamic_locations.append(loc)
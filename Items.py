@@ -184,6 +184,28 @@ item_table = {'Bow': (True, False, None, 0x0B, 'You have\nchosen the\narcher cla
 
 lookup_id_to_name = {data[3]: name for name, data in item_table.items()}
 
+
+class ItemIdTable(dict):
+    """Interns item names to dense integer indices, used to address the per player inventory arrays.
+    Names not found in item_table get the next free index when first indexed, which only collecting items does.
+    Reads use get, so looking up names that were never collected doesn't grow the table."""
+
+    def __missing__(self, item_name: str) -> int:
+        index = self[item_name] = len(self)
+        return index
+
+
+item_ids = ItemIdTable((name, index) for index, name in enumerate(item_table))
+
+# tiers granted by each progressive item in order, with the difficulty_requirements attribute capping how many count
+progressive_item_tiers = {
+    'Progressive Sword': (('Fighter Sword', 'Master Sword', 'Tempered Sword', 'Golden Sword'), 'progressive_sword_limit'),
+    'Progressive Glove': (('Power Glove', 'Titans Mitts'), None),
+    'Progressive Shield': (('Blue Shield', 'Red Shield', 'Mirror Shield'), 'progressive_shield_limit'),
+    'Progressive Bow': (('Bow', 'Silver Bow'), 'progressive_bow_limit'),
+    'Progressive Bow (Alt)': (('Bow', 'Silver Bow'), 'progressive_bow_limit'),
+}
+
 hint_blacklist = {"Triforce"}
 
 item_name_groups = {"Bows":
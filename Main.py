@@ -1,26 +1,34 @@
 from collections import OrderedDict
 import copy
+import gc
+import itertools
 from itertools import zip_longest
 import json
 import logging
 import os
+import pickle
 import random
 import time
 import zlib
 import concurrent.futures
+import functools
+import multiprocessing
+import typing
 
-from BaseClasses import World, CollectionState, Item, Region, Location, Shop
+from BaseClasses import World, CollectionState, SphereIterator, Item, Region, RegionType, Entrance, Shop, SpoilerWriter
 from Items import ItemFactory
 from Regions import create_regions, create_shops, mark_light_world_regions, lookup_vanilla_location_to_entrance
 from InvertedRegions import create_inverted_regions, mark_dark_world_regions
 from EntranceShuffle import link_entrances, link_inverted_entrances
 from Rom import patch_rom, patch_race_rom, patch_enemizer, apply_rom_settings, LocalRom, get_hash_string
-from Rules import set_rules
+from Rules import set_rules, forbid_items_for_player
 from Dungeons import create_dungeons, fill_dungeons, fill_dungeons_restrictive
-from Fill import distribute_items_restrictive, flood_items, balance_multiworld_progression
+from Fill import distribute_items_restrictive, flood_items, balance_multiworld_progression, FillError
 from ItemPool import generate_itempool, difficulties, fill_prizes
 from Utils import output_path, parse_player_names, get_options, __version__, _version_tuple
 import Patch
+import RuleObjects
+from Instrumentation import GenerationStats
 
 seeddigits = 20
 
@@ -32,149 +40,93 @@ def get_seed(seed=None):
     return seed
 
 
-def main(args, seed=None):
-    if args.outputpath:
-        os.makedirs(args.outputpath, exist_ok=True)
-        output_path.cached_path = args.outputpath
-    
-    start = time.perf_counter()
+def derive_seeds(seed: int, count: int) -> typing.List[int]:
+    """seed followed by count - 1 seeds derived from it, the seeds generation attempts are made with."""
+    derived = random.Random(seed)
+    return [seed] + [derived.randint(0, pow(10, seeddigits) - 1) for _ in range(count - 1)]
+
+
+def _generation_attempt(args, seed: int) -> typing.Optional[int]:
+    """Generates the world without writing any output, returns the seed if it generated without an error."""
+    logging.disable(logging.CRITICAL)
+    args = copy.copy(args)
+    args.suppress_rom = True
+    args.create_spoiler = False
+    args.json_spoiler = False
+    args.skip_playthrough = True
+    # only the final run of the seed that generated is timed and profiled
+    args.timing = False
+    args.profile = None
+    try:
+        main(args, seed)
+    except FillError:
+        return None
+    except Exception:
+        logging.disable(logging.NOTSET)
+        logging.exception('Generation attempt with seed %s failed.', seed)
+        return None
+    return seed
 
-    # initialize the world
-    world = World(args.multi, args.shuffle, args.logic, args.mode, args.swords, args.difficulty,
-                  args.item_functionality, args.timer, args.progressive.copy(), args.goal, args.algorithm,
-                  args.accessibility, args.shuffleganon, args.retro, args.custom, args.customitemarray, args.hints)
 
+def main_with_attempts(args, seed=None):
+    """Generates the seed in this process while the derived seeds are tried in a process pool. If the seed fails,
+    the world is generated again from the first derived seed that succeeded, which the spoiler and multidata record."""
     logger = logging.getLogger('')
-    world.seed = get_seed(seed)
-    if args.race:
-        world.secure()
-    else:
-        world.random.seed(world.seed)
-
-    world.remote_items = args.remote_items.copy()
-    world.mapshuffle = args.mapshuffle.copy()
-    world.compassshuffle = args.compassshuffle.copy()
-    world.keyshuffle = args.keyshuffle.copy()
-    world.bigkeyshuffle = args.bigkeyshuffle.copy()
-    world.crystals_needed_for_ganon = {
-        player: world.random.randint(0, 7) if args.crystals_ganon[player] == 'random' else int(
-            args.crystals_ganon[player]) for player in range(1, world.players + 1)}
-    world.crystals_needed_for_gt = {
-        player: world.random.randint(0, 7) if args.crystals_gt[player] == 'random' else int(args.crystals_gt[player])
-        for player in range(1, world.players + 1)}
-    world.open_pyramid = args.open_pyramid.copy()
-    world.boss_shuffle = args.shufflebosses.copy()
-    world.enemy_shuffle = args.enemy_shuffle.copy()
-    world.enemy_health = args.enemy_health.copy()
-    world.enemy_damage = args.enemy_damage.copy()
-    world.killable_thieves = args.killable_thieves.copy()
-    world.bush_shuffle = args.bush_shuffle.copy()
-    world.tile_shuffle = args.tile_shuffle.copy()
-    world.beemizer = args.beemizer.copy()
-    world.timer = args.timer.copy()
-    world.countdown_start_time = args.countdown_start_time.copy()
-    world.red_clock_time = args.red_clock_time.copy()
-    world.blue_clock_time = args.blue_clock_time.copy()
-    world.green_clock_time = args.green_clock_time.copy()
-    world.shufflepots = args.shufflepots.copy()
-    world.progressive = args.progressive.copy()
-    world.dungeon_counters = args.dungeon_counters.copy()
-    world.glitch_boots = args.glitch_boots.copy()
-    world.triforce_pieces_available = args.triforce_pieces_available.copy()
-    world.triforce_pieces_required = args.triforce_pieces_required.copy()
-    world.shop_shuffle = args.shop_shuffle.copy()
-    world.progression_balancing = {player: not balance for player, balance in args.skip_progression_balancing.items()}
-    world.shuffle_prizes = args.shuffle_prizes.copy()
-    world.sprite_pool = args.sprite_pool.copy()
-    world.dark_room_logic = args.dark_room_logic.copy()
-    world.restrict_dungeon_item_on_boss = args.restrict_dungeon_item_on_boss.copy()
-
-    world.rom_seeds = {player: random.Random(world.random.randint(0, 999999999)) for player in range(1, world.players + 1)}
-
-    logger.info('ALttP Berserker\'s Multiworld Version %s  -  Seed: %s\n', __version__, world.seed)
-
-    parsed_names = parse_player_names(args.names, world.players, args.teams)
-    world.teams = len(parsed_names)
-    for i, team in enumerate(parsed_names, 1):
-        if world.players > 1:
-            logger.info('%s%s', 'Team%d: ' % i if world.teams > 1 else 'Players: ', ', '.join(team))
-        for player, name in enumerate(team, 1):
-            world.player_names[player].append(name)
-
-    logger.info('')
-
-    for player in range(1, world.players + 1):
-        world.difficulty_requirements[player] = difficulties[world.difficulty[player]]
-
-        for tok in filter(None, args.startinventory[player].split(',')):
-            item = ItemFactory(tok.strip(), player)
-            if item:
-                world.push_precollected(item)
-        world.local_items[player] = {item.strip() for item in args.local_items[player].split(',')}
-
-        world.triforce_pieces_available[player] = max(world.triforce_pieces_available[player], world.triforce_pieces_required[player])
-
-        if world.mode[player] != 'inverted':
-            create_regions(world, player)
-        else:
-            create_inverted_regions(world, player)
-        create_shops(world, player)
-        create_dungeons(world, player)
-
-    logger.info('Shuffling the World about.')
-
-    for player in range(1, world.players + 1):
-        if world.logic[player] not in ["noglitches", "minorglitches"] and world.shuffle[player] in \
-                {"vanilla", "dungeonssimple", "dungeonsfull", "simple", "restricted", "full"}:
-            world.fix_fake_world[player] = False
-
-        if world.mode[player] != 'inverted':
-            link_entrances(world, player)
-            mark_light_world_regions(world, player)
+    seed = get_seed(seed)
+    seeds = derive_seeds(seed, args.generation_attempts)
+    attempt_args = copy.copy(args)
+    attempt_args.generation_attempts = 1
+    with multiprocessing.Pool(len(seeds) - 1) as pool:  # leaving the with block terminates attempts still running
+        attempts = pool.imap_unordered(functools.partial(_generation_attempt, attempt_args), seeds[1:])
+        try:
+            return main(attempt_args, seed)
+        except FillError as e:
+            logger.warning('Seed %s failed to generate (%s), waiting for the %d parallel attempts.',
+                           seed, e, len(seeds) - 1)
+        for sub_seed in attempts:
+            if sub_seed is not None:
+                break
         else:
-            link_inverted_entrances(world, player)
-            mark_dark_world_regions(world, player)
-
-    logger.info('Generating Item Pool.')
-
-    for player in range(1, world.players + 1):
-        generate_itempool(world, player)
-
-    logger.info('Calculating Access Rules.')
+            raise FillError(f'Seed {seed} and all {len(seeds) - 1} seeds derived from it failed to generate.')
+    logger.info('Generating seed %s, derived from seed %s.', sub_seed, seed)
+    attempt_args.derived_from_seed = seed
+    return main(attempt_args, sub_seed)
 
-    for player in range(1, world.players + 1):
-        set_rules(world, player)
 
-    logger.info('Placing Dungeon Prizes.')
+def main(args, seed=None):
+    if args.generation_attempts > 1 and not args.race:
+        return main_with_attempts(args, seed)
 
-    fill_prizes(world)
+    stats = GenerationStats(count=args.timing, profiler=args.profile)
+    try:
+        return generate(args, seed, stats)
+    finally:
+        stats.close()  # also when generating failed, so profilers and counted functions don't outlive it
 
-    logger.info('Placing Dungeon Items.')
 
-    shuffled_locations = None
-    if args.algorithm in ['balanced', 'vt26'] or any(list(args.mapshuffle.values()) + list(args.compassshuffle.values()) +
-                                                     list(args.keyshuffle.values()) + list(args.bigkeyshuffle.values())):
-        fill_dungeons_restrictive(world)
-    else:
-        fill_dungeons(world)
+def generate(args, seed, stats: GenerationStats):
+    if args.outputpath:
+        os.makedirs(args.outputpath, exist_ok=True)
+        output_path.cached_path = args.outputpath
+    
+    start = time.perf_counter()
 
-    logger.info('Fill the world.')
+    world = create_world(args, seed, stats)
+    fill_world(world, args, stats)
 
-    if args.algorithm == 'flood':
-        flood_items(world)  # different algo, biased towards early game progress items
-    elif args.algorithm == 'vt25':
-        distribute_items_restrictive(world, False)
-    elif args.algorithm == 'vt26':
-        distribute_items_restrictive(world, True, shuffled_locations)
-    elif args.algorithm == 'balanced':
-        distribute_items_restrictive(world, True)
+    logger = logging.getLogger('')
+    outfilebase = 'BM_%s' % (args.outputname if args.outputname else world.seed)
+    parsed_names = [[world.player_names[player][team] for player in range(1, world.players + 1)]
+                    for team in range(world.teams)]
 
-    if world.players > 1:
-        balance_multiworld_progression(world)
+    if not args.skip_playthrough:
+        # before the roms, culling takes items out of their locations while the roms and multidata read them
+        logger.info('Calculating playthrough.')
+        stats.start_stage('playthrough')
+        create_playthrough(world)
 
     logger.info('Patching ROM.')
-
-    outfilebase = 'BM_%s' % (args.outputname if args.outputname else world.seed)
+    stats.start_stage('roms')
 
     rom_names = []
 
@@ -283,47 +235,9 @@ def main(args, seed=None):
             for player in range(1, world.players + 1):
                 rom_futures.append(pool.submit(_gen_rom, team, player))
 
-        def get_entrance_to_region(region: Region):
-            for entrance in region.entrances:
-                if entrance.parent_region.type in (RegionType.DarkWorld, RegionType.LightWorld):
-                    return entrance
-            for entrance in region.entrances:  # BFS might be better here, trying DFS for now.
-                return get_entrance_to_region(entrance.parent_region)
-
-        # collect ER hint info
-        er_hint_data = {player: {} for player in range(1, world.players + 1) if world.shuffle[player] != "vanilla"}
-        from Regions import RegionType
-        for region in world.regions:
-            if region.player in er_hint_data and region.locations:
-                main_entrance = get_entrance_to_region(region)
-                for location in region.locations:
-                    if type(location.address) == int:  # skips events and crystals
-                        if lookup_vanilla_location_to_entrance[location.address] != main_entrance.name:
-                            er_hint_data[region.player][location.address] = main_entrance.name
-
-        ordered_areas = ('Light World', 'Dark World', 'Hyrule Castle', 'Agahnims Tower', 'Eastern Palace', 'Desert Palace',
-                         'Tower of Hera', 'Palace of Darkness', 'Swamp Palace', 'Skull Woods', 'Thieves Town', 'Ice Palace',
-                         'Misery Mire', 'Turtle Rock', 'Ganons Tower', "Total")
-
-        checks_in_area = {player: {area: list() for area in ordered_areas}
-                          for player in range(1, world.players + 1)}
-
-        for player in range(1, world.players + 1):
-            checks_in_area[player]["Total"] = 0
-
-        for location in [loc for loc in world.get_filled_locations() if type(loc.address) is int]:
-            main_entrance = get_entrance_to_region(location.parent_region)
-            if location.parent_region.dungeon:
-                dungeonname = {'Inverted Agahnims Tower': 'Agahnims Tower',
-                               'Inverted Ganons Tower': 'Ganons Tower'}\
-                    .get(location.parent_region.dungeon.name, location.parent_region.dungeon.name)
-                checks_in_area[location.player][dungeonname].append(location.address)
-            elif main_entrance.parent_region.type == RegionType.LightWorld:
-                checks_in_area[location.player]["Light World"].append(location.address)
-            elif main_entrance.parent_region.type == RegionType.DarkWorld:
-                checks_in_area[location.player]["Dark World"].append(location.address)
-            checks_in_area[location.player]["Total"] += 1
-
+        main_entrances = get_main_entrances(world)
+        er_hint_data = get_er_hint_data(world, main_entrances)
+        checks_in_area = get_checks_in_area(world, main_entrances)
 
         precollected_items = [[] for player in range(world.players)]
         for item in world.precollected_items:
@@ -356,6 +270,8 @@ def main(args, seed=None):
                                                   "er_hint_data": er_hint_data,
                                                   "precollected_items": precollected_items,
                                                   "version": _version_tuple,
+                                                  "seed": world.seed,
+                                                  "derived_from_seed": world.derived_from_seed,
                                                   "tags": multidatatags
                                                   }).encode("utf-8"), 9)
 
@@ -364,151 +280,534 @@ def main(args, seed=None):
 
         multidata_task = pool.submit(write_multidata, rom_futures)
 
-    if not args.skip_playthrough:
-        logger.info('Calculating playthrough.')
-        create_playthrough(world)
-    if multidata_task:
-        multidata_task.result()  # retrieve exception if one exists
-    pool.shutdown()  # wait for all queued tasks to complete
-    if args.create_spoiler:  # needs spoiler.hashes to be filled, that depend on rom_futures being done
-        world.spoiler.to_file(output_path('%s_Spoiler.txt' % outfilebase))
+    spoiler_writer = None
+    try:
+        if args.create_spoiler:
+            # everything but the rom hashes is final, the rest of the spoiler is written while the roms are patched
+            spoiler_writer = SpoilerWriter(world.spoiler, output_path('%s_Spoiler.txt' % outfilebase),
+                                           output_path('%s_Spoiler.jsonl' % outfilebase) if args.json_spoiler
+                                           else None, pool)
+        stats.start_stage('multidata')
+        if multidata_task:
+            multidata_task.result()  # retrieve exception if one exists
+        if spoiler_writer:  # needs spoiler.hashes to be filled, that depend on rom_futures being done
+            stats.start_stage('spoiler')
+            spoiler_writer.hashes_done()
+        pool.shutdown()  # wait for all queued tasks to complete
+        if spoiler_writer:
+            spoiler_writer.close()
+    finally:
+        if spoiler_writer and not spoiler_writer.closed:
+            spoiler_writer.abort()  # don't leave a truncated spoiler behind
+    stats.close()
+    world.generation_stats = stats
+    if args.timing:
+        stats.to_file(output_path('%s_Timing.json' % outfilebase))
 
     logger.info('Done. Enjoy. Total Time: %s', time.perf_counter() - start)
     return world
 
 
-def copy_world(world):
-    # ToDo: Not good yet
-    ret = World(world.players, world.shuffle, world.logic, world.mode, world.swords, world.difficulty, world.difficulty_adjustments, world.timer, world.progressive, world.goal, world.algorithm, world.accessibility, world.shuffle_ganon, world.retro, world.custom, world.customitemarray, world.hints)
-    ret.teams = world.teams
-    ret.player_names = copy.deepcopy(world.player_names)
-    ret.remote_items = world.remote_items.copy()
-    ret.required_medallions = world.required_medallions.copy()
-    ret.swamp_patch_required = world.swamp_patch_required.copy()
-    ret.ganon_at_pyramid = world.ganon_at_pyramid.copy()
-    ret.powder_patch_required = world.powder_patch_required.copy()
-    ret.ganonstower_vanilla = world.ganonstower_vanilla.copy()
-    ret.treasure_hunt_count = world.treasure_hunt_count.copy()
-    ret.treasure_hunt_icon = world.treasure_hunt_icon.copy()
-    ret.sewer_light_cone = world.sewer_light_cone.copy()
-    ret.light_world_light_cone = world.light_world_light_cone
-    ret.dark_world_light_cone = world.dark_world_light_cone
-    ret.seed = world.seed
-    ret.can_access_trock_eyebridge = world.can_access_trock_eyebridge.copy()
-    ret.can_access_trock_front = world.can_access_trock_front.copy()
-    ret.can_access_trock_big_chest = world.can_access_trock_big_chest.copy()
-    ret.can_access_trock_middle = world.can_access_trock_middle.copy()
-    ret.can_take_damage = world.can_take_damage
-    ret.difficulty_requirements = world.difficulty_requirements.copy()
-    ret.fix_fake_world = world.fix_fake_world.copy()
-    ret.mapshuffle = world.mapshuffle.copy()
-    ret.compassshuffle = world.compassshuffle.copy()
-    ret.keyshuffle = world.keyshuffle.copy()
-    ret.bigkeyshuffle = world.bigkeyshuffle.copy()
-    ret.crystals_needed_for_ganon = world.crystals_needed_for_ganon.copy()
-    ret.crystals_needed_for_gt = world.crystals_needed_for_gt.copy()
-    ret.open_pyramid = world.open_pyramid.copy()
-    ret.boss_shuffle = world.boss_shuffle.copy()
-    ret.enemy_shuffle = world.enemy_shuffle.copy()
-    ret.enemy_health = world.enemy_health.copy()
-    ret.enemy_damage = world.enemy_damage.copy()
-    ret.beemizer = world.beemizer.copy()
-    ret.timer = world.timer.copy()
-    ret.shufflepots = world.shufflepots.copy()
-    ret.shuffle_prizes = world.shuffle_prizes.copy()
-    ret.dark_room_logic = world.dark_room_logic.copy()
-    ret.restrict_dungeon_item_on_boss = world.restrict_dungeon_item_on_boss.copy()
+def get_main_entrances(world) -> typing.Dict[Region, typing.Optional[Entrance]]:
+    """The entrance from the Light or Dark World each region is entered through, None for regions without entrances.
+    Regions not entered from the overworld directly take it from the region their first entrance comes from, each
+    region is looked at once."""
+    main_entrances = {}
+    for region in world.regions:
+        passed = []
+        while region not in main_entrances:
+            main_entrance = next((entrance for entrance in region.entrances
+                                  if entrance.parent_region.type in (RegionType.DarkWorld, RegionType.LightWorld)),
+                                 None)
+            if main_entrance or not region.entrances or region in passed:
+                main_entrances[region] = main_entrance
+                break
+            passed.append(region)
+            region = region.entrances[0].parent_region
+        for passed_region in passed:
+            main_entrances[passed_region] = main_entrances[region]
+    return main_entrances
+
+
+def get_er_hint_data(world, main_entrances: typing.Dict[Region, typing.Optional[Entrance]]) -> dict:
+    """For each player with shuffled entrances, the main entrance of each location whose region isn't entered
+    through the location's vanilla entrance, by location address."""
+    er_hint_data = {player: {} for player in range(1, world.players + 1) if world.shuffle[player] != "vanilla"}
+    for region in world.regions:
+        if region.player in er_hint_data and region.locations:
+            main_entrance = main_entrances[region]
+            for location in region.locations:
+                if type(location.address) == int:  # skips events and crystals
+                    if lookup_vanilla_location_to_entrance[location.address] != main_entrance.name:
+                        er_hint_data[region.player][location.address] = main_entrance.name
+    return er_hint_data
+
+
+ordered_areas = ('Light World', 'Dark World', 'Hyrule Castle', 'Agahnims Tower', 'Eastern Palace', 'Desert Palace',
+                 'Tower of Hera', 'Palace of Darkness', 'Swamp Palace', 'Skull Woods', 'Thieves Town', 'Ice Palace',
+                 'Misery Mire', 'Turtle Rock', 'Ganons Tower', "Total")
+
+
+def get_checks_in_area(world, main_entrances: typing.Dict[Region, typing.Optional[Entrance]]) -> dict:
+    """For each player, the addresses of their filled locations by dungeon or the world they're entered from, and
+    how many there are in total."""
+    checks_in_area = {player: {area: list() for area in ordered_areas}
+                      for player in range(1, world.players + 1)}
 
     for player in range(1, world.players + 1):
-        if world.mode[player] != 'inverted':
-            create_regions(ret, player)
-        else:
-            create_inverted_regions(ret, player)
-        create_shops(ret, player)
-        create_dungeons(ret, player)
+        checks_in_area[player]["Total"] = 0
+
+    for location in [loc for loc in world.get_filled_locations() if type(loc.address) is int]:
+        main_entrance = main_entrances[location.parent_region]
+        if location.parent_region.dungeon:
+            dungeonname = {'Inverted Agahnims Tower': 'Agahnims Tower',
+                           'Inverted Ganons Tower': 'Ganons Tower'}\
+                .get(location.parent_region.dungeon.name, location.parent_region.dungeon.name)
+            checks_in_area[location.player][dungeonname].append(location.address)
+        elif main_entrance.parent_region.type == RegionType.LightWorld:
+            checks_in_area[location.player]["Light World"].append(location.address)
+        elif main_entrance.parent_region.type == RegionType.DarkWorld:
+            checks_in_area[location.player]["Dark World"].append(location.address)
+        checks_in_area[location.player]["Total"] += 1
+    return checks_in_area
+
+
+def create_world(args, seed=None, stats: typing.Optional[GenerationStats] = None) -> World:
+    """The world described by args, with regions, entrances, item pool and access rules, but nothing placed yet."""
+    if stats is None:
+        stats = GenerationStats()
+    # initialize the world
+    world = World(args.multi, args.shuffle, args.logic, args.mode, args.swords, args.difficulty,
+                  args.item_functionality, args.timer, args.progressive.copy(), args.goal, args.algorithm,
+                  args.accessibility, args.shuffleganon, args.retro, args.custom, args.customitemarray, args.hints)
+
+    logger = logging.getLogger('')
+    world.seed = get_seed(seed)
+    world.derived_from_seed = getattr(args, 'derived_from_seed', None)
+    outfilebase = 'BM_%s' % (args.outputname if args.outputname else world.seed)
+    stats.profile_path = output_path(outfilebase)
+    stats.start_stage('setup')
+    if args.race:
+        world.secure()
+    else:
+        world.random.seed(world.seed)
+
+    world.remote_items = args.remote_items.copy()
+    world.mapshuffle = args.mapshuffle.copy()
+    world.compassshuffle = args.compassshuffle.copy()
+    world.keyshuffle = args.keyshuffle.copy()
+    world.bigkeyshuffle = args.bigkeyshuffle.copy()
+    world.crystals_needed_for_ganon = {
+        player: world.random.randint(0, 7) if args.crystals_ganon[player] == 'random' else int(
+            args.crystals_ganon[player]) for player in range(1, world.players + 1)}
+    world.crystals_needed_for_gt = {
+        player: world.random.randint(0, 7) if args.crystals_gt[player] == 'random' else int(args.crystals_gt[player])
+        for player in range(1, world.players + 1)}
+    world.open_pyramid = args.open_pyramid.copy()
+    world.boss_shuffle = args.shufflebosses.copy()
+    world.enemy_shuffle = args.enemy_shuffle.copy()
+    world.enemy_health = args.enemy_health.copy()
+    world.enemy_damage = args.enemy_damage.copy()
+    world.killable_thieves = args.killable_thieves.copy()
+    world.bush_shuffle = args.bush_shuffle.copy()
+    world.tile_shuffle = args.tile_shuffle.copy()
+    world.beemizer = args.beemizer.copy()
+    world.timer = args.timer.copy()
+    world.countdown_start_time = args.countdown_start_time.copy()
+    world.red_clock_time = args.red_clock_time.copy()
+    world.blue_clock_time = args.blue_clock_time.copy()
+    world.green_clock_time = args.green_clock_time.copy()
+    world.shufflepots = args.shufflepots.copy()
+    world.progressive = args.progressive.copy()
+    world.dungeon_counters = args.dungeon_counters.copy()
+    world.glitch_boots = args.glitch_boots.copy()
+    world.triforce_pieces_available = args.triforce_pieces_available.copy()
+    world.triforce_pieces_required = args.triforce_pieces_required.copy()
+    world.shop_shuffle = args.shop_shuffle.copy()
+    world.progression_balancing = {player: not balance for player, balance in args.skip_progression_balancing.items()}
+    world.shuffle_prizes = args.shuffle_prizes.copy()
+    world.sprite_pool = args.sprite_pool.copy()
+    world.dark_room_logic = args.dark_room_logic.copy()
+    world.restrict_dungeon_item_on_boss = args.restrict_dungeon_item_on_boss.copy()
 
-    copy_dynamic_regions_and_locations(world, ret)
+    world.rom_seeds = {player: random.Random(world.random.randint(0, 999999999)) for player in range(1, world.players + 1)}
 
-    # copy bosses
-    for dungeon in world.dungeons:
-        for level, boss in dungeon.bosses.items():
-            ret.get_dungeon(dungeon.name, dungeon.player).bosses[level] = boss
+    logger.info('ALttP Berserker\'s Multiworld Version %s  -  Seed: %s\n', __version__, world.seed)
 
-    for shop in world.shops:
-        copied_shop = ret.get_region(shop.region.name, shop.region.player).shop
-        copied_shop.inventory = copy.copy(shop.inventory)
+    parsed_names = parse_player_names(args.names, world.players, args.teams)
+    world.teams = len(parsed_names)
+    for i, team in enumerate(parsed_names, 1):
+        if world.players > 1:
+            logger.info('%s%s', 'Team%d: ' % i if world.teams > 1 else 'Players: ', ', '.join(team))
+        for player, name in enumerate(team, 1):
+            world.player_names[player].append(name)
 
-    # connect copied world
-    for region in world.regions:
-        copied_region = ret.get_region(region.name, region.player)
-        copied_region.is_light_world = region.is_light_world
-        copied_region.is_dark_world = region.is_dark_world
-        for exit in copied_region.exits:
-            old_connection = world.get_entrance(exit.name, exit.player).connected_region
-            exit.connect(ret.get_region(old_connection.name, old_connection.player))
-
-    # fill locations
-    for location in world.get_locations():
-        if location.item is not None:
-            item = Item(location.item.name, location.item.advancement, location.item.priority, location.item.type, player = location.item.player)
-            ret.get_location(location.name, location.player).item = item
-            item.location = ret.get_location(location.name, location.player)
-            item.world = ret
-        if location.event:
-            ret.get_location(location.name, location.player).event = True
-        if location.locked:
-            ret.get_location(location.name, location.player).locked = True
-
-    # copy remaining itempool. No item in itempool should have an assigned location
-    for item in world.itempool:
-        ret.itempool.append(Item(item.name, item.advancement, item.priority, item.type, player = item.player))
-
-    for item in world.precollected_items:
-        ret.push_precollected(ItemFactory(item.name, item.player))
-
-    # copy progress items in state
-    ret.state.prog_items = world.state.prog_items.copy()
-    ret.state.stale = {player: True for player in range(1, world.players + 1)}
+    logger.info('')
 
     for player in range(1, world.players + 1):
-        set_rules(ret, player)
+        world.difficulty_requirements[player] = difficulties[world.difficulty[player]]
+
+        for tok in filter(None, args.startinventory[player].split(',')):
+            item = ItemFactory(tok.strip(), player)
+            if item:
+                world.push_precollected(item)
+        world.local_items[player] = {item.strip() for item in args.local_items[player].split(',') if item.strip()}
 
+        world.triforce_pieces_available[player] = max(world.triforce_pieces_available[player], world.triforce_pieces_required[player])
 
-    return ret
+    shuffled_players = [player for player in world.player_ids if world.shuffle[player] != 'vanilla']
+    setup_precollected = list(world.precollected_items)
+    world_data = None
+    if (shuffled_players or args.parallel_setup) and not args.race:
+        # players are built from this, and built again from it if their entrance shuffle turns out to be unusable
+        world_data = RuleObjects.dumps(world)
 
+    if args.parallel_setup and not args.race:
+        logger.info('Building the worlds of %d players in parallel.', world.players)
+        stats.start_stage('parallel setup')
 
-def copy_dynamic_regions_and_locations(world, ret):
-    for region in world.dynamic_regions:
-        new_reg = Region(region.name, region.type, region.hint_text, region.player)
-        ret.regions.append(new_reg)
-        ret.initialize_regions([new_reg])
-        ret.dynamic_regions.append(new_reg)
+        build_player_worlds(world, world_data)
+    else:
+        stats.start_stage('create regions')
+        for player in range(1, world.players + 1):
+            create_player_regions(world, player)
 
-        # Note: ideally exits should be copied here, but the current use case (Take anys) do not require this
+        logger.info('Shuffling the World about.')
+        stats.start_stage('link entrances')
 
-        if region.shop:
-            new_reg.shop = region.shop.__class__(new_reg, region.shop.room_id, region.shop.shopkeeper_config,
-                                                 region.shop.custom, region.shop.locked)
-            ret.shops.append(new_reg.shop)
+        for player in range(1, world.players + 1):
+            link_player_entrances(world, player)
 
-    for location in world.dynamic_locations:
-        new_reg = ret.get_region(location.parent_region.name, location.parent_region.player)
-        new_loc = Location(location.player, location.name, location.address, location.crystal, location.hint_text, new_reg)
-        # todo: this is potentially dangerous. later refactor so we
-        # can apply dynamic region rules on top of copied world like other rules
-        new_loc.access_rule = location.access_rule
-        new_loc.always_allow = location.always_allow
-        new_loc.item_rule = location.item_rule
-        new_reg.locations.append(new_loc)
+        logger.info('Generating Item Pool.')
+        stats.start_stage('item pool')
 
-    ret.clear_location_cache()
+        for player in range(1, world.players + 1):
+            generate_itempool(world, player)
 
+    logger.info('Calculating Access Rules.')
+    stats.start_stage('access rules')
+
+    for player in range(1, world.players + 1):
+        set_rules(world, player)
+
+    if shuffled_players:
+        stats.start_stage('validate entrances')
+        for player in shuffled_players:
+            validate_entrance_shuffle(world, player, world_data, setup_precollected)
+
+    return world
+
+
+def fill_world(world: World, args, stats: typing.Optional[GenerationStats] = None):
+    """Places the dungeon prizes, dungeon items and the item pool of a world from create_world."""
+    if stats is None:
+        stats = GenerationStats()
+    logger = logging.getLogger('')
+
+    logger.info('Placing Dungeon Prizes.')
+    stats.start_stage('dungeon prizes')
+
+    fill_prizes(world)
+
+    logger.info('Placing Dungeon Items.')
+    stats.start_stage('dungeon items')
+
+    shuffled_locations = None
+    if args.algorithm in ['balanced', 'vt26'] or any(list(args.mapshuffle.values()) + list(args.compassshuffle.values()) +
+                                                     list(args.keyshuffle.values()) + list(args.bigkeyshuffle.values())):
+        fill_dungeons_restrictive(world)
+    else:
+        fill_dungeons(world)
+
+    logger.info('Fill the world.')
+    stats.start_stage('fill')
+
+    if args.algorithm == 'flood':
+        flood_items(world)  # different algo, biased towards early game progress items
+    elif args.algorithm == 'vt25':
+        distribute_items_restrictive(world, False)
+    elif args.algorithm == 'vt26':
+        distribute_items_restrictive(world, True, shuffled_locations)
+    elif args.algorithm == 'balanced':
+        distribute_items_restrictive(world, True)
+
+    if world.players > 1:
+        stats.start_stage('progression balancing')
+        balance_multiworld_progression(world)
+
+
+class WorldSnapshot(object):
+    """A world from create_world, serialized with its access rules so it can be filled any number of times without
+    creating it again. Race worlds can't be snapshotted, their SystemRandom can't be serialized."""
+
+    def __init__(self, world: World):
+        self.data = RuleObjects.dumps(world)
+
+    def restore(self) -> World:
+        # unpickling creates a lot of objects and nothing to collect, the collector would only rescan them repeatedly
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.loads(self.data)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def fill(self, args, seed: typing.Optional[int] = None,
+             stats: typing.Optional[GenerationStats] = None) -> World:
+        """Fills a restored copy of the world, with its random state reseeded first if seed is given."""
+        world = self.restore()
+        if seed is not None:
+            world.random.seed(seed)
+        fill_world(world, args, stats)
+        return world
+
+    def fills(self, args, seeds: typing.Iterable[int]) -> typing.Iterator[typing.Tuple[int, typing.Optional[World]]]:
+        """Fills a copy of the world for each seed, yielding the seed with the filled world or None if it failed."""
+        for seed in seeds:
+            try:
+                yield seed, self.fill(args, seed)
+            except FillError as e:
+                logging.getLogger('').debug('Fill with seed %s failed: %s', seed, e)
+                yield seed, None
+
+
+def create_player_regions(world, player: int):
+    if world.mode[player] != 'inverted':
+        create_regions(world, player)
+    else:
+        create_inverted_regions(world, player)
+    create_shops(world, player)
+    create_dungeons(world, player)
+
+
+def link_player_entrances(world, player: int):
+    if world.logic[player] not in ["noglitches", "minorglitches"] and world.shuffle[player] in \
+            {"vanilla", "dungeonssimple", "dungeonsfull", "simple", "restricted", "full"}:
+        world.fix_fake_world[player] = False
+
+    if world.mode[player] != 'inverted':
+        link_entrances(world, player)
+        mark_light_world_regions(world, player)
+    else:
+        link_inverted_entrances(world, player)
+        mark_dark_world_regions(world, player)
+
+
+def _create_player_world(world_data: bytes, player: int, seed: int) -> World:
+    """Builds the part of player in a copy of the world, the copy only keeps the items it precollected."""
+    world = pickle.loads(world_data)
+    world.random.seed(seed)
+    precollected = len(world.precollected_items)
+    create_player_regions(world, player)
+    link_player_entrances(world, player)
+    generate_itempool(world, player)
+    world.precollected_items = world.precollected_items[precollected:]
+    return world
+
+
+def _build_player_world(world_data: bytes, player: int, seed: int) -> bytes:
+    """_create_player_world for a process pool, sends back the copy serialized."""
+    return RuleObjects.dumps(_create_player_world(world_data, player, seed))
 
-def create_playthrough(world):
-    # create a copy as we will modify it
-    old_world = world
-    world = copy_world(world)
 
+def build_player_worlds(world, world_data: bytes):
+    """Creates the regions, entrances and item pool of every player in a process pool, from world_data, the
+    serialized world before any player was built. Each player uses a random stream seeded from world.random, so the
+    result doesn't depend on how the players are spread over processes, but it differs from building them one after
+    another. Rules are set afterwards, they can't be pickled."""
+    seeds = {player: world.random.randint(0, 999999999) for player in world.player_ids}
+    tasks = [(world_data, player, seeds[player]) for player in world.player_ids]
+    if multiprocessing.current_process().daemon:
+        # pool workers, like those trying generation attempts, can't start processes of their own
+        player_worlds = list(itertools.starmap(_build_player_world, tasks))
+    else:
+        with multiprocessing.Pool(min(os.cpu_count() or 1, world.players)) as pool:
+            player_worlds = pool.starmap(_build_player_world, tasks)
+    for player, player_world in zip(world.player_ids, player_worlds):
+        merge_player_world(world, pickle.loads(player_world), player)
+    world._recache()
+    world.clear_entrance_cache()
+    world.clear_location_cache()
+
+
+# per player attributes of World that only cache or index its regions
+player_caches = {'_region_cache', 'event_locations', 'event_log', '_filled_locations', '_unfilled_locations',
+                 '_unfilled_dungeon_locations'}
+
+
+def merge_player_world(world, player_world, player: int):
+    """Moves everything _build_player_world created for player into world, the caches of world need to be rebuilt
+    afterwards."""
+    for name, value in vars(player_world).items():
+        # per player attributes, the caches and location indexes are rebuilt from the regions below
+        if isinstance(value, dict) and player in value and name not in player_caches:
+            getattr(world, name)[player] = value[player]
+    world.rupoor_cost = player_world.rupoor_cost
+
+    world.regions += player_world.regions
+    world.initialize_regions(player_world.regions)
+    world.dynamic_regions += player_world.dynamic_regions
+    world.dynamic_locations += player_world.dynamic_locations
+    world.shops += player_world.shops
+    for dungeon in player_world.dungeons:
+        dungeon.world = world
+    world.dungeons += player_world.dungeons
+    for region in player_world.regions:
+        for location in region.locations:
+            if location.item:
+                location.item.world = world
+    world.itempool += player_world.itempool
+    for item in player_world.precollected_items:
+        world.push_precollected(item)
+    world.spoiler.entrances.update((key, entry) for key, entry in player_world.spoiler.entrances.items()
+                                   if key[2] == player)
+
+
+def remove_player_world(world, player: int, kept_precollected: typing.List[Item]):
+    """Takes everything building player created out of world, undoing merge_player_world. Items player precollected
+    are removed unless they are in kept_precollected."""
+    world.regions = [region for region in world.regions if region.player != player]
+    world.dynamic_regions = [region for region in world.dynamic_regions if region.player != player]
+    world.dynamic_locations = [location for location in world.dynamic_locations if location.player != player]
+    world.shops = [shop for shop in world.shops if shop.region.player != player]
+    world.dungeons = [dungeon for dungeon in world.dungeons if dungeon.player != player]
+    world.itempool = [item for item in world.itempool if item.player != player]
+    kept = {id(item) for item in kept_precollected}
+    world.precollected_items = [item for item in world.precollected_items if item.player != player or id(item) in kept]
+    world.clear_player_cache(player)
+    for key in [key for key in world.spoiler.entrances if key[2] == player]:
+        del world.spoiler.entrances[key]
+
+
+def unreachable_required_locations(world, player: int) -> list:
+    """Locations of player that have to be reachable but whose regions aren't, even with all of player's items, keys
+    and dungeon prizes. Only an unusable entrance shuffle does that, as no placement of items could reach them either.
+    The locations' own rules only depend on items, which shuffling entrances again can't change. All locations have to
+    be reachable with locations accessibility, otherwise those holding the Triforce."""
+    state = world.get_all_state(keys=True, player=player)
+    for prize in ItemFactory(['Red Pendant', 'Blue Pendant', 'Green Pendant', 'Crystal 1', 'Crystal 2', 'Crystal 3',
+                              'Crystal 4', 'Crystal 5', 'Crystal 6', 'Crystal 7'], player):
+        state.collect(prize, True)
+    state.sweep_for_events(players=[player])
+    locations = [location for location in world.get_locations() if location.player == player]
+    if world.accessibility[player] != 'locations':
+        locations = [location for location in locations
+                     if location.item and location.item.name == 'Triforce' and location.item.player == player]
+    return [location for location in locations if not location.parent_region.can_reach(state)]
+
+
+def validate_entrance_shuffle(world, player: int, world_data: typing.Optional[bytes],
+                              setup_precollected: typing.List[Item], attempts: int = 5):
+    """Builds the regions, entrances and item pool of player again with a new random stream while their entrance
+    shuffle leaves required locations unreachable, before anything is filled. world_data is the serialized world
+    before any player was built, without it nothing can be built again. Raises FillError if no attempt worked."""
+    logger = logging.getLogger('')
+    for attempt in range(attempts + 1):
+        unreachable = unreachable_required_locations(world, player)
+        if not unreachable:
+            return
+        if world_data is None or attempt == attempts:
+            break
+        logger.info('Entrance shuffle of player %d leaves %s unreachable, shuffling again.', player, unreachable)
+        remove_player_world(world, player, setup_precollected)
+        merge_player_world(world, _create_player_world(world_data, player, world.random.randint(0, 999999999)),
+                           player)
+        world._recache()
+        world.clear_entrance_cache()
+        world.clear_location_cache()
+        world.state = CollectionState(world)
+        set_rules(world, player)
+        for other in world.player_ids:
+            # the rules of the other players keep their local items out of player's new locations too
+            if other != player and world.local_items[other]:
+                for location in world.get_locations():
+                    if location.player == player:
+                        forbid_items_for_player(location, world.local_items[other], other)
+    raise FillError(f'Entrance shuffle of player {player} leaves {unreachable} unreachable.')
+
+
+class RequirementBound(object):
+    """Cheap necessary condition for beating the game without some items: whether their players could still beat
+    their games if all their items outside of their own world were handed to them right away. Only their own worlds
+    are swept again, on top of a state that has every item of everyone else, so failing it is conclusive while
+    passing it isn't."""
+
+    def __init__(self, world: World):
+        self.world = world
+        self.item_locations = {player: [] for player in range(1, world.players + 1)}
+        self.state = CollectionState(world)
+        for location in world.get_filled_locations():
+            if location.item.advancement:
+                self.item_locations[location.item.player].append(location)
+                self.state.collect(location.item, True, location)
+
+    def can_beat_game(self, players: typing.Set[int]) -> bool:
+        state = self.state.copy()
+        for player in players:
+            state.forget(player)
+            for item in self.world.precollected_items:
+                if item.player == player:
+                    state.collect(item, True)
+            for location in self.item_locations[player]:
+                # events in their own world are left to the sweep
+                if location.item and (location.player != player or not location.event):
+                    state.collect(location.item, True, location)
+        state.sweep_for_events(players=players)
+        return all(self.world.has_beaten_game(state, player) for player in players)
+
+
+def cull_required(candidates: list, remove, restore, can_beat_game, may_beat_game) -> list:
+    """The candidates that are still required to beat the game when each of them is removed in turn and only kept if
+    the game can't be beaten without it. As having fewer items never makes more reachable, a candidate the game can't
+    be beaten without now stays required however many others are removed before its turn, and removing a whole block
+    of candidates while the game stays beatable gives the same result as removing them one by one. So candidates
+    failing the cheap may_beat_game check are kept right away, and the others are removed in blocks that grow while
+    can_beat_game allows it and shrink again when it doesn't."""
+    undecided = []
+    for index, candidate in enumerate(candidates):
+        remove((candidate,))
+        if may_beat_game((candidate,)):
+            undecided.append(index)
+        restore((candidate,))
+    required = [True] * len(candidates)
+    position = 0
+    size = 1
+    while position < len(undecided):
+        block = [candidates[index] for index in undecided[position:position + size]]
+        logging.getLogger('').debug('Checking if %s are required to beat the game.', block)
+        remove(block)
+        if may_beat_game(block) and can_beat_game():
+            for index in undecided[position:position + size]:
+                required[index] = False
+            position += len(block)
+            size *= 2
+        elif len(block) == 1:
+            # still required, got to keep it around
+            restore(block)
+            position += 1
+        else:
+            restore(block)
+            size = len(block) // 2
+    return [candidate for candidate, keep in zip(candidates, required) if keep]
+
+
+def create_playthrough(world):
+    # culling takes items out of the world itself instead of a copy of it, they are all put back afterwards
+    culled_items = {}
+    precollected_items = world.precollected_items.copy()
+    state = world.state
+    world.state = state.copy()
+    try:
+        _create_playthrough(world, culled_items)
+    finally:
+        for location, item in culled_items.items():
+            location.item = item
+        world.precollected_items[:] = precollected_items
+        world.state = state
+
+
+def _create_playthrough(world, culled_items: dict):
     # if we only check for beatable, we can do this sanity check first before writing down spheres
     if not world.can_beat_game():
         raise RuntimeError('Cannot beat game. Something went terribly wrong here!')
@@ -518,19 +817,12 @@ def create_playthrough(world):
     state_cache = [None]
     collection_spheres = []
     state = CollectionState(world)
-    sphere_candidates = list(prog_locations)
+    spheres = SphereIterator(state, prog_locations)
     logging.debug('Building up collection spheres.')
-    while sphere_candidates:
-        state.sweep_for_events(key_only=True)
-
-        sphere = []
-        # build up spheres of collection radius. Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
-        for location in sphere_candidates:
-            if state.can_reach(location):
-                sphere.append(location)
-
+    state.sweep_for_events(key_only=True)
+    # build up spheres of collection radius. Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
+    for sphere in spheres:
         for location in sphere:
-            sphere_candidates.remove(location)
             state.collect(location.item, True, location)
 
         collection_spheres.append(sphere)
@@ -539,43 +831,50 @@ def create_playthrough(world):
 
         logging.debug('Calculated sphere %i, containing %i of %i progress items.', len(collection_spheres), len(sphere),
                       len(prog_locations))
-        if not sphere:
-            logging.debug('The following items could not be reached: %s', ['%s (Player %d) at %s (Player %d)' % (
-                location.item.name, location.item.player, location.name, location.player) for location in
-                                                                           sphere_candidates])
-            if any([world.accessibility[location.item.player] != 'none' for location in sphere_candidates]):
-                raise RuntimeError(f'Not all progression items reachable ({sphere_candidates}). '
-                                   f'Something went terribly wrong here.')
-            else:
-                old_world.spoiler.unreachables = sphere_candidates.copy()
-                break
+        state.sweep_for_events(key_only=True)
+
+    if spheres.remaining:
+        sphere_candidates = list(spheres.remaining)
+        logging.debug('The following items could not be reached: %s', ['%s (Player %d) at %s (Player %d)' % (
+            location.item.name, location.item.player, location.name, location.player) for location in
+                                                                       sphere_candidates])
+        if any([world.accessibility[location.item.player] != 'none' for location in sphere_candidates]):
+            raise RuntimeError(f'Not all progression items reachable ({sphere_candidates}). '
+                               f'Something went terribly wrong here.')
+        else:
+            world.spoiler.unreachables = sphere_candidates
 
     # in the second phase, we cull each sphere such that the game is still beatable, reducing each range of influence to the bare minimum required inside it
-    for num, sphere in reversed(list(enumerate(collection_spheres))):
-        to_delete = []
-        for location in sphere:
-            # we remove the item at location and check if game is still beatable
-            logging.getLogger('').debug('Checking if %s (Player %d) is required to beat the game.', location.item.name, location.item.player)
-            old_item = location.item
+    bound = RequirementBound(world)
+
+    def remove_items(locations):
+        for location in locations:
+            culled_items[location] = location.item
             location.item = None
-            if world.can_beat_game(state_cache[num]):
-                to_delete.append(location)
-            else:
-                # still required, got to keep it around
-                location.item = old_item
 
+    def restore_items(locations):
+        for location in locations:
+            location.item = culled_items.pop(location)
+
+    for num, sphere in reversed(list(enumerate(collection_spheres))):
+        required = cull_required(sphere, remove_items, restore_items, lambda: world.can_beat_game(state_cache[num]),
+                                 lambda locations: bound.can_beat_game({culled_items[location].player for location in locations}))
         # cull entries in spheres for spoiler walkthrough at end
-        for location in to_delete:
-            sphere.remove(location)
+        sphere[:] = required
 
     # second phase, sphere 0
-    for item in [i for i in world.precollected_items if i.advancement]:
-        logging.getLogger('').debug('Checking if %s (Player %d) is required to beat the game.', item.name, item.player)
-        world.precollected_items.remove(item)
-        world.state.remove(item)
-        if not world.can_beat_game():
+    def remove_precollected(items):
+        for item in items:
+            world.precollected_items.remove(item)
+            world.state.remove(item)
+
+    def restore_precollected(items):
+        for item in items:
             world.push_precollected(item)
 
+    cull_required([item for item in world.precollected_items if item.advancement], remove_precollected,
+                  restore_precollected, world.can_beat_game, lambda items: bound.can_beat_game({item.player for item in items}))
+
     # we are now down to just the required progress items in collection_spheres. Unfortunately
     # the previous pruning stage could potentially have made certain items dependant on others
     # in the same or later sphere (because the location had 2 ways to access but the item originally
@@ -583,25 +882,24 @@ def create_playthrough(world):
     # to build up the correct spheres
 
     required_locations = [item for sphere in collection_spheres for item in sphere]
-    state = CollectionState(world)
+    state = CollectionState(world, record_paths=True)
+    spheres = SphereIterator(state, required_locations)
     collection_spheres = []
-    while required_locations:
-        state.sweep_for_events(key_only=True)
-
-        sphere = list(filter(state.can_reach, required_locations))
-
+    state.sweep_for_events(key_only=True)
+    for sphere in spheres:
         for location in sphere:
-            required_locations.remove(location)
             state.collect(location.item, True, location)
 
         collection_spheres.append(sphere)
 
-        logging.getLogger('').debug('Calculated final sphere %i, containing %i of %i progress items.', len(collection_spheres), len(sphere), len(required_locations))
-        if not sphere:
-            raise RuntimeError('Not all required items reachable. Something went terribly wrong here.')
+        logging.getLogger('').debug('Calculated final sphere %i, containing %i of %i progress items.', len(collection_spheres), len(sphere), len(spheres.remaining))
+        state.sweep_for_events(key_only=True)
+
+    if spheres.remaining:
+        raise RuntimeError('Not all required items reachable. Something went terribly wrong here.')
 
     # store the required locations for statistical analysis
-    old_world.required_locations = [(location.name, location.player) for sphere in collection_spheres for location in sphere]
+    world.required_locations = [(location.name, location.player) for sphere in collection_spheres for location in sphere]
 
     def flist_to_iter(node):
         while node:
@@ -616,17 +914,17 @@ def create_playthrough(world):
         pathpairs = zip_longest(pathsiter, pathsiter)
         return list(pathpairs)
 
-    old_world.spoiler.paths = dict()
+    world.spoiler.paths = dict()
     for player in range(1, world.players + 1):
-        old_world.spoiler.paths.update({ str(location) : get_path(state, location.parent_region) for sphere in collection_spheres for location in sphere if location.player == player})
-        for _, path in dict(old_world.spoiler.paths).items():
+        world.spoiler.paths.update({ str(location) : get_path(state, location.parent_region) for sphere in collection_spheres for location in sphere if location.player == player})
+        for _, path in dict(world.spoiler.paths).items():
             if any(exit == 'Pyramid Fairy' for (_, exit) in path):
                 if world.mode[player] != 'inverted':
-                    old_world.spoiler.paths[str(world.get_region('Big Bomb Shop', player))] = get_path(state, world.get_region('Big Bomb Shop', player))
+                    world.spoiler.paths[str(world.get_region('Big Bomb Shop', player))] = get_path(state, world.get_region('Big Bomb Shop', player))
                 else:
-                    old_world.spoiler.paths[str(world.get_region('Inverted Big Bomb Shop', player))] = get_path(state, world.get_region('Inverted Big Bomb Shop', player))
+                    world.spoiler.paths[str(world.get_region('Inverted Big Bomb Shop', player))] = get_path(state, world.get_region('Inverted Big Bomb Shop', player))
 
     # we can finally output our playthrough
-    old_world.spoiler.playthrough = OrderedDict([("0", [str(item) for item in world.precollected_items if item.advancement])])
+    world.spoiler.playthrough = OrderedDict([("0", [str(item) for item in world.precollected_items if item.advancement])])
     for i, sphere in enumerate(collection_spheres):
-        old_world.spoiler.playthrough[str(i + 1)] = {str(location): str(location.item) for location in sphere}
+        world.spoiler.playthrough[str(i + 1)] = {str(location): str(location.item) for location in sphere}
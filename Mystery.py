@@ -32,6 +32,7 @@ def mystery_argparse():
     parser.add_argument('--multi', default=1, type=lambda value: min(max(int(value), 1), 255))
     parser.add_argument('--teams', default=1, type=lambda value: max(int(value), 1))
     parser.add_argument('--create_spoiler', action='store_true')
+    parser.add_argument('--json_spoiler', action='store_true')
     parser.add_argument('--skip_playthrough', action='store_true')
     parser.add_argument('--rom')
     parser.add_argument('--enemizercli')
@@ -41,6 +42,10 @@ def mystery_argparse():
     parser.add_argument('--log_output_path', help='Path to store output log')
     parser.add_argument('--loglevel', default='info', help='Sets log level')
     parser.add_argument('--create_diff', action="store_true")
+    parser.add_argument('--generation_attempts', default=1, type=lambda value: max(int(value), 1))
+    parser.add_argument('--parallel_setup', action='store_true')
+    parser.add_argument('--timing', action='store_true')
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'])
     parser.add_argument('--yaml_output', default=0, type=lambda value: min(max(int(value), 0), 255),
                         help='Output rolled mystery results to yaml up to specified number (made for async multiworld)')
 
@@ -96,9 +101,14 @@ def main(args=None, callback=ERmain):
     erargs.seed = seed
     erargs.name = {x: "" for x in range(1, args.multi + 1)}  # only so it can be overwrittin in mystery
     erargs.create_spoiler = args.create_spoiler
+    erargs.json_spoiler = args.json_spoiler
     erargs.create_diff = args.create_diff
     erargs.race = args.race
     erargs.skip_playthrough = args.skip_playthrough
+    erargs.generation_attempts = args.generation_attempts
+    erargs.parallel_setup = args.parallel_setup
+    erargs.timing = args.timing
+    erargs.profile = args.profile
     erargs.outputname = seedname
     erargs.outputpath = args.outputpath
     erargs.teams = args.teams
@@ -3,6 +3,7 @@ Helper functions to deliver entrance/exit/region sets to OWG rules.
 """
 
 from BaseClasses import Entrance
+from RuleObjects import Or, as_rule, compile_rule
 
 
 def get_sword_required_superbunny_mirror_regions():
@@ -270,8 +271,7 @@ def overworld_glitches_rules(world, player):
 
 
 def add_alternate_rule(entrance, rule):
-    old_rule = entrance.access_rule
-    entrance.access_rule = lambda state: old_rule(state) or rule(state)
+    entrance.access_rule = compile_rule(Or(as_rule(entrance.access_rule), as_rule(rule)))
 
 
 def create_no_logic_connections(player, world, connections):
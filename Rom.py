@@ -46,11 +46,12 @@ class LocalRom(object):
         self.hash = hash
         self.orig_buffer = None
 
-        with open(file, 'rb') as stream:
-            self.buffer = read_rom(stream)
         if patch:
             self.patch_base_rom()
-            self.orig_buffer = self.buffer.copy()
+            self.orig_buffer = get_patched_base_rom_bytes()
+        else:
+            with open(file, 'rb') as stream:
+                self.buffer = read_rom(stream)
         if vanillaRom:
             with open(vanillaRom, 'rb') as vanillaStream:
                 self.orig_buffer = read_rom(vanillaStream)
@@ -113,25 +114,7 @@ class LocalRom(object):
         return expected == buffermd5.hexdigest()
 
     def patch_base_rom(self):
-        if os.path.isfile(local_path('basepatch.sfc')):
-            with open(local_path('basepatch.sfc'), 'rb') as stream:
-                buffer = bytearray(stream.read())
-
-            if self.verify(buffer):
-                self.buffer = buffer
-                if not os.path.exists(local_path('data', 'basepatch.bmbp')):
-                    Patch.create_patch_file(local_path('basepatch.sfc'))
-                return
-
-        if os.path.isfile(local_path('data', 'basepatch.bmbp')):
-            _, target, buffer = Patch.create_rom_bytes(local_path('data', 'basepatch.bmbp'))
-            if self.verify(buffer):
-                self.buffer = bytearray(buffer)
-                with open(local_path('basepatch.sfc'), 'wb') as stream:
-                    stream.write(buffer)
-                return
-
-        raise RuntimeError('Could not find Base Patch. Unable to continue.')
+        self.buffer = bytearray(get_patched_base_rom_bytes())
 
     def write_crc(self):
         crc = (sum(self.buffer[:0x7FDC] + self.buffer[0x7FE0:]) + 0x01FE) & 0xFFFF
@@ -167,6 +150,41 @@ def read_rom(stream) -> bytearray:
 
 
 check_lock = threading.Lock()
+base_rom_lock = threading.Lock()
+
+
+def get_patched_base_rom_bytes() -> bytes:
+    """The verified randomizer base rom, read or patched once and shared by all roms of the process."""
+    base_rom_bytes = getattr(get_patched_base_rom_bytes, "base_rom_bytes", None)
+    if base_rom_bytes:
+        return base_rom_bytes
+
+    with base_rom_lock:
+        # another thread may have loaded it while this one waited for the lock
+        base_rom_bytes = getattr(get_patched_base_rom_bytes, "base_rom_bytes", None)
+        if base_rom_bytes:
+            return base_rom_bytes
+
+        if os.path.isfile(local_path('basepatch.sfc')):
+            with open(local_path('basepatch.sfc'), 'rb') as stream:
+                buffer = stream.read()
+
+            if LocalRom.verify(buffer):
+                base_rom_bytes = buffer
+                if not os.path.exists(local_path('data', 'basepatch.bmbp')):
+                    Patch.create_patch_file(local_path('basepatch.sfc'))
+
+        if not base_rom_bytes and os.path.isfile(local_path('data', 'basepatch.bmbp')):
+            _, target, buffer = Patch.create_rom_bytes(local_path('data', 'basepatch.bmbp'))
+            if LocalRom.verify(buffer):
+                base_rom_bytes = bytes(buffer)
+                with open(local_path('basepatch.sfc'), 'wb') as stream:
+                    stream.write(buffer)
+
+        if not base_rom_bytes:
+            raise RuntimeError('Could not find Base Patch. Unable to continue.')
+        get_patched_base_rom_bytes.base_rom_bytes = base_rom_bytes
+    return base_rom_bytes
 
 
 def check_enemizer(enemizercli):
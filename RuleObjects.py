@@ -0,0 +1,363 @@
+"""Declarative access rules.
+
+Rules are small immutable trees of Has, HasCount, CanReach, And, Or and Not nodes, with Function as an escape hatch
+for anything else that takes a CollectionState. Before a rule is stored on a Location or Entrance it is simplified and
+compiled into a single function, so evaluating it costs one Python call no matter how often add_rule extended it.
+The compiled function keeps the tree as its ``rule`` attribute and the items it reads as ``dependencies``."""
+from __future__ import annotations
+
+import importlib
+import io
+import marshal
+import pickle
+import types
+import typing
+from typing import Optional, Set, Tuple
+
+if typing.TYPE_CHECKING:
+    from BaseClasses import CollectionState
+
+__all__ = ['Rule', 'Constant', 'Always', 'Never', 'Has', 'HasCount', 'CanReach', 'And', 'Or', 'Not', 'Function',
+           'as_rule', 'compile_rule', 'combine_rules', 'ItemRule', 'allow_all_items', 'always_accessible',
+           'never_always_allow', 'dumps']
+
+
+class Rule(object):
+    __slots__ = ()
+
+    def __and__(self, other) -> Rule:
+        return And(self, as_rule(other))
+
+    def __or__(self, other) -> Rule:
+        return Or(self, as_rule(other))
+
+    def __invert__(self) -> Rule:
+        return Not(self)
+
+    def __call__(self, state: CollectionState) -> bool:
+        # uncompiled evaluation, compile_rule is what ends up on locations and entrances
+        return compile_rule(self)(state)
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._key()))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({", ".join(map(repr, self._key()))})'
+
+    def _key(self) -> tuple:
+        raise NotImplementedError
+
+    def _source(self, constants: list) -> str:
+        """Python expression evaluating this rule against ``state``, constants are referenced as c0, c1, ..."""
+        raise NotImplementedError
+
+    def simplify(self) -> Rule:
+        return self
+
+    def dependencies(self) -> Optional[Set[Tuple[str, int]]]:
+        """(item, player) pairs this rule reads, or None if it also reads anything else."""
+        return None
+
+
+def _constant(constants: list, value) -> str:
+    constants.append(value)
+    return f'c{len(constants) - 1}'
+
+
+class Constant(Rule):
+    __slots__ = ('value',)
+
+    def __init__(self, value: bool):
+        self.value = bool(value)
+
+    def _key(self) -> tuple:
+        return self.value,
+
+    def _source(self, constants: list) -> str:
+        return repr(self.value)
+
+    def dependencies(self) -> Set[Tuple[str, int]]:
+        return set()
+
+
+Always = Constant(True)
+Never = Constant(False)
+
+
+class HasCount(Rule):
+    __slots__ = ('item', 'player', 'count')
+
+    def __init__(self, item: str, player: int, count: int):
+        self.item = item
+        self.player = player
+        self.count = count
+
+    def _key(self) -> tuple:
+        return self.item, self.player, self.count
+
+    def _source(self, constants: list) -> str:
+        return f'state.has({_constant(constants, self.item)}, {_constant(constants, self.player)}, ' \
+               f'{_constant(constants, self.count)})'
+
+    def simplify(self) -> Rule:
+        return Always if self.count <= 0 else self
+
+    def dependencies(self) -> Set[Tuple[str, int]]:
+        return {(self.item, self.player)}
+
+
+class Has(HasCount):
+    __slots__ = ()
+
+    def __init__(self, item: str, player: int):
+        super(Has, self).__init__(item, player, 1)
+
+    def _key(self) -> tuple:
+        return self.item, self.player
+
+    def _source(self, constants: list) -> str:
+        return f'state.has({_constant(constants, self.item)}, {_constant(constants, self.player)})'
+
+
+class CanReach(Rule):
+    __slots__ = ('spot', 'resolution_hint', 'player')
+
+    def __init__(self, spot: str, resolution_hint: str, player: int):
+        self.spot = spot
+        self.resolution_hint = resolution_hint
+        self.player = player
+
+    def _key(self) -> tuple:
+        return self.spot, self.resolution_hint, self.player
+
+    def _source(self, constants: list) -> str:
+        return f'state.can_reach({_constant(constants, self.spot)}, {_constant(constants, self.resolution_hint)}, ' \
+               f'{_constant(constants, self.player)})'
+
+
+class _Nested(Rule):
+    __slots__ = ('rules',)
+    operator = ''
+    identity: Constant = None
+    absorbing: Constant = None
+
+    def __init__(self, *rules: Rule):
+        self.rules = rules
+
+    def _key(self) -> tuple:
+        return self.rules
+
+    def _source(self, constants: list) -> str:
+        return f' {self.operator} '.join(f'({rule._source(constants)})' for rule in self.rules)
+
+    def simplify(self) -> Rule:
+        rules = []
+        for rule in self.rules:
+            rule = rule.simplify()
+            children = rule.rules if type(rule) is type(self) else (rule,)
+            for child in children:
+                if child == self.absorbing:
+                    return self.absorbing
+                if child != self.identity and child not in rules:
+                    rules.append(child)
+        if not rules:
+            return self.identity
+        if len(rules) == 1:
+            return rules[0]
+        return type(self)(*rules)
+
+    def dependencies(self) -> Optional[Set[Tuple[str, int]]]:
+        dependencies = set()
+        for rule in self.rules:
+            child = rule.dependencies()
+            if child is None:
+                return None
+            dependencies |= child
+        return dependencies
+
+
+class And(_Nested):
+    __slots__ = ()
+    operator = 'and'
+    identity = Always
+    absorbing = Never
+
+
+class Or(_Nested):
+    __slots__ = ()
+    operator = 'or'
+    identity = Never
+    absorbing = Always
+
+
+class Not(Rule):
+    __slots__ = ('rule',)
+
+    def __init__(self, rule: Rule):
+        self.rule = rule
+
+    def _key(self) -> tuple:
+        return self.rule,
+
+    def _source(self, constants: list) -> str:
+        return f'not ({self.rule._source(constants)})'
+
+    def simplify(self) -> Rule:
+        rule = self.rule.simplify()
+        if isinstance(rule, Constant):
+            return Never if rule.value else Always
+        if isinstance(rule, Not):
+            return rule.rule
+        return Not(rule)
+
+    def dependencies(self) -> Optional[Set[Tuple[str, int]]]:
+        return self.rule.dependencies()
+
+
+class Function(Rule):
+    """Wraps any callable taking a CollectionState, for logic that has no node type."""
+    __slots__ = ('function',)
+
+    def __init__(self, function: typing.Callable[[CollectionState], bool]):
+        self.function = function
+
+    def _key(self) -> tuple:
+        return self.function,
+
+    def _source(self, constants: list) -> str:
+        return f'{_constant(constants, self.function)}(state)'
+
+
+def as_rule(rule) -> Rule:
+    """Returns the rule tree behind a rule object, compiled rule or plain callable."""
+    if isinstance(rule, Rule):
+        return rule
+    if isinstance(rule, bool):
+        return Constant(rule)
+    return getattr(rule, 'rule', None) or Function(rule)
+
+
+# compiled factories by generated source, rules of the same shape share them across players and worlds
+_factories = {}
+
+
+def compile_rule(rule) -> typing.Callable[[CollectionState], bool]:
+    rule = as_rule(rule).simplify()
+    if isinstance(rule, Function):
+        # nothing to fold, calling through a compiled wrapper would only add a frame
+        return rule.function
+    constants = []
+    expression = rule._source(constants)
+    factory = _factories.get(expression, None)
+    if factory is None:
+        arguments = ', '.join(f'c{index}' for index in range(len(constants)))
+        source = f'def factory({arguments}):\n' \
+                 f'    def access_rule(state):\n' \
+                 f'        return {expression}\n' \
+                 f'    return access_rule\n'
+        namespace = {}
+        exec(source, namespace)
+        factory = _factories[expression] = namespace['factory']
+    function = factory(*constants)
+    function.rule = rule
+    dependencies = rule.dependencies()
+    function.dependencies = None if dependencies is None else tuple(dependencies)
+    return function
+
+
+def combine_rules(old_rule, rule, combine: str = 'and') -> typing.Callable[[CollectionState], bool]:
+    """The new rule is evaluated first, as with the old chained lambdas."""
+    if combine == 'or':
+        return compile_rule(Or(as_rule(rule), as_rule(old_rule)))
+    return compile_rule(And(as_rule(rule), as_rule(old_rule)))
+
+
+class ItemRule(object):
+    """Flat replacement for chained item_rule lambdas: the item names forbidden for each player, checked with one
+    lookup, followed by any other predicates. Immutable, extend returns a new rule that shares the name sets."""
+    __slots__ = ('forbidden', 'rules')
+
+    def __init__(self, forbidden: typing.Optional[typing.Dict[int, typing.AbstractSet[str]]] = None,
+                 rules: Tuple[typing.Callable, ...] = ()):
+        self.forbidden = forbidden if forbidden else {}
+        self.rules = rules
+
+    def __call__(self, item) -> bool:
+        forbidden = self.forbidden.get(item.player)
+        if forbidden and item.name in forbidden:
+            return False
+        for rule in self.rules:
+            if not rule(item):
+                return False
+        return True
+
+    @classmethod
+    def extend(cls, old_rule, player: Optional[int] = None, forbidden: typing.AbstractSet[str] = frozenset(),
+               rule: Optional[typing.Callable] = None) -> ItemRule:
+        if not isinstance(old_rule, ItemRule):
+            old_rule = cls(rules=(old_rule,))
+        rules = old_rule.rules if rule is None else (rule,) + old_rule.rules
+        if not forbidden:
+            return cls(old_rule.forbidden, rules)
+        forbidden_for_player = old_rule.forbidden.get(player)
+        return cls({**old_rule.forbidden, player: forbidden_for_player | forbidden if forbidden_for_player
+                    else forbidden}, rules)
+
+
+allow_all_items = ItemRule()
+always_accessible = compile_rule(Always)
+
+
+def never_always_allow(state: CollectionState, item) -> bool:
+    return False
+
+
+def _load_rule(rule: Rule) -> typing.Callable[[CollectionState], bool]:
+    return always_accessible if rule == Always else compile_rule(rule)
+
+
+def _load_function(code: types.CodeType, module: str, defaults, kwdefaults, closure, qualname: str) -> types.FunctionType:
+    function = types.FunctionType(code, importlib.import_module(module).__dict__, code.co_name, defaults, closure)
+    function.__kwdefaults__ = kwdefaults
+    function.__qualname__ = qualname
+    return function
+
+
+def _make_cell() -> types.CellType:
+    return types.CellType()
+
+
+def _set_cell_contents(cell: types.CellType, contents):
+    cell.cell_contents = contents
+
+
+class _RulePickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if isinstance(obj, types.FunctionType):
+            if isinstance(getattr(obj, 'rule', None), Rule):
+                return _load_rule, (obj.rule,)
+            if '<' in obj.__qualname__:
+                # lambdas and nested functions can't be imported by name, store them with their code and closure
+                return _load_function, (obj.__code__, obj.__module__, obj.__defaults__, obj.__kwdefaults__,
+                                        obj.__closure__, obj.__qualname__), obj.__dict__ or None
+        elif isinstance(obj, types.CodeType):
+            return marshal.loads, (marshal.dumps(obj),)
+        elif isinstance(obj, types.CellType):
+            try:
+                contents = obj.cell_contents
+            except ValueError:  # not assigned yet
+                return _make_cell, ()
+            # contents are set after the cell is memoized, so functions can refer to themselves through it
+            return _make_cell, (), contents, None, None, _set_cell_contents
+        return NotImplemented
+
+
+def dumps(obj) -> bytes:
+    """pickle.dumps that stores compiled rules as their rule trees, and lambdas and nested functions by their code
+    and closure. Code is stored with marshal, so the data can only be loaded by the same Python version."""
+    buffer = io.BytesIO()
+    _RulePickler(buffer, pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
@@ -5,6 +5,8 @@ from BaseClasses import RegionType, World, Entrance
 from Items import ItemFactory, progression_items, item_name_groups
 from OverworldGlitchRules import overworld_glitches_rules, no_logic_rules
 from Bosses import GanonDefeatRule
+from RuleObjects import Always, Never, Has, HasCount, CanReach, And, Or, Function, as_rule, compile_rule, \
+    combine_rules, ItemRule
 
 
 def set_rules(world, player):
@@ -14,7 +16,6 @@ def set_rules(world, player):
         logging.getLogger('').info(
             'WARNING! Seeds generated under this logic often require major glitches and may be impossible!')
         if world.players == 1:
-            world.get_region('Menu', player).can_reach_private = lambda state: True
             no_logic_rules(world, player)
             for exit in world.get_region('Menu', player).exits:
                 exit.hide_path = True
@@ -59,7 +60,7 @@ def set_rules(world, player):
         add_rule(world.get_location('Ganon', player), lambda state: state.can_reach('Master Sword Pedestal', 'Location', player) and state.has('Beat Agahnim 1', player) and state.has('Beat Agahnim 2', player) and state.has_crystals(7, player))
     elif world.goal[player] == 'ganon':
         # require aga2 to beat ganon
-        add_rule(world.get_location('Ganon', player), lambda state: state.has('Beat Agahnim 2', player))
+        add_rule(world.get_location('Ganon', player), Has('Beat Agahnim 2', player))
 
     if world.mode[player] != 'inverted':
         set_big_bomb_rules(world, player)
@@ -71,12 +72,12 @@ def set_rules(world, player):
 
     # if swamp and dam have not been moved we require mirror for swamp palace
     if not world.swamp_patch_required[player]:
-        add_rule(world.get_entrance('Swamp Palace Moat', player), lambda state: state.has_Mirror(player))
+        add_rule(world.get_entrance('Swamp Palace Moat', player), Has('Magic Mirror', player))
 
     # GT Entrance may be required for Turtle Rock for OWG and < 7 required
     ganons_tower = world.get_entrance('Inverted Ganons Tower' if world.mode[player] == 'inverted' else 'Ganons Tower', player)
     if world.crystals_needed_for_gt[player] == 7 and not (world.logic[player] in ['owglitches', 'nologic'] and world.mode[player] != 'inverted'):
-        set_rule(ganons_tower, lambda state: False)
+        set_rule(ganons_tower, Never)
 
     set_trock_key_rules(world, player)
 
@@ -107,7 +108,7 @@ def mirrorless_path_to_castle_courtyard(world, player):
     raise Exception(f"Could not find mirrorless path to castle courtyard for Player {player}")
 
 def set_rule(spot, rule):
-    spot.access_rule = rule
+    spot.access_rule = compile_rule(rule)
 
 def set_defeat_dungeon_boss_rule(location):
     # Lambda required to defer evaluation of dungeon.boss since it will change later if boss shuffle is used
@@ -117,21 +118,26 @@ def set_always_allow(spot, rule):
     spot.always_allow = rule
 
 def add_rule(spot, rule, combine='and'):
-    old_rule = spot.access_rule
-    if combine == 'or':
-        spot.access_rule = lambda state: rule(state) or old_rule(state)
-    else:
-        spot.access_rule = lambda state: rule(state) and old_rule(state)
+    spot.access_rule = combine_rules(spot.access_rule, rule, combine)
+
+
+def key_rule(world, key: str, player: int, count: int = 1):
+    """Rule object for CollectionState.has_key, folded on the logic and key shuffle settings of player."""
+    if world.logic[player] == 'nologic':
+        return Always
+    if world.keyshuffle[player] == "universal":
+        return Function(lambda state: state.can_buy_unlimited('Small Key (Universal)', player))
+    return HasCount(key, player, count)
 
 
 def add_lamp_requirement(world: World, spot, player: int, has_accessible_torch: bool = False):
     if world.dark_room_logic[player] == "lamp":
-        add_rule(spot, lambda state: state.has('Lamp', player))
+        add_rule(spot, Has('Lamp', player))
     elif world.dark_room_logic[player] == "torches":  # implicitly lamp as well
         if has_accessible_torch:
-            add_rule(spot, lambda state: state.has('Lamp', player) or state.has('Fire Rod', player))
+            add_rule(spot, Has('Lamp', player) | Has('Fire Rod', player))
         else:
-            add_rule(spot, lambda state: state.has('Lamp', player))
+            add_rule(spot, Has('Lamp', player))
     elif world.dark_room_logic[player] == "none":
         pass
     else:
@@ -139,23 +145,19 @@ def add_lamp_requirement(world: World, spot, player: int, has_accessible_torch:
 
 
 def forbid_item(location, item, player: int):
-    old_rule = location.item_rule
-    location.item_rule = lambda i: (i.name != item or i.player != player) and old_rule(i)
+    location.item_rule = ItemRule.extend(location.item_rule, player, frozenset((item,)))
 
 
 def forbid_items_for_player(location, items: set, player: int):
-    old_rule = location.item_rule
-    location.item_rule = lambda i: (i.player != player or i.name not in items) and old_rule(i)
+    location.item_rule = ItemRule.extend(location.item_rule, player, items)
 
 def forbid_items(location, items: set):
     """unused, but kept as a debugging tool."""
-    old_rule = location.item_rule
-    location.item_rule = lambda i: i.name not in items and old_rule(i)
+    add_item_rule(location, lambda i: i.name not in items)
 
 
 def add_item_rule(location, rule):
-    old_rule = location.item_rule
-    location.item_rule = lambda item: rule(item) and old_rule(item)
+    location.item_rule = ItemRule.extend(location.item_rule, rule=rule)
 
 
 def item_in_locations(state, item, player, locations):
@@ -167,6 +169,9 @@ def item_in_locations(state, item, player, locations):
 
 def item_name(state, location, player):
     location = state.world.get_location(location, player)
+    if state.trace:
+        # item placement is not an input the reachability index can track
+        state.trace.volatile = True
     if location.item is None:
         return None
     return (location.item.name, location.item.player)
@@ -189,26 +194,25 @@ def global_rules(world, player):
     # ganon can only carry triforce
     add_item_rule(world.get_location('Ganon', player), lambda item: item.name == 'Triforce' and item.player == player)
     # determines which S&Q locations are available - hide from paths since it isn't an in-game location
-    world.get_region('Menu', player).can_reach_private = lambda state: True
     for exit in world.get_region('Menu', player).exits:
         exit.hide_path = True
 
-    set_rule(world.get_entrance('Old Man S&Q', player), lambda state: state.can_reach('Old Man', 'Location', player))
+    set_rule(world.get_entrance('Old Man S&Q', player), CanReach('Old Man', 'Location', player))
 
-    set_rule(world.get_location('Sunken Treasure', player), lambda state: state.has('Open Floodgate', player))
-    set_rule(world.get_location('Dark Blacksmith Ruins', player), lambda state: state.has('Return Smith', player))
+    set_rule(world.get_location('Sunken Treasure', player), Has('Open Floodgate', player))
+    set_rule(world.get_location('Dark Blacksmith Ruins', player), Has('Return Smith', player))
     set_rule(world.get_location('Purple Chest', player),
-             lambda state: state.has('Pick Up Purple Chest', player))  # Can S&Q with chest
+             Has('Pick Up Purple Chest', player))  # Can S&Q with chest
     set_rule(world.get_location('Ether Tablet', player), lambda state: state.can_retrieve_tablet(player))
     set_rule(world.get_location('Master Sword Pedestal', player), lambda state: state.has('Red Pendant', player) and state.has('Blue Pendant', player) and state.has('Green Pendant', player))
 
     set_rule(world.get_location('Missing Smith', player), lambda state: state.has('Get Frog', player) and state.can_reach('Blacksmiths Hut', 'Region', player)) # Can't S&Q with smith
-    set_rule(world.get_location('Blacksmith', player), lambda state: state.has('Return Smith', player))
-    set_rule(world.get_location('Magic Bat', player), lambda state: state.has('Magic Powder', player))
+    set_rule(world.get_location('Blacksmith', player), Has('Return Smith', player))
+    set_rule(world.get_location('Magic Bat', player), Has('Magic Powder', player))
     set_rule(world.get_location('Sick Kid', player), lambda state: state.has_bottle(player))
-    set_rule(world.get_location('Library', player), lambda state: state.has_Boots(player))
-    set_rule(world.get_location('Mimic Cave', player), lambda state: state.has('Hammer', player))
-    set_rule(world.get_location('Sahasrahla', player), lambda state: state.has('Green Pendant', player))
+    set_rule(world.get_location('Library', player), Has('Pegasus Boots', player))
+    set_rule(world.get_location('Mimic Cave', player), Has('Hammer', player))
+    set_rule(world.get_location('Sahasrahla', player), Has('Green Pendant', player))
 
 
     set_rule(world.get_location('Spike Cave', player), lambda state:
@@ -219,18 +223,18 @@ def global_rules(world, player):
                 (state.world.can_take_damage[player] and (state.has_Boots(player) or state.has_hearts(player, 4))))))
              )
 
-    set_rule(world.get_location('Hookshot Cave - Top Right', player), lambda state: state.has('Hookshot', player))
-    set_rule(world.get_location('Hookshot Cave - Top Left', player), lambda state: state.has('Hookshot', player))
+    set_rule(world.get_location('Hookshot Cave - Top Right', player), Has('Hookshot', player))
+    set_rule(world.get_location('Hookshot Cave - Top Left', player), Has('Hookshot', player))
     set_rule(world.get_location('Hookshot Cave - Bottom Right', player),
              lambda state: state.has('Hookshot', player) or state.has('Pegasus Boots', player))
-    set_rule(world.get_location('Hookshot Cave - Bottom Left', player), lambda state: state.has('Hookshot', player))
+    set_rule(world.get_location('Hookshot Cave - Bottom Left', player), Has('Hookshot', player))
 
     set_rule(world.get_entrance('Sewers Door', player),
              lambda state: state.has_key('Small Key (Hyrule Castle)', player) or (
                          world.keyshuffle[player] == "universal" and world.mode[
                      player] == 'standard'))  # standard universal small keys cannot access the shop
     set_rule(world.get_entrance('Sewers Back Door', player),
-             lambda state: state.has_key('Small Key (Hyrule Castle)', player))
+             key_rule(world, 'Small Key (Hyrule Castle)', player))
     set_rule(world.get_entrance('Agahnim 1', player),
              lambda state: state.has_sword(player) and state.has_key('Small Key (Agahnims Tower)', player, 2))
     set_defeat_dungeon_boss_rule(world.get_location('Agahnim 1', player))
@@ -240,7 +244,7 @@ def global_rules(world, player):
                                                                                    player))
 
     set_rule(world.get_location('Eastern Palace - Big Chest', player),
-             lambda state: state.has('Big Key (Eastern Palace)', player))
+             Has('Big Key (Eastern Palace)', player))
     ep_boss = world.get_location('Eastern Palace - Boss', player)
     set_rule(ep_boss, lambda state: state.has('Big Key (Eastern Palace)', player) and
                                     ep_boss.parent_region.dungeon.boss.can_defeat(state))
@@ -251,9 +255,9 @@ def global_rules(world, player):
         add_rule(ep_boss, lambda state: state.can_shoot_arrows(player))
         add_rule(ep_prize,lambda state: state.can_shoot_arrows(player))
 
-    set_rule(world.get_location('Desert Palace - Big Chest', player), lambda state: state.has('Big Key (Desert Palace)', player))
-    set_rule(world.get_location('Desert Palace - Torch', player), lambda state: state.has_Boots(player))
-    set_rule(world.get_entrance('Desert Palace East Wing', player), lambda state: state.has_key('Small Key (Desert Palace)', player))
+    set_rule(world.get_location('Desert Palace - Big Chest', player), Has('Big Key (Desert Palace)', player))
+    set_rule(world.get_location('Desert Palace - Torch', player), Has('Pegasus Boots', player))
+    set_rule(world.get_entrance('Desert Palace East Wing', player), key_rule(world, 'Small Key (Desert Palace)', player))
     set_rule(world.get_location('Desert Palace - Prize', player), lambda state: state.has_key('Small Key (Desert Palace)', player) and state.has('Big Key (Desert Palace)', player) and state.has_fire_source(player) and state.world.get_location('Desert Palace - Prize', player).parent_region.dungeon.boss.can_defeat(state))
     set_rule(world.get_location('Desert Palace - Boss', player), lambda state: state.has_key('Small Key (Desert Palace)', player) and state.has('Big Key (Desert Palace)', player) and state.has_fire_source(player) and state.world.get_location('Desert Palace - Boss', player).parent_region.dungeon.boss.can_defeat(state))
 
@@ -262,8 +266,8 @@ def global_rules(world, player):
         add_rule(world.get_location('Desert Palace - Prize', player), lambda state: state.world.get_region('Desert Palace Main (Outer)', player).can_reach(state))
 
     set_rule(world.get_entrance('Tower of Hera Small Key Door', player), lambda state: state.has_key('Small Key (Tower of Hera)', player) or item_name(state, 'Tower of Hera - Big Key Chest', player) == ('Small Key (Tower of Hera)', player))
-    set_rule(world.get_entrance('Tower of Hera Big Key Door', player), lambda state: state.has('Big Key (Tower of Hera)', player))
-    set_rule(world.get_location('Tower of Hera - Big Chest', player), lambda state: state.has('Big Key (Tower of Hera)', player))
+    set_rule(world.get_entrance('Tower of Hera Big Key Door', player), Has('Big Key (Tower of Hera)', player))
+    set_rule(world.get_location('Tower of Hera - Big Chest', player), Has('Big Key (Tower of Hera)', player))
     set_rule(world.get_location('Tower of Hera - Big Key Chest', player), lambda state: state.has_fire_source(player))
     if world.accessibility[player] != 'locations':
         set_always_allow(world.get_location('Tower of Hera - Big Key Chest', player), lambda state, item: item.name == 'Small Key (Tower of Hera)' and item.player == player)
@@ -271,30 +275,30 @@ def global_rules(world, player):
     set_defeat_dungeon_boss_rule(world.get_location('Tower of Hera - Prize', player))
 
     set_rule(world.get_entrance('Swamp Palace Moat', player), lambda state: state.has('Flippers', player) and state.has('Open Floodgate', player))
-    set_rule(world.get_entrance('Swamp Palace Small Key Door', player), lambda state: state.has_key('Small Key (Swamp Palace)', player))
-    set_rule(world.get_entrance('Swamp Palace (Center)', player), lambda state: state.has('Hammer', player))
+    set_rule(world.get_entrance('Swamp Palace Small Key Door', player), key_rule(world, 'Small Key (Swamp Palace)', player))
+    set_rule(world.get_entrance('Swamp Palace (Center)', player), Has('Hammer', player))
     set_rule(world.get_location('Swamp Palace - Big Chest', player), lambda state: state.has('Big Key (Swamp Palace)', player) or item_name(state, 'Swamp Palace - Big Chest', player) == ('Big Key (Swamp Palace)', player))
     if world.accessibility[player] != 'locations':
         set_always_allow(world.get_location('Swamp Palace - Big Chest', player), lambda state, item: item.name == 'Big Key (Swamp Palace)' and item.player == player)
-    set_rule(world.get_entrance('Swamp Palace (North)', player), lambda state: state.has('Hookshot', player))
+    set_rule(world.get_entrance('Swamp Palace (North)', player), Has('Hookshot', player))
     set_defeat_dungeon_boss_rule(world.get_location('Swamp Palace - Boss', player))
     set_defeat_dungeon_boss_rule(world.get_location('Swamp Palace - Prize', player))
     if not world.keyshuffle[player] and world.logic[player] != 'nologic':
         forbid_item(world.get_location('Swamp Palace - Entrance', player), 'Big Key (Swamp Palace)', player)
 
-    set_rule(world.get_entrance('Thieves Town Big Key Door', player), lambda state: state.has('Big Key (Thieves Town)', player))
-    set_rule(world.get_entrance('Blind Fight', player), lambda state: state.has_key('Small Key (Thieves Town)', player))
+    set_rule(world.get_entrance('Thieves Town Big Key Door', player), Has('Big Key (Thieves Town)', player))
+    set_rule(world.get_entrance('Blind Fight', player), key_rule(world, 'Small Key (Thieves Town)', player))
     set_defeat_dungeon_boss_rule(world.get_location('Thieves\' Town - Boss', player))
     set_defeat_dungeon_boss_rule(world.get_location('Thieves\' Town - Prize', player))
     set_rule(world.get_location('Thieves\' Town - Big Chest', player), lambda state: (state.has_key('Small Key (Thieves Town)', player) or item_name(state, 'Thieves\' Town - Big Chest', player) == ('Small Key (Thieves Town)', player)) and state.has('Hammer', player))
     if world.accessibility[player] != 'locations':
         set_always_allow(world.get_location('Thieves\' Town - Big Chest', player), lambda state, item: item.name == 'Small Key (Thieves Town)' and item.player == player and state.has('Hammer', player))
-    set_rule(world.get_location('Thieves\' Town - Attic', player), lambda state: state.has_key('Small Key (Thieves Town)', player))
+    set_rule(world.get_location('Thieves\' Town - Attic', player), key_rule(world, 'Small Key (Thieves Town)', player))
 
-    set_rule(world.get_entrance('Skull Woods First Section South Door', player), lambda state: state.has_key('Small Key (Skull Woods)', player))
-    set_rule(world.get_entrance('Skull Woods First Section (Right) North Door', player), lambda state: state.has_key('Small Key (Skull Woods)', player))
-    set_rule(world.get_entrance('Skull Woods First Section West Door', player), lambda state: state.has_key('Small Key (Skull Woods)', player, 2))  # ideally would only be one key, but we may have spent thst key already on escaping the right section
-    set_rule(world.get_entrance('Skull Woods First Section (Left) Door to Exit', player), lambda state: state.has_key('Small Key (Skull Woods)', player, 2))
+    set_rule(world.get_entrance('Skull Woods First Section South Door', player), key_rule(world, 'Small Key (Skull Woods)', player))
+    set_rule(world.get_entrance('Skull Woods First Section (Right) North Door', player), key_rule(world, 'Small Key (Skull Woods)', player))
+    set_rule(world.get_entrance('Skull Woods First Section West Door', player), key_rule(world, 'Small Key (Skull Woods)', player, 2))  # ideally would only be one key, but we may have spent thst key already on escaping the right section
+    set_rule(world.get_entrance('Skull Woods First Section (Left) Door to Exit', player), key_rule(world, 'Small Key (Skull Woods)', player, 2))
     set_rule(world.get_location('Skull Woods - Big Chest', player), lambda state: state.has('Big Key (Skull Woods)', player) or item_name(state, 'Skull Woods - Big Chest', player) == ('Big Key (Skull Woods)', player))
     if world.accessibility[player] != 'locations':
         set_always_allow(world.get_location('Skull Woods - Big Chest', player), lambda state, item: item.name == 'Big Key (Skull Woods)' and item.player == player)
@@ -303,7 +307,7 @@ def global_rules(world, player):
     set_defeat_dungeon_boss_rule(world.get_location('Skull Woods - Prize', player))
 
     set_rule(world.get_entrance('Ice Palace Entrance Room', player), lambda state: state.can_melt_things(player))
-    set_rule(world.get_location('Ice Palace - Big Chest', player), lambda state: state.has('Big Key (Ice Palace)', player))
+    set_rule(world.get_location('Ice Palace - Big Chest', player), Has('Big Key (Ice Palace)', player))
     set_rule(world.get_entrance('Ice Palace (Kholdstare)', player), lambda state: state.can_lift_rocks(player) and state.has('Hammer', player) and state.has('Big Key (Ice Palace)', player) and (state.has_key('Small Key (Ice Palace)', player, 2) or (state.has('Cane of Somaria', player) and state.has_key('Small Key (Ice Palace)', player, 1))))
     # TODO: investigate change from VT. Changed to hookshot or 2 keys (no checking for big key in specific chests)
     set_rule(world.get_entrance('Ice Palace (East)', player), lambda state: (state.has('Hookshot', player) or (item_in_locations(state, 'Big Key (Ice Palace)', player, [('Ice Palace - Spike Room', player), ('Ice Palace - Big Key Chest', player), ('Ice Palace - Map Chest', player)]) and state.has_key('Small Key (Ice Palace)', player))) and (state.world.can_take_damage[player] or state.has('Hookshot', player) or state.has('Cape', player) or state.has('Cane of Byrna', player)))
@@ -312,9 +316,9 @@ def global_rules(world, player):
     set_defeat_dungeon_boss_rule(world.get_location('Ice Palace - Prize', player))
 
     set_rule(world.get_entrance('Misery Mire Entrance Gap', player), lambda state: (state.has_Boots(player) or state.has('Hookshot', player)) and (state.has_sword(player) or state.has('Fire Rod', player) or state.has('Ice Rod', player) or state.has('Hammer', player) or state.has('Cane of Somaria', player) or state.can_shoot_arrows(player)))  # need to defeat wizzrobes, bombs don't work ...
-    set_rule(world.get_location('Misery Mire - Big Chest', player), lambda state: state.has('Big Key (Misery Mire)', player))
+    set_rule(world.get_location('Misery Mire - Big Chest', player), Has('Big Key (Misery Mire)', player))
     set_rule(world.get_location('Misery Mire - Spike Chest', player), lambda state: (state.world.can_take_damage[player] and state.has_hearts(player, 4)) or state.has('Cane of Byrna', player) or state.has('Cape', player))
-    set_rule(world.get_entrance('Misery Mire Big Key Door', player), lambda state: state.has('Big Key (Misery Mire)', player))
+    set_rule(world.get_entrance('Misery Mire Big Key Door', player), Has('Big Key (Misery Mire)', player))
     # you can squander the free small key from the pot by opening the south door to the north west switch room, locking you out of accessing a color switch ...
     # big key gives backdoor access to that from the teleporter in the north west
     set_rule(world.get_location('Misery Mire - Map Chest', player), lambda state: state.has_key('Small Key (Misery Mire)', player, 1) or state.has('Big Key (Misery Mire)', player))
@@ -324,20 +328,20 @@ def global_rules(world, player):
                                                                                                                  (item_name(state, 'Misery Mire - Big Key Chest', player) in [('Big Key (Misery Mire)', player)])) else state.has_key('Small Key (Misery Mire)', player, 3))
     set_rule(world.get_location('Misery Mire - Compass Chest', player), lambda state: state.has_fire_source(player))
     set_rule(world.get_location('Misery Mire - Big Key Chest', player), lambda state: state.has_fire_source(player))
-    set_rule(world.get_entrance('Misery Mire (Vitreous)', player), lambda state: state.has('Cane of Somaria', player))
+    set_rule(world.get_entrance('Misery Mire (Vitreous)', player), Has('Cane of Somaria', player))
     set_defeat_dungeon_boss_rule(world.get_location('Misery Mire - Boss', player))
     set_defeat_dungeon_boss_rule(world.get_location('Misery Mire - Prize', player))
 
-    set_rule(world.get_entrance('Turtle Rock Entrance Gap', player), lambda state: state.has('Cane of Somaria', player))
-    set_rule(world.get_entrance('Turtle Rock Entrance Gap Reverse', player), lambda state: state.has('Cane of Somaria', player))
-    set_rule(world.get_location('Turtle Rock - Compass Chest', player), lambda state: state.has('Cane of Somaria', player))  # We could get here from the middle section without Cane as we don't cross the entrance gap!
+    set_rule(world.get_entrance('Turtle Rock Entrance Gap', player), Has('Cane of Somaria', player))
+    set_rule(world.get_entrance('Turtle Rock Entrance Gap Reverse', player), Has('Cane of Somaria', player))
+    set_rule(world.get_location('Turtle Rock - Compass Chest', player), Has('Cane of Somaria', player))  # We could get here from the middle section without Cane as we don't cross the entrance gap!
     set_rule(world.get_location('Turtle Rock - Roller Room - Left', player), lambda state: state.has('Cane of Somaria', player) and state.has('Fire Rod', player))
     set_rule(world.get_location('Turtle Rock - Roller Room - Right', player), lambda state: state.has('Cane of Somaria', player) and state.has('Fire Rod', player))
     set_rule(world.get_location('Turtle Rock - Big Chest', player), lambda state: state.has('Big Key (Turtle Rock)', player) and (state.has('Cane of Somaria', player) or state.has('Hookshot', player)))
     set_rule(world.get_entrance('Turtle Rock (Big Chest) (North)', player), lambda state: state.has('Cane of Somaria', player) or state.has('Hookshot', player))
-    set_rule(world.get_entrance('Turtle Rock Big Key Door', player), lambda state: state.has('Big Key (Turtle Rock)', player))
-    set_rule(world.get_entrance('Turtle Rock (Dark Room) (North)', player), lambda state: state.has('Cane of Somaria', player))
-    set_rule(world.get_entrance('Turtle Rock (Dark Room) (South)', player), lambda state: state.has('Cane of Somaria', player))
+    set_rule(world.get_entrance('Turtle Rock Big Key Door', player), Has('Big Key (Turtle Rock)', player))
+    set_rule(world.get_entrance('Turtle Rock (Dark Room) (North)', player), Has('Cane of Somaria', player))
+    set_rule(world.get_entrance('Turtle Rock (Dark Room) (South)', player), Has('Cane of Somaria', player))
     set_rule(world.get_location('Turtle Rock - Eye Bridge - Bottom Left', player), lambda state: state.has('Cane of Byrna', player) or state.has('Cape', player) or state.has('Mirror Shield', player))
     set_rule(world.get_location('Turtle Rock - Eye Bridge - Bottom Right', player), lambda state: state.has('Cane of Byrna', player) or state.has('Cape', player) or state.has('Mirror Shield', player))
     set_rule(world.get_location('Turtle Rock - Eye Bridge - Top Left', player), lambda state: state.has('Cane of Byrna', player) or state.has('Cape', player) or state.has('Mirror Shield', player))
@@ -348,11 +352,11 @@ def global_rules(world, player):
 
     if not world.enemy_shuffle[player]:
         set_rule(world.get_entrance('Palace of Darkness Bonk Wall', player), lambda state: state.can_shoot_arrows(player))
-    set_rule(world.get_entrance('Palace of Darkness Hammer Peg Drop', player), lambda state: state.has('Hammer', player))
-    set_rule(world.get_entrance('Palace of Darkness Bridge Room', player), lambda state: state.has_key('Small Key (Palace of Darkness)', player, 1))  # If we can reach any other small key door, we already have back door access to this area
+    set_rule(world.get_entrance('Palace of Darkness Hammer Peg Drop', player), Has('Hammer', player))
+    set_rule(world.get_entrance('Palace of Darkness Bridge Room', player), key_rule(world, 'Small Key (Palace of Darkness)', player, 1))  # If we can reach any other small key door, we already have back door access to this area
     set_rule(world.get_entrance('Palace of Darkness Big Key Door', player), lambda state: state.has_key('Small Key (Palace of Darkness)', player, 6) and state.has('Big Key (Palace of Darkness)', player) and state.can_shoot_arrows(player) and state.has('Hammer', player))
-    set_rule(world.get_entrance('Palace of Darkness (North)', player), lambda state: state.has_key('Small Key (Palace of Darkness)', player, 4))
-    set_rule(world.get_location('Palace of Darkness - Big Chest', player), lambda state: state.has('Big Key (Palace of Darkness)', player))
+    set_rule(world.get_entrance('Palace of Darkness (North)', player), key_rule(world, 'Small Key (Palace of Darkness)', player, 4))
+    set_rule(world.get_location('Palace of Darkness - Big Chest', player), Has('Big Key (Palace of Darkness)', player))
 
     set_rule(world.get_entrance('Palace of Darkness Big Key Chest Staircase', player), lambda state: state.has_key('Small Key (Palace of Darkness)', player, 6)  or (item_name(state, 'Palace of Darkness - Big Key Chest', player) in [('Small Key (Palace of Darkness)', player)] and state.has_key('Small Key (Palace of Darkness)', player, 3)))
     if world.accessibility[player] != 'locations':
@@ -362,7 +366,7 @@ def global_rules(world, player):
     if world.accessibility[player] != 'locations':
         set_always_allow(world.get_location('Palace of Darkness - Harmless Hellway', player), lambda state, item: item.name == 'Small Key (Palace of Darkness)' and item.player == player and state.has_key('Small Key (Palace of Darkness)', player, 5))
 
-    set_rule(world.get_entrance('Palace of Darkness Maze Door', player), lambda state: state.has_key('Small Key (Palace of Darkness)', player, 6))
+    set_rule(world.get_entrance('Palace of Darkness Maze Door', player), key_rule(world, 'Small Key (Palace of Darkness)', player, 6))
     set_defeat_dungeon_boss_rule(world.get_location('Palace of Darkness - Boss', player))
     set_defeat_dungeon_boss_rule(world.get_location('Palace of Darkness - Prize', player))
 
@@ -370,8 +374,8 @@ def global_rules(world, player):
     randomizer_room_chests = ['Ganons Tower - Randomizer Room - Top Left', 'Ganons Tower - Randomizer Room - Top Right', 'Ganons Tower - Randomizer Room - Bottom Left', 'Ganons Tower - Randomizer Room - Bottom Right']
     compass_room_chests = ['Ganons Tower - Compass Room - Top Left', 'Ganons Tower - Compass Room - Top Right', 'Ganons Tower - Compass Room - Bottom Left', 'Ganons Tower - Compass Room - Bottom Right']
 
-    set_rule(world.get_location('Ganons Tower - Bob\'s Torch', player), lambda state: state.has_Boots(player))
-    set_rule(world.get_entrance('Ganons Tower (Tile Room)', player), lambda state: state.has('Cane of Somaria', player))
+    set_rule(world.get_location('Ganons Tower - Bob\'s Torch', player), Has('Pegasus Boots', player))
+    set_rule(world.get_entrance('Ganons Tower (Tile Room)', player), Has('Cane of Somaria', player))
     set_rule(world.get_entrance('Ganons Tower (Hookshot Room)', player), lambda state: state.has('Hammer', player) and (state.has('Hookshot', player) or state.has_Boots(player)))
     set_rule(world.get_entrance('Ganons Tower (Map Room)', player), lambda state: state.has_key('Small Key (Ganons Tower)', player, 4) or (item_name(state, 'Ganons Tower - Map Chest', player) in [('Big Key (Ganons Tower)', player), ('Small Key (Ganons Tower)', player)] and state.has_key('Small Key (Ganons Tower)', player, 3)))
     if world.accessibility[player] != 'locations':
@@ -379,9 +383,9 @@ def global_rules(world, player):
 
     # It is possible to need more than 2 keys to get through this entrance if you spend keys elsewhere. We reflect this in the chest requirements.
     # However we need to leave these at the lower values to derive that with 3 keys it is always possible to reach Bob and Ice Armos.
-    set_rule(world.get_entrance('Ganons Tower (Double Switch Room)', player), lambda state: state.has_key('Small Key (Ganons Tower)', player, 2))
+    set_rule(world.get_entrance('Ganons Tower (Double Switch Room)', player), key_rule(world, 'Small Key (Ganons Tower)', player, 2))
     # It is possible to need more than 3 keys ....
-    set_rule(world.get_entrance('Ganons Tower (Firesnake Room)', player), lambda state: state.has_key('Small Key (Ganons Tower)', player, 3))
+    set_rule(world.get_entrance('Ganons Tower (Firesnake Room)', player), key_rule(world, 'Small Key (Ganons Tower)', player, 3))
 
     #The actual requirements for these rooms to avoid key-lock
     set_rule(world.get_location('Ganons Tower - Firesnake Room', player), lambda state: state.has_key('Small Key (Ganons Tower)', player, 3) or ((item_in_locations(state, 'Big Key (Ganons Tower)', player, zip(randomizer_room_chests, [player] * len(randomizer_room_chests))) or item_in_locations(state, 'Small Key (Ganons Tower)', player, [('Ganons Tower - Firesnake Room', player)])) and state.has_key('Small Key (Ganons Tower)', player, 2)))
@@ -394,7 +398,7 @@ def global_rules(world, player):
     for location in compass_room_chests:
         set_rule(world.get_location(location, player), lambda state: state.has('Fire Rod', player) and (state.has_key('Small Key (Ganons Tower)', player, 4) or (item_in_locations(state, 'Big Key (Ganons Tower)', player, zip(compass_room_chests, [player] * len(compass_room_chests))) and state.has_key('Small Key (Ganons Tower)', player, 3))))
 
-    set_rule(world.get_location('Ganons Tower - Big Chest', player), lambda state: state.has('Big Key (Ganons Tower)', player))
+    set_rule(world.get_location('Ganons Tower - Big Chest', player), Has('Big Key (Ganons Tower)', player))
 
     set_rule(world.get_location('Ganons Tower - Big Key Room - Left', player),
              lambda state: state.world.get_location('Ganons Tower - Big Key Room - Left', player).parent_region.dungeon.bosses['bottom'].can_defeat(state))
@@ -404,16 +408,16 @@ def global_rules(world, player):
              lambda state: state.world.get_location('Ganons Tower - Big Key Room - Right', player).parent_region.dungeon.bosses['bottom'].can_defeat(state))
     if world.enemy_shuffle[player]:
         set_rule(world.get_entrance('Ganons Tower Big Key Door', player),
-                 lambda state: state.has('Big Key (Ganons Tower)', player))
+                 Has('Big Key (Ganons Tower)', player))
     else:
         set_rule(world.get_entrance('Ganons Tower Big Key Door', player),
                  lambda state: state.has('Big Key (Ganons Tower)', player) and state.can_shoot_arrows(player))
     set_rule(world.get_entrance('Ganons Tower Torch Rooms', player),
              lambda state: state.has_fire_source(player) and state.world.get_entrance('Ganons Tower Torch Rooms', player).parent_region.dungeon.bosses['middle'].can_defeat(state))
     set_rule(world.get_location('Ganons Tower - Pre-Moldorm Chest', player),
-             lambda state: state.has_key('Small Key (Ganons Tower)', player, 3))
+             key_rule(world, 'Small Key (Ganons Tower)', player, 3))
     set_rule(world.get_entrance('Ganons Tower Moldorm Door', player),
-             lambda state: state.has_key('Small Key (Ganons Tower)', player, 4))
+             key_rule(world, 'Small Key (Ganons Tower)', player, 4))
     set_rule(world.get_entrance('Ganons Tower Moldorm Gap', player),
              lambda state: state.has('Hookshot', player) and state.world.get_entrance('Ganons Tower Moldorm Gap', player).parent_region.dungeon.bosses['top'].can_defeat(state))
     set_defeat_dungeon_boss_rule(world.get_location('Agahnim 2', player))
@@ -422,7 +426,7 @@ def global_rules(world, player):
     if world.goal[player] in ['ganontriforcehunt', 'localganontriforcehunt']:
         add_rule(ganon, lambda state: state.has_triforce_pieces(world.treasure_hunt_count[player], player))
     elif world.goal[player] == 'ganonpedestal':
-        add_rule(world.get_location('Ganon', player), lambda state: state.can_reach('Master Sword Pedestal', 'Location', player))
+        add_rule(world.get_location('Ganon', player), CanReach('Master Sword Pedestal', 'Location', player))
     else:
         add_rule(ganon, lambda state: state.has_crystals(world.crystals_needed_for_ganon[player], player))
     set_rule(world.get_entrance('Ganon Drop', player), lambda state: state.has_beam_sword(player))  # need to damage ganon to get tiles to drop
@@ -430,47 +434,47 @@ def global_rules(world, player):
 
 def default_rules(world, player):
     # overworld requirements
-    set_rule(world.get_entrance('Kings Grave', player), lambda state: state.has_Boots(player))
-    set_rule(world.get_entrance('Kings Grave Outer Rocks', player), lambda state: state.can_lift_heavy_rocks(player))
-    set_rule(world.get_entrance('Kings Grave Inner Rocks', player), lambda state: state.can_lift_heavy_rocks(player))
+    set_rule(world.get_entrance('Kings Grave', player), Has('Pegasus Boots', player))
+    set_rule(world.get_entrance('Kings Grave Outer Rocks', player), Has('Titans Mitts', player))
+    set_rule(world.get_entrance('Kings Grave Inner Rocks', player), Has('Titans Mitts', player))
     set_rule(world.get_entrance('Kings Grave Mirror Spot', player), lambda state: state.has_Pearl(player) and state.has_Mirror(player))
     # Caution: If king's grave is releaxed at all to account for reaching it via a two way cave's exit in insanity mode, then the bomb shop logic will need to be updated (that would involve create a small ledge-like Region for it)
-    set_rule(world.get_entrance('Bonk Fairy (Light)', player), lambda state: state.has_Boots(player))
+    set_rule(world.get_entrance('Bonk Fairy (Light)', player), Has('Pegasus Boots', player))
     set_rule(world.get_entrance('Lumberjack Tree Tree', player), lambda state: state.has_Boots(player) and state.has('Beat Agahnim 1', player))
-    set_rule(world.get_entrance('Bonk Rock Cave', player), lambda state: state.has_Boots(player))
-    set_rule(world.get_entrance('Desert Palace Stairs', player), lambda state: state.has('Book of Mudora', player))
+    set_rule(world.get_entrance('Bonk Rock Cave', player), Has('Pegasus Boots', player))
+    set_rule(world.get_entrance('Desert Palace Stairs', player), Has('Book of Mudora', player))
     set_rule(world.get_entrance('Sanctuary Grave', player), lambda state: state.can_lift_rocks(player))
     set_rule(world.get_entrance('20 Rupee Cave', player), lambda state: state.can_lift_rocks(player))
     set_rule(world.get_entrance('50 Rupee Cave', player), lambda state: state.can_lift_rocks(player))
     set_rule(world.get_entrance('Death Mountain Entrance Rock', player), lambda state: state.can_lift_rocks(player))
-    set_rule(world.get_entrance('Bumper Cave Entrance Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Flute Spot 1', player), lambda state: state.has('Flute', player))
-    set_rule(world.get_entrance('Lake Hylia Central Island Teleporter', player), lambda state: state.can_lift_heavy_rocks(player))
+    set_rule(world.get_entrance('Bumper Cave Entrance Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Flute Spot 1', player), Has('Flute', player))
+    set_rule(world.get_entrance('Lake Hylia Central Island Teleporter', player), Has('Titans Mitts', player))
     set_rule(world.get_entrance('Dark Desert Teleporter', player), lambda state: state.has('Flute', player) and state.can_lift_heavy_rocks(player))
     set_rule(world.get_entrance('East Hyrule Teleporter', player), lambda state: state.has('Hammer', player) and state.can_lift_rocks(player) and state.has_Pearl(player)) # bunny cannot use hammer
     set_rule(world.get_entrance('South Hyrule Teleporter', player), lambda state: state.has('Hammer', player) and state.can_lift_rocks(player) and state.has_Pearl(player)) # bunny cannot use hammer
     set_rule(world.get_entrance('Kakariko Teleporter', player), lambda state: ((state.has('Hammer', player) and state.can_lift_rocks(player)) or state.can_lift_heavy_rocks(player)) and state.has_Pearl(player)) # bunny cannot lift bushes
-    set_rule(world.get_location('Flute Spot', player), lambda state: state.has('Shovel', player))
-    set_rule(world.get_entrance('Bat Cave Drop Ledge', player), lambda state: state.has('Hammer', player))
+    set_rule(world.get_location('Flute Spot', player), Has('Shovel', player))
+    set_rule(world.get_entrance('Bat Cave Drop Ledge', player), Has('Hammer', player))
 
-    set_rule(world.get_location('Zora\'s Ledge', player), lambda state: state.has('Flippers', player))
-    set_rule(world.get_entrance('Waterfall of Wishing', player), lambda state: state.has('Flippers', player))
-    set_rule(world.get_location('Frog', player), lambda state: state.can_lift_heavy_rocks(player)) # will get automatic moon pearl requirement
-    set_rule(world.get_location('Potion Shop', player), lambda state: state.has('Mushroom', player))
+    set_rule(world.get_location('Zora\'s Ledge', player), Has('Flippers', player))
+    set_rule(world.get_entrance('Waterfall of Wishing', player), Has('Flippers', player))
+    set_rule(world.get_location('Frog', player), Has('Titans Mitts', player)) # will get automatic moon pearl requirement
+    set_rule(world.get_location('Potion Shop', player), Has('Mushroom', player))
     set_rule(world.get_entrance('Desert Palace Entrance (North) Rocks', player), lambda state: state.can_lift_rocks(player))
     set_rule(world.get_entrance('Desert Ledge Return Rocks', player), lambda state: state.can_lift_rocks(player))  # should we decide to place something that is not a dungeon end up there at some point
     set_rule(world.get_entrance('Checkerboard Cave', player), lambda state: state.can_lift_rocks(player))
     set_rule(world.get_entrance('Agahnims Tower', player), lambda state: state.has('Cape', player) or state.has_beam_sword(player) or state.has('Beat Agahnim 1', player))  # barrier gets removed after killing agahnim, relevant for entrance shuffle
-    set_rule(world.get_entrance('Top of Pyramid', player), lambda state: state.has('Beat Agahnim 1', player))
-    set_rule(world.get_entrance('Old Man Cave Exit (West)', player), lambda state: False)  # drop cannot be climbed up
-    set_rule(world.get_entrance('Broken Bridge (West)', player), lambda state: state.has('Hookshot', player))
-    set_rule(world.get_entrance('Broken Bridge (East)', player), lambda state: state.has('Hookshot', player))
-    set_rule(world.get_entrance('East Death Mountain Teleporter', player), lambda state: state.can_lift_heavy_rocks(player))
-    set_rule(world.get_entrance('Fairy Ascension Rocks', player), lambda state: state.can_lift_heavy_rocks(player))
-    set_rule(world.get_entrance('Paradox Cave Push Block Reverse', player), lambda state: state.has('Mirror', player))  # can erase block
-    set_rule(world.get_entrance('Death Mountain (Top)', player), lambda state: state.has('Hammer', player))
+    set_rule(world.get_entrance('Top of Pyramid', player), Has('Beat Agahnim 1', player))
+    set_rule(world.get_entrance('Old Man Cave Exit (West)', player), Never)  # drop cannot be climbed up
+    set_rule(world.get_entrance('Broken Bridge (West)', player), Has('Hookshot', player))
+    set_rule(world.get_entrance('Broken Bridge (East)', player), Has('Hookshot', player))
+    set_rule(world.get_entrance('East Death Mountain Teleporter', player), Has('Titans Mitts', player))
+    set_rule(world.get_entrance('Fairy Ascension Rocks', player), Has('Titans Mitts', player))
+    set_rule(world.get_entrance('Paradox Cave Push Block Reverse', player), Has('Mirror', player))  # can erase block
+    set_rule(world.get_entrance('Death Mountain (Top)', player), Has('Hammer', player))
     set_rule(world.get_entrance('Turtle Rock Teleporter', player), lambda state: state.can_lift_heavy_rocks(player) and state.has('Hammer', player))
-    set_rule(world.get_entrance('East Death Mountain (Top)', player), lambda state: state.has('Hammer', player))
+    set_rule(world.get_entrance('East Death Mountain (Top)', player), Has('Hammer', player))
 
     set_rule(world.get_entrance('Catfish Exit Rock', player), lambda state: state.can_lift_rocks(player))
     set_rule(world.get_entrance('Catfish Entrance Rock', player), lambda state: state.can_lift_rocks(player))
@@ -479,57 +483,57 @@ def default_rules(world, player):
     set_rule(world.get_entrance('South Dark World Bridge', player), lambda state: state.has('Hammer', player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Bonk Fairy (Dark)', player), lambda state: state.has_Pearl(player) and state.has_Boots(player))
     set_rule(world.get_entrance('West Dark World Gap', player), lambda state: state.has_Pearl(player) and state.has('Hookshot', player))
-    set_rule(world.get_entrance('Palace of Darkness', player), lambda state: state.has_Pearl(player)) # kiki needs pearl
-    set_rule(world.get_entrance('Hyrule Castle Ledge Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Hyrule Castle Main Gate', player), lambda state: state.has_Mirror(player))
+    set_rule(world.get_entrance('Palace of Darkness', player), Has('Moon Pearl', player)) # kiki needs pearl
+    set_rule(world.get_entrance('Hyrule Castle Ledge Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Hyrule Castle Main Gate', player), Has('Magic Mirror', player))
     set_rule(world.get_entrance('Dark Lake Hylia Drop (East)', player), lambda state: (state.has_Pearl(player) and state.has('Flippers', player) or state.has_Mirror(player)))  # Overworld Bunny Revival
     set_rule(world.get_location('Bombos Tablet', player), lambda state: state.can_retrieve_tablet(player))
     set_rule(world.get_entrance('Dark Lake Hylia Drop (South)', player), lambda state: state.has_Pearl(player) and state.has('Flippers', player))  # ToDo any fake flipper set up?
-    set_rule(world.get_entrance('Dark Lake Hylia Ledge Fairy', player), lambda state: state.has_Pearl(player)) # bomb required
+    set_rule(world.get_entrance('Dark Lake Hylia Ledge Fairy', player), Has('Moon Pearl', player)) # bomb required
     set_rule(world.get_entrance('Dark Lake Hylia Ledge Spike Cave', player), lambda state: state.can_lift_rocks(player) and state.has_Pearl(player))
-    set_rule(world.get_entrance('Dark Lake Hylia Teleporter', player), lambda state: state.has_Pearl(player))
+    set_rule(world.get_entrance('Dark Lake Hylia Teleporter', player), Has('Moon Pearl', player))
     set_rule(world.get_entrance('Village of Outcasts Heavy Rock', player), lambda state: state.has_Pearl(player) and state.can_lift_heavy_rocks(player))
-    set_rule(world.get_entrance('Hype Cave', player), lambda state: state.has_Pearl(player)) # bomb required
-    set_rule(world.get_entrance('Brewery', player), lambda state: state.has_Pearl(player)) # bomb required
-    set_rule(world.get_entrance('Thieves Town', player), lambda state: state.has_Pearl(player)) # bunny cannot pull
-    set_rule(world.get_entrance('Skull Woods First Section Hole (North)', player), lambda state: state.has_Pearl(player)) # bunny cannot lift bush
-    set_rule(world.get_entrance('Skull Woods Second Section Hole', player), lambda state: state.has_Pearl(player)) # bunny cannot lift bush
-    set_rule(world.get_entrance('Maze Race Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Cave 45 Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Bombos Tablet Mirror Spot', player), lambda state: state.has_Mirror(player))
+    set_rule(world.get_entrance('Hype Cave', player), Has('Moon Pearl', player)) # bomb required
+    set_rule(world.get_entrance('Brewery', player), Has('Moon Pearl', player)) # bomb required
+    set_rule(world.get_entrance('Thieves Town', player), Has('Moon Pearl', player)) # bunny cannot pull
+    set_rule(world.get_entrance('Skull Woods First Section Hole (North)', player), Has('Moon Pearl', player)) # bunny cannot lift bush
+    set_rule(world.get_entrance('Skull Woods Second Section Hole', player), Has('Moon Pearl', player)) # bunny cannot lift bush
+    set_rule(world.get_entrance('Maze Race Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Cave 45 Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Bombos Tablet Mirror Spot', player), Has('Magic Mirror', player))
     set_rule(world.get_entrance('East Dark World Bridge', player), lambda state: state.has_Pearl(player) and state.has('Hammer', player))
     set_rule(world.get_entrance('Lake Hylia Island Mirror Spot', player), lambda state: state.has_Pearl(player) and state.has_Mirror(player) and state.has('Flippers', player))
-    set_rule(world.get_entrance('Lake Hylia Central Island Mirror Spot', player), lambda state: state.has_Mirror(player))
+    set_rule(world.get_entrance('Lake Hylia Central Island Mirror Spot', player), Has('Magic Mirror', player))
     set_rule(world.get_entrance('East Dark World River Pier', player), lambda state: state.has_Pearl(player) and state.has('Flippers', player))  # ToDo any fake flipper set up?
     set_rule(world.get_entrance('Graveyard Ledge Mirror Spot', player), lambda state: state.has_Pearl(player) and state.has_Mirror(player))
     set_rule(world.get_entrance('Bumper Cave Entrance Rock', player), lambda state: state.has_Pearl(player) and state.can_lift_rocks(player))
-    set_rule(world.get_entrance('Bumper Cave Ledge Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Bat Cave Drop Ledge Mirror Spot', player), lambda state: state.has_Mirror(player))
+    set_rule(world.get_entrance('Bumper Cave Ledge Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Bat Cave Drop Ledge Mirror Spot', player), Has('Magic Mirror', player))
     set_rule(world.get_entrance('Dark World Hammer Peg Cave', player), lambda state: state.has_Pearl(player) and state.has('Hammer', player))
     set_rule(world.get_entrance('Village of Outcasts Eastern Rocks', player), lambda state: state.has_Pearl(player) and state.can_lift_heavy_rocks(player))
     set_rule(world.get_entrance('Peg Area Rocks', player), lambda state: state.has_Pearl(player) and state.can_lift_heavy_rocks(player))
     set_rule(world.get_entrance('Village of Outcasts Pegs', player), lambda state: state.has_Pearl(player) and state.has('Hammer', player))
     set_rule(world.get_entrance('Grassy Lawn Pegs', player), lambda state: state.has_Pearl(player) and state.has('Hammer', player))
-    set_rule(world.get_entrance('Bumper Cave Exit (Top)', player), lambda state: state.has('Cape', player))
+    set_rule(world.get_entrance('Bumper Cave Exit (Top)', player), Has('Cape', player))
     set_rule(world.get_entrance('Bumper Cave Exit (Bottom)', player), lambda state: state.has('Cape', player) or state.has('Hookshot', player))
 
     set_rule(world.get_entrance('Skull Woods Final Section', player), lambda state: state.has('Fire Rod', player) and state.has_Pearl(player)) # bunny cannot use fire rod
     set_rule(world.get_entrance('Misery Mire', player), lambda state: state.has_Pearl(player) and state.has_sword(player) and state.has_misery_mire_medallion(player))  # sword required to cast magic (!)
-    set_rule(world.get_entrance('Desert Ledge (Northeast) Mirror Spot', player), lambda state: state.has_Mirror(player))
+    set_rule(world.get_entrance('Desert Ledge (Northeast) Mirror Spot', player), Has('Magic Mirror', player))
 
-    set_rule(world.get_entrance('Desert Ledge Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Desert Palace Stairs Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Desert Palace Entrance (North) Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Spectacle Rock Mirror Spot', player), lambda state: state.has_Mirror(player))
+    set_rule(world.get_entrance('Desert Ledge Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Desert Palace Stairs Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Desert Palace Entrance (North) Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Spectacle Rock Mirror Spot', player), Has('Magic Mirror', player))
     set_rule(world.get_entrance('Hookshot Cave', player), lambda state: state.can_lift_rocks(player) and state.has_Pearl(player))
 
-    set_rule(world.get_entrance('East Death Mountain (Top) Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Mimic Cave Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Spiral Cave Mirror Spot', player), lambda state: state.has_Mirror(player))
+    set_rule(world.get_entrance('East Death Mountain (Top) Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Mimic Cave Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Spiral Cave Mirror Spot', player), Has('Magic Mirror', player))
     set_rule(world.get_entrance('Fairy Ascension Mirror Spot', player), lambda state: state.has_Mirror(player) and state.has_Pearl(player))  # need to lift flowers
-    set_rule(world.get_entrance('Isolated Ledge Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Superbunny Cave Exit (Bottom)', player), lambda state: False)  # Cannot get to bottom exit from top. Just exists for shuffling
-    set_rule(world.get_entrance('Floating Island Mirror Spot', player), lambda state: state.has_Mirror(player))
+    set_rule(world.get_entrance('Isolated Ledge Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Superbunny Cave Exit (Bottom)', player), Never)  # Cannot get to bottom exit from top. Just exists for shuffling
+    set_rule(world.get_entrance('Floating Island Mirror Spot', player), Has('Magic Mirror', player))
     set_rule(world.get_entrance('Turtle Rock', player), lambda state: state.has_Pearl(player) and state.has_sword(player) and state.has_turtle_rock_medallion(player) and state.can_reach('Turtle Rock (Top)', 'Region', player))  # sword required to cast magic (!)
 
     set_rule(world.get_entrance('Pyramid Hole', player), lambda state: state.has('Beat Agahnim 2', player) or world.open_pyramid[player])
@@ -543,35 +547,35 @@ def inverted_rules(world, player):
     set_rule(world.get_entrance('Castle Ledge S&Q', player), lambda state: state.has_Mirror(player) and state.has('Beat Agahnim 1', player))
 
     # overworld requirements 
-    set_rule(world.get_location('Maze Race', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Mini Moldorm Cave', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Ice Rod Cave', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Light Hype Fairy', player), lambda state: state.has_Pearl(player))
+    set_rule(world.get_location('Maze Race', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Mini Moldorm Cave', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Ice Rod Cave', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Light Hype Fairy', player), Has('Moon Pearl', player))
     set_rule(world.get_entrance('Potion Shop Pier', player), lambda state: state.has('Flippers', player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Light World Pier', player), lambda state: state.has('Flippers', player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Kings Grave', player), lambda state: state.has_Boots(player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Kings Grave Outer Rocks', player), lambda state: state.can_lift_heavy_rocks(player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Kings Grave Inner Rocks', player), lambda state: state.can_lift_heavy_rocks(player) and state.has_Pearl(player))
-    set_rule(world.get_entrance('Potion Shop Inner Bushes', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Potion Shop Outer Bushes', player), lambda state: state.has_Pearl(player))
+    set_rule(world.get_entrance('Potion Shop Inner Bushes', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Potion Shop Outer Bushes', player), Has('Moon Pearl', player))
     set_rule(world.get_entrance('Potion Shop Outer Rock', player), lambda state: state.can_lift_rocks(player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Potion Shop Inner Rock', player), lambda state: state.can_lift_rocks(player) and state.has_Pearl(player))
-    set_rule(world.get_entrance('Graveyard Cave Inner Bushes', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Graveyard Cave Outer Bushes', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Secret Passage Inner Bushes', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Secret Passage Outer Bushes', player), lambda state: state.has_Pearl(player))
+    set_rule(world.get_entrance('Graveyard Cave Inner Bushes', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Graveyard Cave Outer Bushes', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Secret Passage Inner Bushes', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Secret Passage Outer Bushes', player), Has('Moon Pearl', player))
     set_rule(world.get_entrance('Bonk Fairy (Light)', player), lambda state: state.has_Boots(player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Bat Cave Drop Ledge', player), lambda state: state.has('Hammer', player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Lumberjack Tree Tree', player), lambda state: state.has_Boots(player) and state.has_Pearl(player) and state.has('Beat Agahnim 1', player))
     set_rule(world.get_entrance('Bonk Rock Cave', player), lambda state: state.has_Boots(player) and state.has_Pearl(player))
-    set_rule(world.get_entrance('Desert Palace Stairs', player), lambda state: state.has('Book of Mudora', player))  # bunny can use book
+    set_rule(world.get_entrance('Desert Palace Stairs', player), Has('Book of Mudora', player))  # bunny can use book
     set_rule(world.get_entrance('Sanctuary Grave', player), lambda state: state.can_lift_rocks(player) and state.has_Pearl(player))
     set_rule(world.get_entrance('20 Rupee Cave', player), lambda state: state.can_lift_rocks(player) and state.has_Pearl(player))
     set_rule(world.get_entrance('50 Rupee Cave', player), lambda state: state.can_lift_rocks(player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Death Mountain Entrance Rock', player), lambda state: state.can_lift_rocks(player) and state.has_Pearl(player))
-    set_rule(world.get_entrance('Bumper Cave Entrance Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Lake Hylia Central Island Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Dark Lake Hylia Central Island Teleporter', player), lambda state: state.can_lift_heavy_rocks(player))
+    set_rule(world.get_entrance('Bumper Cave Entrance Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Lake Hylia Central Island Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Dark Lake Hylia Central Island Teleporter', player), Has('Titans Mitts', player))
     set_rule(world.get_entrance('Dark Desert Teleporter', player), lambda state: state.can_flute(player) and state.can_lift_heavy_rocks(player))
     set_rule(world.get_entrance('East Dark World Teleporter', player), lambda state: state.has('Hammer', player) and state.can_lift_rocks(player) and state.has_Pearl(player)) # bunny cannot use hammer
     set_rule(world.get_entrance('South Dark World Teleporter', player), lambda state: state.has('Hammer', player) and state.can_lift_rocks(player) and state.has_Pearl(player)) # bunny cannot use hammer
@@ -583,29 +587,29 @@ def inverted_rules(world, player):
     set_rule(world.get_entrance('Northeast Light World Return', player), lambda state: state.has('Flippers', player) and state.has_Pearl(player))
     set_rule(world.get_location('Frog', player), lambda state: state.can_lift_heavy_rocks(player) and (state.has_Pearl(player) or state.has('Beat Agahnim 1', player)) or (state.can_reach('Light World', 'Region', player) and state.has_Mirror(player))) # Need LW access using Mirror or Portal
     set_rule(world.get_location('Missing Smith', player), lambda state: state.has('Get Frog', player) and state.can_reach('Blacksmiths Hut', 'Region', player)) # Can't S&Q with smith
-    set_rule(world.get_location('Blacksmith', player), lambda state: state.has('Return Smith', player))
+    set_rule(world.get_location('Blacksmith', player), Has('Return Smith', player))
     set_rule(world.get_location('Magic Bat', player), lambda state: state.has('Magic Powder', player) and state.has_Pearl(player))
     set_rule(world.get_location('Sick Kid', player), lambda state: state.has_bottle(player))
-    set_rule(world.get_location('Mushroom', player), lambda state: state.has_Pearl(player)) # need pearl to pick up bushes
-    set_rule(world.get_entrance('Bush Covered Lawn Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Bush Covered Lawn Inner Bushes', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Bush Covered Lawn Outer Bushes', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Bomb Hut Inner Bushes', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Bomb Hut Outer Bushes', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Light World Bomb Hut', player), lambda state: state.has_Pearl(player)) # need bomb
-    set_rule(world.get_entrance('North Fairy Cave Drop', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Lost Woods Hideout Drop', player), lambda state: state.has_Pearl(player))
+    set_rule(world.get_location('Mushroom', player), Has('Moon Pearl', player)) # need pearl to pick up bushes
+    set_rule(world.get_entrance('Bush Covered Lawn Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Bush Covered Lawn Inner Bushes', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Bush Covered Lawn Outer Bushes', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Bomb Hut Inner Bushes', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Bomb Hut Outer Bushes', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Light World Bomb Hut', player), Has('Moon Pearl', player)) # need bomb
+    set_rule(world.get_entrance('North Fairy Cave Drop', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Lost Woods Hideout Drop', player), Has('Moon Pearl', player))
     set_rule(world.get_location('Potion Shop', player), lambda state: state.has('Mushroom', player) and (state.can_reach('Potion Shop Area', 'Region', player))) # new inverted region, need pearl for bushes or access to potion shop door/waterfall fairy
     set_rule(world.get_entrance('Desert Palace Entrance (North) Rocks', player), lambda state: state.can_lift_rocks(player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Desert Ledge Return Rocks', player), lambda state: state.can_lift_rocks(player) and state.has_Pearl(player))  # should we decide to place something that is not a dungeon end up there at some point
     set_rule(world.get_entrance('Checkerboard Cave', player), lambda state: state.can_lift_rocks(player) and state.has_Pearl(player))
-    set_rule(world.get_entrance('Hyrule Castle Secret Entrance Drop', player), lambda state: state.has_Pearl(player))
-    set_rule(world.get_entrance('Old Man Cave Exit (West)', player), lambda state: False)  # drop cannot be climbed up
+    set_rule(world.get_entrance('Hyrule Castle Secret Entrance Drop', player), Has('Moon Pearl', player))
+    set_rule(world.get_entrance('Old Man Cave Exit (West)', player), Never)  # drop cannot be climbed up
     set_rule(world.get_entrance('Broken Bridge (West)', player), lambda state: state.has('Hookshot', player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Broken Bridge (East)', player), lambda state: state.has('Hookshot', player) and state.has_Pearl(player))
-    set_rule(world.get_entrance('Dark Death Mountain Teleporter (East Bottom)', player), lambda state: state.can_lift_heavy_rocks(player))
+    set_rule(world.get_entrance('Dark Death Mountain Teleporter (East Bottom)', player), Has('Titans Mitts', player))
     set_rule(world.get_entrance('Fairy Ascension Rocks', player), lambda state: state.can_lift_heavy_rocks(player) and state.has_Pearl(player))
-    set_rule(world.get_entrance('Paradox Cave Push Block Reverse', player), lambda state: state.has('Mirror', player))  # can erase block
+    set_rule(world.get_entrance('Paradox Cave Push Block Reverse', player), Has('Mirror', player))  # can erase block
     set_rule(world.get_entrance('Death Mountain (Top)', player), lambda state: state.has('Hammer', player) and state.has_Pearl(player))
     set_rule(world.get_entrance('Dark Death Mountain Teleporter (East)', player), lambda state: state.can_lift_heavy_rocks(player) and state.has('Hammer', player) and state.has_Pearl(player))  # bunny cannot use hammer
     set_rule(world.get_entrance('East Death Mountain (Top)', player), lambda state: state.has('Hammer', player) and state.has_Pearl(player))  # bunny can not use hammer
@@ -613,63 +617,63 @@ def inverted_rules(world, player):
     set_rule(world.get_entrance('Catfish Entrance Rock', player), lambda state: state.can_lift_rocks(player))
     set_rule(world.get_entrance('Northeast Dark World Broken Bridge Pass', player), lambda state: ((state.can_lift_rocks(player) or state.has('Hammer', player)) or state.has('Flippers', player)))
     set_rule(world.get_entrance('East Dark World Broken Bridge Pass', player), lambda state: (state.can_lift_rocks(player) or state.has('Hammer', player)))
-    set_rule(world.get_entrance('South Dark World Bridge', player), lambda state: state.has('Hammer', player))
-    set_rule(world.get_entrance('Bonk Fairy (Dark)', player), lambda state: state.has_Boots(player))
-    set_rule(world.get_entrance('West Dark World Gap', player), lambda state: state.has('Hookshot', player))
-    set_rule(world.get_entrance('Dark Lake Hylia Drop (East)', player), lambda state: state.has('Flippers', player))
+    set_rule(world.get_entrance('South Dark World Bridge', player), Has('Hammer', player))
+    set_rule(world.get_entrance('Bonk Fairy (Dark)', player), Has('Pegasus Boots', player))
+    set_rule(world.get_entrance('West Dark World Gap', player), Has('Hookshot', player))
+    set_rule(world.get_entrance('Dark Lake Hylia Drop (East)', player), Has('Flippers', player))
     set_rule(world.get_location('Bombos Tablet', player), lambda state: state.can_retrieve_tablet(player))
-    set_rule(world.get_entrance('Dark Lake Hylia Drop (South)', player), lambda state: state.has('Flippers', player))  # ToDo any fake flipper set up?
-    set_rule(world.get_entrance('Dark Lake Hylia Ledge Pier', player), lambda state: state.has('Flippers', player))
+    set_rule(world.get_entrance('Dark Lake Hylia Drop (South)', player), Has('Flippers', player))  # ToDo any fake flipper set up?
+    set_rule(world.get_entrance('Dark Lake Hylia Ledge Pier', player), Has('Flippers', player))
     set_rule(world.get_entrance('Dark Lake Hylia Ledge Spike Cave', player), lambda state: state.can_lift_rocks(player))
-    set_rule(world.get_entrance('Dark Lake Hylia Teleporter', player), lambda state: state.has('Flippers', player))  # Fake Flippers
-    set_rule(world.get_entrance('Dark Lake Hylia Shallows', player), lambda state: state.has('Flippers', player))
-    set_rule(world.get_entrance('Village of Outcasts Heavy Rock', player), lambda state: state.can_lift_heavy_rocks(player))
-    set_rule(world.get_entrance('East Dark World Bridge', player), lambda state: state.has('Hammer', player))
-    set_rule(world.get_entrance('Lake Hylia Central Island Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('East Dark World River Pier', player), lambda state: state.has('Flippers', player))  # ToDo any fake flipper set up? (Qirn Jump)
+    set_rule(world.get_entrance('Dark Lake Hylia Teleporter', player), Has('Flippers', player))  # Fake Flippers
+    set_rule(world.get_entrance('Dark Lake Hylia Shallows', player), Has('Flippers', player))
+    set_rule(world.get_entrance('Village of Outcasts Heavy Rock', player), Has('Titans Mitts', player))
+    set_rule(world.get_entrance('East Dark World Bridge', player), Has('Hammer', player))
+    set_rule(world.get_entrance('Lake Hylia Central Island Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('East Dark World River Pier', player), Has('Flippers', player))  # ToDo any fake flipper set up? (Qirn Jump)
     set_rule(world.get_entrance('Bumper Cave Entrance Rock', player), lambda state: state.can_lift_rocks(player))
-    set_rule(world.get_entrance('Bumper Cave Ledge Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Hammer Peg Area Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Dark World Hammer Peg Cave', player), lambda state: state.has('Hammer', player))
-    set_rule(world.get_entrance('Village of Outcasts Eastern Rocks', player), lambda state: state.can_lift_heavy_rocks(player))
-    set_rule(world.get_entrance('Peg Area Rocks', player), lambda state: state.can_lift_heavy_rocks(player))
-    set_rule(world.get_entrance('Village of Outcasts Pegs', player), lambda state: state.has('Hammer', player))
-    set_rule(world.get_entrance('Grassy Lawn Pegs', player), lambda state: state.has('Hammer', player))
-    set_rule(world.get_entrance('Bumper Cave Exit (Top)', player), lambda state: state.has('Cape', player))
+    set_rule(world.get_entrance('Bumper Cave Ledge Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Hammer Peg Area Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Dark World Hammer Peg Cave', player), Has('Hammer', player))
+    set_rule(world.get_entrance('Village of Outcasts Eastern Rocks', player), Has('Titans Mitts', player))
+    set_rule(world.get_entrance('Peg Area Rocks', player), Has('Titans Mitts', player))
+    set_rule(world.get_entrance('Village of Outcasts Pegs', player), Has('Hammer', player))
+    set_rule(world.get_entrance('Grassy Lawn Pegs', player), Has('Hammer', player))
+    set_rule(world.get_entrance('Bumper Cave Exit (Top)', player), Has('Cape', player))
     set_rule(world.get_entrance('Bumper Cave Exit (Bottom)', player), lambda state: state.has('Cape', player) or state.has('Hookshot', player))
 
-    set_rule(world.get_entrance('Skull Woods Final Section', player), lambda state: state.has('Fire Rod', player))
+    set_rule(world.get_entrance('Skull Woods Final Section', player), Has('Fire Rod', player))
     set_rule(world.get_entrance('Misery Mire', player), lambda state: state.has_sword(player) and state.has_misery_mire_medallion(player))  # sword required to cast magic (!)
 
     set_rule(world.get_entrance('Hookshot Cave', player), lambda state: state.can_lift_rocks(player))
 
-    set_rule(world.get_entrance('East Death Mountain Mirror Spot (Top)', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Death Mountain (Top) Mirror Spot', player), lambda state: state.has_Mirror(player))
+    set_rule(world.get_entrance('East Death Mountain Mirror Spot (Top)', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Death Mountain (Top) Mirror Spot', player), Has('Magic Mirror', player))
 
-    set_rule(world.get_entrance('East Death Mountain Mirror Spot (Bottom)', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Dark Death Mountain Ledge Mirror Spot (East)', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Dark Death Mountain Ledge Mirror Spot (West)', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Laser Bridge Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Floating Island Mirror Spot', player), lambda state: state.has_Mirror(player))
+    set_rule(world.get_entrance('East Death Mountain Mirror Spot (Bottom)', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Dark Death Mountain Ledge Mirror Spot (East)', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Dark Death Mountain Ledge Mirror Spot (West)', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Laser Bridge Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Floating Island Mirror Spot', player), Has('Magic Mirror', player))
     set_rule(world.get_entrance('Turtle Rock', player), lambda state: state.has_sword(player) and state.has_turtle_rock_medallion(player) and state.can_reach('Turtle Rock (Top)', 'Region', player)) # sword required to cast magic (!)
 
     # new inverted spots
-    set_rule(world.get_entrance('Post Aga Teleporter', player), lambda state: state.has('Beat Agahnim 1', player))
-    set_rule(world.get_entrance('Mire Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Desert Palace Stairs Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Death Mountain Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('East Dark World Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('West Dark World Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('South Dark World Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Catfish Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Potion Shop Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Shopping Mall Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Maze Race Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Desert Palace North Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Death Mountain (Top) Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Graveyard Cave Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Bomb Hut Mirror Spot', player), lambda state: state.has_Mirror(player))
-    set_rule(world.get_entrance('Skull Woods Mirror Spot', player), lambda state: state.has_Mirror(player))
+    set_rule(world.get_entrance('Post Aga Teleporter', player), Has('Beat Agahnim 1', player))
+    set_rule(world.get_entrance('Mire Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Desert Palace Stairs Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Death Mountain Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('East Dark World Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('West Dark World Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('South Dark World Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Catfish Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Potion Shop Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Shopping Mall Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Maze Race Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Desert Palace North Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Death Mountain (Top) Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Graveyard Cave Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Bomb Hut Mirror Spot', player), Has('Magic Mirror', player))
+    set_rule(world.get_entrance('Skull Woods Mirror Spot', player), Has('Magic Mirror', player))
 
     # inverted flute spots
 
@@ -692,8 +696,8 @@ def inverted_rules(world, player):
 def no_glitches_rules(world, player):
     if world.mode[player] != 'inverted':
         set_rule(world.get_entrance('Zoras River', player), lambda state: state.has('Flippers', player) or state.can_lift_rocks(player))
-        set_rule(world.get_entrance('Lake Hylia Central Island Pier', player), lambda state: state.has('Flippers', player))  # can be fake flippered to
-        set_rule(world.get_entrance('Hobo Bridge', player), lambda state: state.has('Flippers', player))
+        set_rule(world.get_entrance('Lake Hylia Central Island Pier', player), Has('Flippers', player))  # can be fake flippered to
+        set_rule(world.get_entrance('Hobo Bridge', player), Has('Flippers', player))
         set_rule(world.get_entrance('Dark Lake Hylia Drop (East)', player), lambda state: state.has_Pearl(player) and state.has('Flippers', player))
         set_rule(world.get_entrance('Dark Lake Hylia Teleporter', player), lambda state: state.has_Pearl(player) and state.has('Flippers', player))
         set_rule(world.get_entrance('Dark Lake Hylia Ledge Drop', player), lambda state: state.has_Pearl(player) and state.has('Flippers', player))
@@ -704,43 +708,43 @@ def no_glitches_rules(world, player):
         set_rule(world.get_entrance('Lake Hylia Warp', player), lambda state: state.has_Pearl(player) and state.has('Flippers', player))  # can be fake flippered to
         set_rule(world.get_entrance('Northeast Light World Warp', player), lambda state: state.has_Pearl(player) and state.has('Flippers', player))  # can be fake flippered to
         set_rule(world.get_entrance('Hobo Bridge', player), lambda state: state.has_Pearl(player) and state.has('Flippers', player))
-        set_rule(world.get_entrance('Dark Lake Hylia Drop (East)', player), lambda state: state.has('Flippers', player))
-        set_rule(world.get_entrance('Dark Lake Hylia Teleporter', player), lambda state: state.has('Flippers', player))
-        set_rule(world.get_entrance('Dark Lake Hylia Ledge Drop', player), lambda state: state.has('Flippers', player))
-        set_rule(world.get_entrance('East Dark World Pier', player), lambda state: state.has('Flippers', player))
+        set_rule(world.get_entrance('Dark Lake Hylia Drop (East)', player), Has('Flippers', player))
+        set_rule(world.get_entrance('Dark Lake Hylia Teleporter', player), Has('Flippers', player))
+        set_rule(world.get_entrance('Dark Lake Hylia Ledge Drop', player), Has('Flippers', player))
+        set_rule(world.get_entrance('East Dark World Pier', player), Has('Flippers', player))
 
-    add_rule(world.get_entrance('Ganons Tower (Double Switch Room)', player), lambda state: state.has('Hookshot', player))
-    set_rule(world.get_entrance('Paradox Cave Push Block Reverse', player), lambda state: False)  # no glitches does not require block override
+    add_rule(world.get_entrance('Ganons Tower (Double Switch Room)', player), Has('Hookshot', player))
+    set_rule(world.get_entrance('Paradox Cave Push Block Reverse', player), Never)  # no glitches does not require block override
     forbid_bomb_jump_requirements(world, player)
     add_conditional_lamps(world, player)
 
 def fake_flipper_rules(world, player):
     if world.mode[player] != 'inverted':
-        set_rule(world.get_entrance('Zoras River', player), lambda state: True)
-        set_rule(world.get_entrance('Lake Hylia Central Island Pier', player), lambda state: True)
-        set_rule(world.get_entrance('Hobo Bridge', player), lambda state: True)
+        set_rule(world.get_entrance('Zoras River', player), Always)
+        set_rule(world.get_entrance('Lake Hylia Central Island Pier', player), Always)
+        set_rule(world.get_entrance('Hobo Bridge', player), Always)
         set_rule(world.get_entrance('Dark Lake Hylia Drop (East)', player), lambda state: state.has_Pearl(player) and state.has('Flippers', player))
-        set_rule(world.get_entrance('Dark Lake Hylia Teleporter', player), lambda state: state.has_Pearl(player))
-        set_rule(world.get_entrance('Dark Lake Hylia Ledge Drop', player), lambda state: state.has_Pearl(player))
+        set_rule(world.get_entrance('Dark Lake Hylia Teleporter', player), Has('Moon Pearl', player))
+        set_rule(world.get_entrance('Dark Lake Hylia Ledge Drop', player), Has('Moon Pearl', player))
     else:
-        set_rule(world.get_entrance('Zoras River', player), lambda state: state.has_Pearl(player))
-        set_rule(world.get_entrance('Lake Hylia Central Island Pier', player), lambda state: state.has_Pearl(player))
-        set_rule(world.get_entrance('Lake Hylia Island Pier', player), lambda state: state.has_Pearl(player))
-        set_rule(world.get_entrance('Lake Hylia Warp', player), lambda state: state.has_Pearl(player))
-        set_rule(world.get_entrance('Northeast Light World Warp', player), lambda state: state.has_Pearl(player))
-        set_rule(world.get_entrance('Hobo Bridge', player), lambda state: state.has_Pearl(player))
-        set_rule(world.get_entrance('Dark Lake Hylia Drop (East)', player), lambda state: state.has('Flippers', player))
-        set_rule(world.get_entrance('Dark Lake Hylia Teleporter', player), lambda state: True)
-        set_rule(world.get_entrance('Dark Lake Hylia Ledge Drop', player), lambda state: True)
-        set_rule(world.get_entrance('East Dark World Pier', player), lambda state: True)
+        set_rule(world.get_entrance('Zoras River', player), Has('Moon Pearl', player))
+        set_rule(world.get_entrance('Lake Hylia Central Island Pier', player), Has('Moon Pearl', player))
+        set_rule(world.get_entrance('Lake Hylia Island Pier', player), Has('Moon Pearl', player))
+        set_rule(world.get_entrance('Lake Hylia Warp', player), Has('Moon Pearl', player))
+        set_rule(world.get_entrance('Northeast Light World Warp', player), Has('Moon Pearl', player))
+        set_rule(world.get_entrance('Hobo Bridge', player), Has('Moon Pearl', player))
+        set_rule(world.get_entrance('Dark Lake Hylia Drop (East)', player), Has('Flippers', player))
+        set_rule(world.get_entrance('Dark Lake Hylia Teleporter', player), Always)
+        set_rule(world.get_entrance('Dark Lake Hylia Ledge Drop', player), Always)
+        set_rule(world.get_entrance('East Dark World Pier', player), Always)
 
 
 def forbid_bomb_jump_requirements(world, player):
     DMs_room_chests = ['Ganons Tower - DMs Room - Top Left', 'Ganons Tower - DMs Room - Top Right', 'Ganons Tower - DMs Room - Bottom Left', 'Ganons Tower - DMs Room - Bottom Right']
     for location in DMs_room_chests:
-        add_rule(world.get_location(location, player), lambda state: state.has('Hookshot', player))
-    set_rule(world.get_entrance('Paradox Cave Bomb Jump', player), lambda state: False)
-    set_rule(world.get_entrance('Skull Woods First Section Bomb Jump', player), lambda state: False)
+        add_rule(world.get_location(location, player), Has('Hookshot', player))
+    set_rule(world.get_entrance('Paradox Cave Bomb Jump', player), Never)
+    set_rule(world.get_entrance('Skull Woods First Section Bomb Jump', player), Never)
 
 
 DW_Entrances = ['Bumper Cave (Bottom)',
@@ -814,16 +818,16 @@ def add_conditional_lamps(world, player):
 def open_rules(world, player):
     # softlock protection as you can reach the sewers small key door with a guard drop key
     set_rule(world.get_location('Hyrule Castle - Boomerang Chest', player),
-             lambda state: state.has_key('Small Key (Hyrule Castle)', player))
+             key_rule(world, 'Small Key (Hyrule Castle)', player))
     set_rule(world.get_location('Hyrule Castle - Zelda\'s Chest', player),
-             lambda state: state.has_key('Small Key (Hyrule Castle)', player))
+             key_rule(world, 'Small Key (Hyrule Castle)', player))
 
 
 def swordless_rules(world, player):
     set_rule(world.get_entrance('Agahnim 1', player), lambda state: (state.has('Hammer', player) or state.has('Fire Rod', player) or state.can_shoot_arrows(player) or state.has('Cane of Somaria', player)) and state.has_key('Small Key (Agahnims Tower)', player, 2))
     set_rule(world.get_entrance('Skull Woods Torch Room', player), lambda state: state.has_key('Small Key (Skull Woods)', player, 3) and state.has('Fire Rod', player))  # no curtain
     set_rule(world.get_entrance('Ice Palace Entrance Room', player), lambda state: state.has('Fire Rod', player) or state.has('Bombos', player)) #in swordless mode bombos pads are present in the relevant parts of ice palace
-    set_rule(world.get_entrance('Ganon Drop', player), lambda state: state.has('Hammer', player))  # need to damage ganon to get tiles to drop
+    set_rule(world.get_entrance('Ganon Drop', player), Has('Hammer', player))  # need to damage ganon to get tiles to drop
 
     if world.mode[player] != 'inverted':
         set_rule(world.get_entrance('Agahnims Tower', player), lambda state: state.has('Cape', player) or state.has('Hammer', player) or state.has('Beat Agahnim 1', player))  # barrier gets removed after killing agahnim, relevant for entrance shuffle
@@ -845,10 +849,10 @@ def add_connection(parent_name, target_name, entrance_name, world, player):
 def standard_rules(world, player):
     add_connection('Menu', 'Hyrule Castle Secret Entrance', 'Uncle S&Q', world, player)
     world.get_entrance('Uncle S&Q', player).hide_path = True
-    set_rule(world.get_entrance('Hyrule Castle Exit (East)', player), lambda state: state.can_reach('Sanctuary', 'Region', player))
-    set_rule(world.get_entrance('Hyrule Castle Exit (West)', player), lambda state: state.can_reach('Sanctuary', 'Region', player))
-    set_rule(world.get_entrance('Links House S&Q', player), lambda state: state.can_reach('Sanctuary', 'Region', player))
-    set_rule(world.get_entrance('Sanctuary S&Q', player), lambda state: state.can_reach('Sanctuary', 'Region', player))
+    set_rule(world.get_entrance('Hyrule Castle Exit (East)', player), CanReach('Sanctuary', 'Region', player))
+    set_rule(world.get_entrance('Hyrule Castle Exit (West)', player), CanReach('Sanctuary', 'Region', player))
+    set_rule(world.get_entrance('Links House S&Q', player), CanReach('Sanctuary', 'Region', player))
+    set_rule(world.get_entrance('Sanctuary S&Q', player), CanReach('Sanctuary', 'Region', player))
 
 def toss_junk_item(world, player):
     items = ['Rupees (20)', 'Bombs (3)', 'Arrows (10)', 'Rupees (5)', 'Rupee (1)', 'Bombs (10)',
@@ -865,9 +869,9 @@ def toss_junk_item(world, player):
 def set_trock_key_rules(world, player):
     # First set all relevant locked doors to impassible.
     for entrance in ['Turtle Rock Dark Room Staircase', 'Turtle Rock (Chain Chomp Room) (North)', 'Turtle Rock (Chain Chomp Room) (South)', 'Turtle Rock Pokey Room']:
-        set_rule(world.get_entrance(entrance, player), lambda state: False)
+        set_rule(world.get_entrance(entrance, player), Never)
 
-    all_state = world.get_all_state(True)
+    all_state = world.get_all_state(True, player)
 
     # Check if each of the four main regions of the dungoen can be reached. The previous code section prevents key-costing moves within the dungeon.
     can_reach_back = all_state.can_reach(world.get_region('Turtle Rock (Eye Bridge)', player)) if world.can_access_trock_eyebridge[player] is None else world.can_access_trock_eyebridge[player]
@@ -884,7 +888,7 @@ def set_trock_key_rules(world, player):
     front_locked_locations = {('Turtle Rock - Compass Chest', player), ('Turtle Rock - Roller Room - Left', player), ('Turtle Rock - Roller Room - Right', player)}
     if can_reach_middle and not can_reach_back and not can_reach_front:
         normal_regions = all_state.reachable_regions[player].copy()
-        set_rule(world.get_entrance('Turtle Rock (Chain Chomp Room) (South)', player), lambda state: True)
+        set_rule(world.get_entrance('Turtle Rock (Chain Chomp Room) (South)', player), Always)
         all_state.update_reachable_regions(player)
         front_locked_regions = all_state.reachable_regions[player].difference(normal_regions)
         front_locked_locations = set((location.name, player) for region in front_locked_regions for location in region.locations)
@@ -893,16 +897,16 @@ def set_trock_key_rules(world, player):
     # The following represent the common key rules.
 
     # No matter what, the key requirement for going from the middle to the bottom should be three keys.
-    set_rule(world.get_entrance('Turtle Rock Dark Room Staircase', player), lambda state: state.has_key('Small Key (Turtle Rock)', player, 3))
+    set_rule(world.get_entrance('Turtle Rock Dark Room Staircase', player), key_rule(world, 'Small Key (Turtle Rock)', player, 3))
 
     # Now we need to set rules based on which entrances we have access to. The most important point is whether we have back access. If we have back access, we
     # might open all the locked doors in any order so we need maximally restrictive rules.
     if can_reach_back:
         set_rule(world.get_location('Turtle Rock - Big Key Chest', player), lambda state: (state.has_key('Small Key (Turtle Rock)', player, 4) or item_name(state, 'Turtle Rock - Big Key Chest', player) == ('Small Key (Turtle Rock)', player)))
-        set_rule(world.get_entrance('Turtle Rock (Chain Chomp Room) (South)', player), lambda state: state.has_key('Small Key (Turtle Rock)', player, 4))
+        set_rule(world.get_entrance('Turtle Rock (Chain Chomp Room) (South)', player), key_rule(world, 'Small Key (Turtle Rock)', player, 4))
         # Only consider wasting the key on the Trinexx door for going from the front entrance to middle section.  If other key doors are accessible, then these doors can be avoided
-        set_rule(world.get_entrance('Turtle Rock (Chain Chomp Room) (North)', player), lambda state: state.has_key('Small Key (Turtle Rock)', player, 3))
-        set_rule(world.get_entrance('Turtle Rock Pokey Room', player), lambda state: state.has_key('Small Key (Turtle Rock)', player, 2))
+        set_rule(world.get_entrance('Turtle Rock (Chain Chomp Room) (North)', player), key_rule(world, 'Small Key (Turtle Rock)', player, 3))
+        set_rule(world.get_entrance('Turtle Rock Pokey Room', player), key_rule(world, 'Small Key (Turtle Rock)', player, 2))
     else:
         # Middle to front requires 2 keys if the back is locked, otherwise 4
         set_rule(world.get_entrance('Turtle Rock (Chain Chomp Room) (South)', player), lambda state: state.has_key('Small Key (Turtle Rock)', player, 2)
@@ -910,8 +914,8 @@ def set_trock_key_rules(world, player):
                 else state.has_key('Small Key (Turtle Rock)', player, 4))
 
         # Front to middle requires 2 keys (if the middle is accessible then these doors can be avoided, otherwise no keys can be wasted)
-        set_rule(world.get_entrance('Turtle Rock (Chain Chomp Room) (North)', player), lambda state: state.has_key('Small Key (Turtle Rock)', player, 2))
-        set_rule(world.get_entrance('Turtle Rock Pokey Room', player), lambda state: state.has_key('Small Key (Turtle Rock)', player, 1))
+        set_rule(world.get_entrance('Turtle Rock (Chain Chomp Room) (North)', player), key_rule(world, 'Small Key (Turtle Rock)', player, 2))
+        set_rule(world.get_entrance('Turtle Rock Pokey Room', player), key_rule(world, 'Small Key (Turtle Rock)', player, 1))
 
         set_rule(world.get_location('Turtle Rock - Big Key Chest', player), lambda state: state.has_key('Small Key (Turtle Rock)', player, tr_big_key_chest_keys_needed(state)))
 
@@ -1314,7 +1318,7 @@ def set_inverted_big_bomb_rules(world, player):
         pass
     elif bombshop_entrance.name in Normal_LW_entrances:
         # Just walk to the castle and mirror.
-        add_rule(world.get_entrance('Pyramid Fairy', player), lambda state: state.has_Mirror(player))
+        add_rule(world.get_entrance('Pyramid Fairy', player), Has('Magic Mirror', player))
     elif bombshop_entrance.name in Isolated_LW_entrances:
         # For these entrances, you cannot walk to the castle/pyramid and thus must use Mirror and then Flute.
         add_rule(world.get_entrance('Pyramid Fairy', player), lambda state: state.can_flute(player) and state.has_Mirror(player))
@@ -1366,7 +1370,7 @@ def set_inverted_big_bomb_rules(world, player):
         raise Exception('No valid path to open Pyramid Fairy. (Could not route from %s)' % bombshop_entrance.name)
     elif bombshop_entrance.name == 'Pyramid Fairy':
         # Self locking.  The shuffles don't put the bomb shop here, but doesn't lock anything important.
-        set_rule(world.get_entrance('Pyramid Fairy', player), lambda state: False)
+        set_rule(world.get_entrance('Pyramid Fairy', player), Never)
     else:
         raise Exception('No logic found for routing from %s to the pyramid.' % bombshop_entrance.name)
 
@@ -1386,11 +1390,10 @@ def set_bunny_rules(world: World, player: int, inverted: bool):
                                   'Desert Ledge']
 
     def path_to_access_rule(path, entrance):
-        return lambda state: state.can_reach(entrance.name, 'Entrance', entrance.player) and all(
-            rule(state) for rule in path)
+        return And(CanReach(entrance.name, 'Entrance', entrance.player), *map(as_rule, path))
 
     def options_to_access_rule(options):
-        return lambda state: any(rule(state) for rule in options)
+        return Or(*map(as_rule, options))
 
     # Helper functions to determine if the moon pearl is required
     if inverted:
@@ -1411,26 +1414,26 @@ def set_bunny_rules(world: World, player: int, inverted: bool):
         # bunny revival accessible.
         if world.logic[player] in ['minorglitches', 'owglitches', 'nologic']:
             if region.name == 'Swamp Palace (Entrance)':  # Need to 0hp revive - not in logic
-                return lambda state: state.has_Pearl(player)
+                return Has('Moon Pearl', player)
             if region.name == 'Tower of Hera (Bottom)':  # Need to hit the crystal switch
-                return lambda state: state.has_Mirror(player) and state.has_sword(player) or state.has_Pearl(player)
+                return Has('Magic Mirror', player) & Function(lambda state: state.has_sword(player)) | Has('Moon Pearl', player)
             if region.name in OverworldGlitchRules.get_invalid_bunny_revival_dungeons():
-                return lambda state: state.has_Mirror(player) or state.has_Pearl(player)
+                return Has('Magic Mirror', player) | Has('Moon Pearl', player)
             if region.type == RegionType.Dungeon:
-                return lambda state: True
+                return Always
             if (((location is None or location.name not in OverworldGlitchRules.get_superbunny_accessible_locations())
                     or (connecting_entrance is not None and connecting_entrance.name in OverworldGlitchRules.get_invalid_bunny_revival_dungeons()))
                     and not is_link(region)):
-                return lambda state: state.has_Pearl(player)
+                return Has('Moon Pearl', player)
         else:
             if not is_link(region):
-                return lambda state: state.has_Pearl(player)
+                return Has('Moon Pearl', player)
 
         # in this case we are mixed region.
         # we collect possible options.
 
         # The base option is having the moon pearl
-        possible_options = [lambda state: state.has_Pearl(player)]
+        possible_options = [Has('Moon Pearl', player)]
 
         # We will search entrances recursively until we find
         # one that leads to an exclusively link state region
@@ -0,0 +1,31 @@
+import logging
+import shlex
+import tempfile
+import time
+
+from EntranceRandomizer import parse_arguments
+from Main import main
+
+
+def generate_world(players: int, options: str = '', seed: int = 0, **overrides):
+    """Generates a multiworld without creating roms, so no base rom is required."""
+    args = parse_arguments(shlex.split(f'--multi {players} --suppress_rom --skip_playthrough '
+                                       f'--outputpath {tempfile.mkdtemp()} {options}'))
+    args.dark_room_logic = {player: 'lamp' for player in range(1, players + 1)}
+    for name, value in overrides.items():
+        setattr(args, name, value)
+    logging.disable(logging.WARNING)
+    try:
+        return main(args, seed)
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def best_of(function, repeat: int = 3) -> float:
+    """Best wall time in seconds of repeated calls to function."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
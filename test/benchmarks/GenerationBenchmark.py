@@ -0,0 +1,115 @@
+"""Generation time, per stage timings, peak RSS and progression sphere counts across player counts and settings.
+Runs offline, no base rom required. Each case is generated with a fixed seed in a fresh interpreter, so peak RSS
+isn't masked by earlier cases. Results are written as JSON, and can be compared against an earlier results file,
+failing if any case got slower or bigger than the tolerance allows.
+
+Usage: python -m test.benchmarks.GenerationBenchmark [--players 1 10 50] [--settings vanilla inverted]
+           [--playthrough] [--output results.json] [--compare baseline.json] [--tolerance 0.2]"""
+import argparse
+import json
+import subprocess
+import sys
+import typing
+
+player_counts = (1, 10, 50, 100, 250)
+
+settings = {
+    'vanilla': '--shuffle vanilla',
+    'entrance_shuffle': '--shuffle full',
+    'inverted': '--shuffle vanilla --mode inverted',
+    'keysanity': '--shuffle vanilla --keysanity',
+    'owglitches': '--shuffle vanilla --logic owglitches',
+}
+
+child = '''
+import json, sys
+from BaseClasses import CollectionState, SphereIterator
+from test.benchmarks.BenchmarkBase import generate_world
+players = int(sys.argv[1])
+world = generate_world(players, sys.argv[2], seed=players, timing=True, skip_playthrough=sys.argv[3] != 'True')
+result = world.generation_stats.to_dict()
+state = CollectionState(world)
+spheres = SphereIterator(state, [location for location in world.get_filled_locations()
+                                 if location.item.advancement or location.event])
+result['spheres'] = 0
+for sphere in spheres:
+    result['spheres'] += 1
+    for location in sphere:
+        state.collect(location.item, True, location)
+print(json.dumps(result))
+'''
+
+
+def run_case(players: int, setting: str, playthrough: bool = False) -> dict:
+    output = subprocess.run([sys.executable, '-c', child, str(players), settings[setting], str(playthrough)],
+                            check=True, capture_output=True, text=True)
+    result = json.loads(output.stdout.splitlines()[-1])
+    return {'players': players, 'settings': setting, 'wall': result['wall'], 'cpu': result['cpu'],
+            'peak_rss': result['peak_rss'], 'spheres': result['spheres'],
+            'stages': {stage['name']: stage['wall'] for stage in result['stages']}}
+
+
+def case_name(result: dict) -> str:
+    return f'{result["players"]}/{result["settings"]}'
+
+
+def run(cases: typing.Iterable[typing.Tuple[int, str]], playthrough: bool = False) -> typing.Dict[str, dict]:
+    results = {}
+    for players, setting in cases:
+        result = run_case(players, setting, playthrough)
+        results[case_name(result)] = result
+        print(f'{players:4} players {setting:16} {result["wall"]:8.2f}s  peak RSS {result["peak_rss"] or 0:7.1f} MiB  '
+              f'{result["spheres"]:3} spheres')
+    return results
+
+
+def compare(results: typing.Dict[str, dict], baseline: typing.Dict[str, dict], tolerance: float) -> bool:
+    """Prints the change of each case against baseline, returns whether all of them are within tolerance."""
+    within_tolerance = True
+    for name, result in results.items():
+        if name not in baseline:
+            print(f'{name:22} not in baseline')
+            continue
+        before = baseline[name]
+        verdicts = []
+        for measure in ('wall', 'peak_rss'):
+            if result[measure] is None or not before[measure]:
+                continue
+            change = result[measure] / before[measure] - 1
+            regressed = change > tolerance
+            within_tolerance &= not regressed
+            verdicts.append(f'{measure} {change:+7.1%}{" REGRESSED" if regressed else ""}')
+        if result['spheres'] != before['spheres']:
+            verdicts.append(f'spheres {before["spheres"]} -> {result["spheres"]}')
+        slowest = max(result['stages'], key=lambda stage: result['stages'][stage] - before['stages'].get(stage, 0))
+        verdicts.append(f'most slowed stage: {slowest} '
+                        f'{result["stages"][slowest] - before["stages"].get(slowest, 0):+.2f}s')
+        print(f'{name:22} ' + '  '.join(verdicts))
+    return within_tolerance
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, nargs='+', default=player_counts)
+    parser.add_argument('--settings', nargs='+', choices=list(settings), default=list(settings))
+    parser.add_argument('--playthrough', action='store_true',
+                        help='Include calculating the spoiler playthrough, which is slow for larger multiworlds.')
+    parser.add_argument('--output', help='Write the results to this JSON file.')
+    parser.add_argument('--compare', help='Compare the results against this earlier results file.')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed relative increase of wall time and peak RSS over the compared results.')
+    args = parser.parse_args(argv)
+
+    results = run(((players, setting) for players in args.players for setting in args.settings), args.playthrough)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        return 0 if compare(results, baseline, args.tolerance) else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
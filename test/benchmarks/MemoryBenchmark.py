@@ -0,0 +1,47 @@
+"""Peak RSS regression check for generating large multiworlds. Each size is generated in a fresh interpreter so the
+peaks don't mask each other, and compared against a budget with some headroom over the measured peak.
+
+Usage: python -m test.benchmarks.MemoryBenchmark [players ...]"""
+import os
+import subprocess
+import sys
+import typing
+
+from Instrumentation import peak_rss
+
+# MiB, measured peak plus headroom
+budgets = {50: 125, 100: 220, 250: 560}
+
+child = '''
+import sys
+from Instrumentation import peak_rss
+from test.benchmarks.BenchmarkBase import generate_world
+generate_world(int(sys.argv[1]), seed=int(sys.argv[1]))
+print(peak_rss())
+'''
+
+
+def generation_peak_rss(players: int) -> typing.Optional[float]:
+    """Peak RSS in MiB of generating a multiworld with the given number of players, None where it can't be measured."""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    output = subprocess.run([sys.executable, '-c', child, str(players)], check=True, capture_output=True, text=True,
+                            cwd=root)
+    peak = output.stdout.split()[-1]
+    return None if peak == 'None' else float(peak)
+
+
+def run(player_counts=tuple(budgets)) -> bool:
+    within_budget = True
+    for players in player_counts:
+        peak = generation_peak_rss(players)
+        budget = budgets.get(players)
+        verdict = '' if budget is None else 'ok' if peak <= budget else f'OVER BUDGET ({budget} MiB)'
+        within_budget &= budget is None or peak <= budget
+        print(f'{players:4} players: peak RSS {peak:7.1f} MiB {verdict}')
+    return within_budget
+
+
+if __name__ == '__main__':
+    if peak_rss() is None:
+        sys.exit('Peak RSS can only be measured where the resource module is available.')
+    sys.exit(0 if run([int(arg) for arg in sys.argv[1:]] or tuple(budgets)) else 1)
@@ -0,0 +1,63 @@
+"""Compares the array backed CollectionState.prog_items against the former (item_name, player) keyed Counter.
+
+Usage: python -m test.benchmarks.ProgItemsBenchmark [players]"""
+import sys
+from collections import Counter
+
+from BaseClasses import CollectionState
+from test.benchmarks.BenchmarkBase import generate_world, best_of
+
+
+class CounterProgItems(Counter):
+    def count(self, item: str, player: int) -> int:
+        return self[item, player]
+
+    def add(self, item: str, player: int, amount: int = 1):
+        self[item, player] += amount
+
+
+class CounterCollectionState(CollectionState):
+    """CollectionState with the previous Counter based inventory."""
+
+    def __init__(self, parent):
+        super(CounterCollectionState, self).__init__(parent)
+        self.prog_items = CounterProgItems(self.prog_items.items())
+
+    def has(self, item, player: int, count: int = 1):
+        return self.prog_items[item, player] >= count
+
+    def item_count(self, item, player: int) -> int:
+        return self.prog_items[item, player]
+
+
+def run(players: int = 10):
+    world = generate_world(players, seed=players)
+    locations = world.get_locations()
+    entrances = world.get_entrances()
+    # collect every other progression item, so rules see a mix of present and missing items
+    items = [location.item for location in locations if location.item and location.item.advancement][::2]
+
+    results = {}
+    for state_type in (CounterCollectionState, CollectionState):
+        state = state_type(world)
+        for item in items:
+            state.collect(item, True)
+        state.sweep_for_events()
+
+        def evaluate_rules():
+            for _ in range(10):
+                for location in locations:
+                    location.access_rule(state)
+                for entrance in entrances:
+                    entrance.access_rule(state)
+
+        results[state_type.__name__] = {'rules': best_of(evaluate_rules),
+                                        'copy': best_of(lambda: [state.copy() for _ in range(100)])}
+
+    for name, timings in results.items():
+        print(f'{name:24} rules: {timings["rules"]:.3f}s  100 copies: {timings["copy"]:.3f}s')
+    return results
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
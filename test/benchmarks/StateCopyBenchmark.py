@@ -0,0 +1,77 @@
+"""Compares the copy on write CollectionState.copy against copying every player's data up front,
+on the copy, collect and sweep pattern of Fill.fill_restrictive and balance_multiworld_progression.
+
+Usage: python -m test.benchmarks.StateCopyBenchmark [players]"""
+import copy
+import sys
+import tracemalloc
+
+from BaseClasses import CollectionState
+from test.benchmarks.BenchmarkBase import generate_world, best_of
+
+
+class EagerCopyCollectionState(CollectionState):
+    """CollectionState with the previous copy, which duplicates the data of all players."""
+
+    def copy(self) -> CollectionState:
+        ret = super(EagerCopyCollectionState, self).copy()
+        ret.__class__ = EagerCopyCollectionState
+        ret.prog_items.counters = {player: counter[:] for player, counter in ret.prog_items.counters.items()}
+        ret.prog_items.shared = set()
+        ret.reachable_regions = {player: regions.copy() for player, regions in ret.reachable_regions.items()}
+        ret.blocked_connections = {player: connections.copy()
+                                   for player, connections in ret.blocked_connections.items()}
+        ret.blocked_index = {player: index.copy() if index else None for player, index in ret.blocked_index.items()}
+        if ret.path is not None:
+            ret.path.paths = {player: paths.copy() for player, paths in ret.path.paths.items()}
+            ret.path.shared = set()
+        ret.events = copy.copy(ret.events)
+        ret.locations_checked = copy.copy(ret.locations_checked)
+        ret.shared_players = set()
+        ret.shared_checks = False
+        self.prog_items.shared = set()
+        if self.path is not None:
+            self.path.shared = set()
+        self.shared_players = set()
+        self.shared_checks = False
+        return ret
+
+
+def run(players: int = 50, rounds: int = 50):
+    world = generate_world(players, seed=players)
+    progression = [location.item for location in world.get_locations() if location.item and location.item.advancement]
+    # hold back the items of a few players, like a fill round that only places those
+    held_back = [item for item in progression if item.player <= 3]
+    base_items = [item for item in progression if item.player > 3]
+
+    results = {}
+    for state_type in (EagerCopyCollectionState, CollectionState):
+        base_state = state_type(world)
+        for item in base_items:
+            base_state.collect(item, True)
+        base_state.sweep_for_events()
+
+        def fill_rounds():
+            states = []
+            for placed in range(rounds):
+                state = base_state.copy()
+                for item in held_back[placed:]:
+                    state.collect(item, True)
+                state.sweep_for_events()
+                states.append(state)
+            return states
+
+        tracemalloc.start()
+        states = fill_rounds()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del states
+        results[state_type.__name__] = {'time': best_of(fill_rounds), 'memory': memory}
+
+    for name, result in results.items():
+        print(f'{name:26} {rounds} rounds: {result["time"]:.3f}s  retained: {result["memory"] / 2 ** 20:.1f} MiB')
+    return results
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,20 @@
+import os
+import unittest
+
+from Instrumentation import peak_rss
+from test.benchmarks.MemoryBenchmark import budgets, generation_peak_rss
+
+
+@unittest.skipIf(peak_rss() is None, 'peak RSS needs the resource module')
+class TestMemoryBudget(unittest.TestCase):
+    def check_budget(self, players: int):
+        self.assertLessEqual(generation_peak_rss(players), budgets[players])
+
+    def test_50_players(self):
+        self.check_budget(50)
+
+    @unittest.skipUnless(os.environ.get('LARGE_MULTIWORLD_TESTS'), 'set LARGE_MULTIWORLD_TESTS to run')
+    def test_larger_multiworlds(self):
+        for players in (100, 250):
+            with self.subTest(players=players):
+                self.check_budget(players)
@@ -0,0 +1,46 @@
+import unittest
+
+from BaseClasses import World, CollectionState
+from Dungeons import create_dungeons
+from EntranceShuffle import link_entrances
+from Fill import ExplorationStates
+from InvertedRegions import mark_dark_world_regions
+from ItemPool import difficulties, generate_itempool
+from Regions import create_regions, create_shops
+from Rules import set_rules
+
+
+class TestExplorationStates(unittest.TestCase):
+    def setUp(self):
+        self.world = World(1, {1: 'vanilla'}, {1: 'noglitches'}, {1: 'open'}, {1: 'random'}, {1: 'normal'},
+                           {1: 'normal'}, {1: False}, {1: 'on'}, {1: 'ganon'}, 'balanced', {1: 'items'},
+                           True, {1: False}, False, None, {1: False})
+        self.world.difficulty_requirements[1] = difficulties['normal']
+        create_regions(self.world, 1)
+        create_dungeons(self.world, 1)
+        create_shops(self.world, 1)
+        link_entrances(self.world, 1)
+        generate_itempool(self.world, 1)
+        mark_dark_world_regions(self.world, 1)
+        set_rules(self.world, 1)
+
+    def test_matches_sweep_from_pool(self):
+        pool = [item for item in self.world.itempool if item.advancement]
+        self.world.random.seed(0)
+        self.world.random.shuffle(pool)
+        rounds = [[item] for item in reversed(pool)]
+        states = ExplorationStates(self.world.state, rounds)
+        locations = self.world.get_unfilled_locations(1)
+        for index, placed in enumerate(rounds):
+            expected = self.world.state.copy()
+            for item in pool[:len(pool) - index - 1]:
+                expected.collect(item, True)
+            expected.sweep_for_events()
+            state = states.state(index)
+            self.assertEqual(state.prog_items, expected.prog_items)
+            self.assertEqual(state.reachable_regions[1], expected.reachable_regions[1])
+            # placed items become events that later rounds pick up
+            location = next(location for location in locations if location.can_fill(state, placed[0]))
+            self.world.push_item(location, placed[0], False)
+            location.event = True
+            locations.remove(location)
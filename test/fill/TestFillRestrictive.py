@@ -0,0 +1,62 @@
+import unittest
+
+from BaseClasses import World
+from Dungeons import create_dungeons, get_dungeon_item_pool
+from EntranceShuffle import link_entrances
+from Fill import fill_restrictive
+from InvertedRegions import mark_dark_world_regions
+from ItemPool import difficulties, generate_itempool, fill_prizes
+from Items import ItemFactory
+from Regions import create_regions, create_shops
+from Rules import set_rules, set_rule, item_name
+
+
+class TestFillRestrictive(unittest.TestCase):
+    def setUp(self):
+        self.world = World(2, {1: 'vanilla', 2: 'vanilla'}, {1: 'noglitches', 2: 'noglitches'}, {1: 'open', 2: 'open'},
+                           {1: 'random', 2: 'random'}, {1: 'normal', 2: 'normal'}, {1: 'normal', 2: 'normal'},
+                           {1: False, 2: False}, {1: 'on', 2: 'on'}, {1: 'ganon', 2: 'ganon'}, 'balanced',
+                           {1: 'items', 2: 'items'}, True, {1: False, 2: False}, False, None, {1: False, 2: False})
+        for player in (1, 2):
+            self.world.difficulty_requirements[player] = difficulties['normal']
+            create_regions(self.world, player)
+            create_dungeons(self.world, player)
+            create_shops(self.world, player)
+            link_entrances(self.world, player)
+        for player in (1, 2):
+            generate_itempool(self.world, player)
+            mark_dark_world_regions(self.world, player)
+        for player in (1, 2):
+            set_rules(self.world, player)
+        self.world.random.seed(0)
+        fill_prizes(self.world)
+
+    def test_single_player_placement(self):
+        locations = self.world.get_unfilled_dungeon_locations()
+        self.world.random.shuffle(locations)
+        original_order = locations.copy()
+        itempool = get_dungeon_item_pool(self.world)
+        placing = itempool.copy()
+        fill_restrictive(self.world, self.world.get_all_state(), locations, itempool, True)
+
+        self.assertEqual(itempool, [])
+        for item in placing:
+            self.assertIsNotNone(item.location)
+            self.assertEqual(item.location.player, item.player)
+            self.assertTrue(item.location.parent_region.can_fill(item))
+            self.assertTrue(item.location.event)
+        self.assertEqual(locations, [location for location in original_order if not location.item])
+
+    def test_placement_read_by_rule_within_round(self):
+        first = self.world.get_location('Sahasrahla', 1)
+        second = self.world.get_location('King Zora', 1)
+        # first can only be reached once the first item of the round went to second
+        set_rule(first, lambda state: item_name(state, 'King Zora', 1) == ('Rupees (20)', 1))
+        set_rule(second, lambda state: True)
+        itempool = [ItemFactory('Rupees (20)', 1), ItemFactory('Rupees (5)', 2)]
+        placing = itempool.copy()
+        fill_restrictive(self.world, self.world.get_all_state(), [first, second], itempool)
+
+        self.assertEqual(itempool, [])
+        self.assertIs(second.item, placing[0])
+        self.assertIs(first.item, placing[1])
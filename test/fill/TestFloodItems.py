@@ -0,0 +1,51 @@
+import unittest
+
+from BaseClasses import World, SphereIterator
+from Dungeons import create_dungeons, fill_dungeons_restrictive
+from EntranceShuffle import link_entrances
+from Fill import flood_items
+from InvertedRegions import mark_dark_world_regions
+from ItemPool import difficulties, generate_itempool, fill_prizes
+from Regions import create_regions, create_shops
+from Rules import set_rules
+
+
+class TestFloodItems(unittest.TestCase):
+    def setUp(self):
+        self.world = World(2, {1: 'vanilla', 2: 'vanilla'}, {1: 'noglitches', 2: 'noglitches'}, {1: 'open', 2: 'open'},
+                           {1: 'random', 2: 'random'}, {1: 'normal', 2: 'normal'}, {1: 'normal', 2: 'normal'},
+                           {1: False, 2: False}, {1: 'on', 2: 'on'}, {1: 'ganon', 2: 'ganon'}, 'flood',
+                           {1: 'items', 2: 'items'}, True, {1: False, 2: False}, False, None, {1: False, 2: False})
+        for player in (1, 2):
+            self.world.difficulty_requirements[player] = difficulties['normal']
+            create_regions(self.world, player)
+            create_dungeons(self.world, player)
+            create_shops(self.world, player)
+            link_entrances(self.world, player)
+        for player in (1, 2):
+            generate_itempool(self.world, player)
+            mark_dark_world_regions(self.world, player)
+        for player in (1, 2):
+            set_rules(self.world, player)
+        self.world.random.seed(0)
+        fill_prizes(self.world)
+        fill_dungeons_restrictive(self.world)
+
+    def test_unlocked_by_matches_unlocks_new_location(self):
+        self.world.state.sweep_for_events()
+        reachability = SphereIterator(self.world.state, self.world.get_locations())
+        items = [item for item in self.world.itempool if item.advancement]
+        self.world.random.shuffle(items)
+        for item in items:
+            reachability.next_sphere()
+            for candidate in items:
+                with self.subTest(collected=item.name, candidate=candidate.name):
+                    self.assertEqual(any(location.item is None for location in reachability.unlocked_by(candidate)),
+                                     self.world.unlocks_new_location(candidate))
+            self.world.state.collect(item, True)
+
+    def test_flood_fills_beatable_world(self):
+        flood_items(self.world)
+        self.assertEqual(self.world.itempool, [])
+        self.assertEqual(self.world.get_unfilled_locations(), [])
+        self.assertTrue(self.world.can_beat_game())
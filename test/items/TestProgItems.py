@@ -0,0 +1,47 @@
+import unittest
+
+from BaseClasses import ProgItems, World, CollectionState
+from Items import item_ids
+
+
+class TestProgItems(unittest.TestCase):
+    def setUp(self):
+        self.prog_items = ProgItems(2)
+
+    def test_counter_interface(self):
+        self.prog_items['Hookshot', 1] += 1
+        self.prog_items.add('Progressive Sword', 2, 2)
+        self.assertEqual(self.prog_items['Hookshot', 1], 1)
+        self.assertEqual(self.prog_items['Hookshot', 2], 0)
+        self.assertEqual(self.prog_items.count('Progressive Sword', 2), 2)
+        self.assertEqual(dict(self.prog_items.items()), {('Hookshot', 1): 1, ('Progressive Sword', 2): 2})
+        del self.prog_items['Hookshot', 1]
+        self.assertNotIn(('Hookshot', 1), self.prog_items)
+
+    def test_copy_is_independent(self):
+        self.prog_items.add('Lamp', 1)
+        copied = self.prog_items.copy()
+        copied.add('Lamp', 1)
+        self.assertEqual(self.prog_items['Lamp', 1], 1)
+        self.assertEqual(copied['Lamp', 1], 2)
+
+    def test_unknown_item_name(self):
+        self.assertEqual(self.prog_items['Test Only Item', 1], 0)
+        self.assertNotIn('Test Only Item', item_ids)
+        self.prog_items.add('Test Only Item', 1)
+        self.assertIn('Test Only Item', item_ids)
+        self.assertEqual(self.prog_items['Test Only Item', 1], 1)
+
+    def test_reading_unknown_names_interns_nothing(self):
+        world = World(1, {1: 'vanilla'}, {1: 'noglitches'}, {1: 'open'}, {1: 'random'}, {1: 'normal'},
+                      {1: 'normal'}, {1: False}, {1: 'on'}, {1: 'ganon'}, 'balanced', {1: 'items'},
+                      True, {1: False}, False, None, {1: False})
+        state = CollectionState(world)
+        size = len(item_ids)
+        self.assertEqual(self.prog_items.count('Test Only Read Item', 1), 0)
+        self.assertNotIn(('Test Only Read Item', 1), self.prog_items)
+        self.assertFalse(state.has('Test Only Read Item', 1))
+        self.assertTrue(state.has('Test Only Read Item', 1, 0))
+        self.assertEqual(state.item_count('Test Only Read Item', 1), 0)
+        self.assertEqual(len(item_ids), size)
+        self.assertEqual(len(state.prog_items.counters[1]), size)
@@ -0,0 +1,93 @@
+import shlex
+import tempfile
+import unittest
+
+import Main
+from BaseClasses import World, CollectionState
+from EntranceRandomizer import parse_arguments
+from ItemPool import difficulties
+from EntranceShuffle import link_entrances
+from Items import ItemFactory
+from Regions import create_regions
+
+
+class TestProgressiveItems(unittest.TestCase):
+    def setUp(self):
+        self.world = World(2, {1: 'vanilla', 2: 'vanilla'}, {1: 'noglitches', 2: 'noglitches'}, {1: 'open', 2: 'open'},
+                           {1: 'random', 2: 'random'}, {1: 'normal', 2: 'hard'}, {1: 'normal', 2: 'normal'},
+                           {1: False, 2: False}, {1: 'on', 2: 'on'}, {1: 'ganon', 2: 'ganon'}, 'balanced',
+                           {1: 'items', 2: 'items'}, True, {1: False, 2: False}, False, None, {1: False, 2: False})
+        self.world.difficulty_requirements[1] = difficulties['normal']
+        self.world.difficulty_requirements[2] = difficulties['hard']
+        self.state = CollectionState(self.world)
+
+    def collect(self, name, player, count):
+        for item in ItemFactory([name] * count, player):
+            self.state.collect(item, True)
+
+    def test_tiers_in_order(self):
+        self.collect('Progressive Sword', 1, 3)
+        self.assertTrue(self.state.has('Tempered Sword', 1))
+        self.assertFalse(self.state.has('Golden Sword', 1))
+        self.collect('Progressive Glove', 1, 3)
+        self.assertEqual(self.state.prog_items['Power Glove', 1], 1)
+        self.assertEqual(self.state.prog_items['Titans Mitts', 1], 1)
+
+    def test_capped_by_difficulty(self):
+        self.collect('Progressive Sword', 2, 4)
+        self.assertTrue(self.state.has('Tempered Sword', 2))
+        self.assertFalse(self.state.has('Golden Sword', 2))
+        self.collect('Progressive Bow (Alt)', 1, 2)
+        self.assertTrue(self.state.has('Silver Bow', 1))
+
+    def test_bow_limit_as_in_rom(self):
+        # without glitches silvers are needed for ganon, the rom hands them out beyond the difficulty's limit
+        self.collect('Progressive Bow', 2, 2)
+        self.assertTrue(self.state.has('Silver Bow', 2))
+        self.world.logic[2] = 'owglitches'
+        self.world._progressive_tiers.clear()
+        self.state = CollectionState(self.world)
+        self.collect('Progressive Bow', 2, 2)
+        self.assertTrue(self.state.has('Bow', 2))
+        self.assertFalse(self.state.has('Silver Bow', 2))
+
+    def test_upgrades_from_highest_tier(self):
+        self.collect('Master Sword', 1, 1)
+        self.collect('Progressive Sword', 1, 1)
+        self.assertTrue(self.state.has('Tempered Sword', 1))
+        self.assertFalse(self.state.has('Fighter Sword', 1))
+
+    def test_remove_highest_tier(self):
+        self.collect('Progressive Shield', 1, 2)
+        self.state.remove(ItemFactory('Progressive Shield', 1))
+        self.assertTrue(self.state.has('Blue Shield', 1))
+        self.assertFalse(self.state.has('Red Shield', 1))
+        self.state.remove(ItemFactory('Progressive Shield', 1))
+        self.state.remove(ItemFactory('Progressive Shield', 1))
+        self.assertFalse(self.state.has('Blue Shield', 1))
+
+    def test_all_state_uses_limits(self):
+        for player in (1, 2):
+            create_regions(self.world, player)
+            link_entrances(self.world, player)
+        self.world.logic[2] = 'owglitches'
+        self.world.itempool = ItemFactory(['Progressive Sword'] * 4 + ['Progressive Bow'] * 2, 1) + \
+                              ItemFactory(['Progressive Sword'] * 4 + ['Progressive Bow'] * 2, 2)
+        state = self.world.get_all_state()
+        self.assertTrue(state.has('Golden Sword', 1))
+        self.assertTrue(state.has('Silver Bow', 1))
+        self.assertTrue(state.has('Tempered Sword', 2))
+        self.assertFalse(state.has('Golden Sword', 2))
+        self.assertFalse(state.has('Silver Bow', 2))
+
+
+class TestDifficultyGeneration(unittest.TestCase):
+    def test_hard_noglitches_beatable(self):
+        for difficulty in ('hard', 'expert'):
+            with self.subTest(difficulty=difficulty):
+                args = parse_arguments(shlex.split(f'--suppress_rom --shuffle vanilla --difficulty {difficulty} '
+                                                   f'--outputpath {tempfile.mkdtemp()}'))
+                args.dark_room_logic = {1: 'lamp'}
+                world = Main.main(args, 2)
+                self.assertTrue(world.can_beat_game())
+                self.assertIn(('Silver Bow', 1), world.get_all_state().prog_items)
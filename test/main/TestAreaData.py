@@ -0,0 +1,42 @@
+import shlex
+import tempfile
+import unittest
+
+import Main
+from BaseClasses import RegionType
+from EntranceRandomizer import parse_arguments
+
+
+def get_entrance_to_region(region):
+    """How generate looked up the main entrance of a region before get_main_entrances."""
+    for entrance in region.entrances:
+        if entrance.parent_region.type in (RegionType.DarkWorld, RegionType.LightWorld):
+            return entrance
+    for entrance in region.entrances:
+        return get_entrance_to_region(entrance.parent_region)
+
+
+class TestAreaData(unittest.TestCase):
+    def setUp(self):
+        args = parse_arguments(shlex.split(f'--suppress_rom --multi 3 --outputpath {tempfile.mkdtemp()}'))
+        args.shuffle = {1: 'vanilla', 2: 'crossed', 3: 'insanity'}
+        args.mode = {1: 'open', 2: 'inverted', 3: 'open'}
+        args.dark_room_logic = {1: 'lamp', 2: 'lamp', 3: 'lamp'}
+        self.world = Main.create_world(args, 1234)
+        Main.fill_world(self.world, args)
+        self.main_entrances = Main.get_main_entrances(self.world)
+
+    def test_main_entrances_match_recursive_lookup(self):
+        self.assertEqual(set(self.main_entrances), set(self.world.regions))
+        for region in self.world.regions:
+            self.assertIs(self.main_entrances[region], get_entrance_to_region(region), region)
+
+    def test_area_data(self):
+        er_hint_data = Main.get_er_hint_data(self.world, self.main_entrances)
+        self.assertEqual(set(er_hint_data), {2, 3})
+        self.assertTrue(er_hint_data[2])
+        checks_in_area = Main.get_checks_in_area(self.world, self.main_entrances)
+        for player in (1, 2, 3):
+            areas = checks_in_area[player]
+            self.assertEqual(areas['Total'], sum(len(areas[area]) for area in Main.ordered_areas[:-1]))
+            self.assertTrue(areas['Light World'] and areas['Dark World'] and areas['Eastern Palace'])
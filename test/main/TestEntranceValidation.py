@@ -0,0 +1,113 @@
+import shlex
+import tempfile
+import unittest
+from unittest import mock
+
+import Main
+from EntranceRandomizer import parse_arguments
+from Fill import FillError
+from Rules import set_rule
+
+
+def cut_off_region(world, player: int, name: str):
+    """Connects every entrance into the named region to Links House instead."""
+    region = world.get_region(name, player)
+    for entrance in list(region.entrances):
+        region.entrances.remove(entrance)
+        entrance.connect(world.get_region('Links House', player))
+
+
+def sabotage(region_name, calls=1):
+    """link_player_entrances, cutting off the region for the first calls of player 2."""
+    link_player_entrances = Main.link_player_entrances
+    remaining = [calls]
+
+    def link(world, player):
+        link_player_entrances(world, player)
+        if player == 2 and remaining[0]:
+            remaining[0] -= 1
+            cut_off_region(world, player, region_name)
+    return link
+
+
+class TestEntranceValidation(unittest.TestCase):
+    def setUp(self):
+        self.args = parse_arguments(shlex.split(f'--suppress_rom --multi 2 --shuffle full --accessibility locations '
+                                                f'--outputpath {tempfile.mkdtemp()}'))
+        self.args.dark_room_logic = {1: 'lamp', 2: 'lamp'}
+
+    def test_valid_shuffle_kept(self):
+        with mock.patch.object(Main, '_build_player_world') as build:
+            world = Main.create_world(self.args, 1234)
+        build.assert_not_called()
+        self.assertEqual(Main.unreachable_required_locations(world, 2), [])
+
+    def test_valid_shuffle_kept_on_hard(self):
+        for difficulty in ('hard', 'expert'):
+            with self.subTest(difficulty=difficulty):
+                self.args.difficulty = {1: difficulty, 2: difficulty}
+                with mock.patch.object(Main, '_build_player_world') as build:
+                    world = Main.create_world(self.args, 1234)
+                build.assert_not_called()
+                self.assertEqual(Main.unreachable_required_locations(world, 1), [])
+                Main.fill_world(world, self.args)
+                self.assertTrue(world.can_beat_game())
+
+    def test_location_rules_not_blamed_on_shuffle(self):
+        self.args.accessibility = {1: 'items', 2: 'items'}
+        world = Main.create_world(self.args, 1234)
+        set_rule(world.get_location('Ganon', 2), lambda state: False)
+        self.assertEqual(Main.unreachable_required_locations(world, 2), [])
+
+    def test_unreachable_locations_found(self):
+        world = Main.create_world(self.args, 1234)
+        cut_off_region(world, 2, 'Eastern Palace')
+        world.state = Main.CollectionState(world)
+        unreachable = Main.unreachable_required_locations(world, 2)
+        self.assertIn(world.get_location('Eastern Palace - Boss', 2), unreachable)
+        self.assertTrue(all(location.player == 2 for location in unreachable))
+        self.assertEqual(Main.unreachable_required_locations(world, 1), [])
+
+    def test_only_goal_required_without_locations_accessibility(self):
+        self.args.accessibility = {1: 'items', 2: 'items'}
+        world = Main.create_world(self.args, 1234)
+        cut_off_region(world, 2, 'Eastern Palace')
+        world.state = Main.CollectionState(world)
+        self.assertEqual(Main.unreachable_required_locations(world, 2), [])
+
+    def test_unusable_shuffle_built_again(self):
+        with mock.patch.object(Main, 'link_player_entrances', sabotage('Eastern Palace')):
+            world = Main.create_world(self.args, 1234)
+        self.assertEqual(Main.unreachable_required_locations(world, 2), [])
+        self.assertEqual(len(world.get_regions(2)), len(world.get_regions(1)))
+        self.assertEqual(sum(region.player == 2 for region in world.regions), len(world.get_regions(2)))
+        self.assertEqual(sum(item.player == 2 for item in world.itempool),
+                         sum(item.player == 1 for item in world.itempool))
+        self.assertTrue(all(entrance.player != 2 or entrance.connected_region.world is world
+                            for region in world.regions for entrance in region.exits))
+        Main.fill_world(world, self.args)
+        self.assertTrue(world.can_beat_game())
+        world.spoiler.parse_data()
+        self.assertTrue(any(key[2] == 2 for key in world.spoiler.entrances))
+
+    def test_rejected_shuffle_leaves_nothing_behind(self):
+        with mock.patch.object(Main, 'link_player_entrances', sabotage('Eastern Palace')):
+            world = Main.create_world(self.args, 1234)
+        regions = set(world.regions)
+        locations = set(world.get_locations())
+        for player in (1, 2):
+            self.assertEqual(set(world.get_regions(player)), {region for region in regions if region.player == player})
+            self.assertLessEqual(set(world.event_locations[player]), locations)
+            self.assertLessEqual(set(world.event_log[player]), locations)
+            self.assertEqual(set(world.get_unfilled_locations(player)) | set(world.get_filled_locations(player)),
+                             {location for location in locations if location.player == player})
+        self.assertLessEqual(set(world._location_cache.values()), locations)
+        self.assertLessEqual({entrance.parent_region for entrance in world._entrance_cache.values()}, regions)
+        self.assertLessEqual({id(dungeon) for dungeon in world._dungeon_cache.values()}, set(map(id, world.dungeons)))
+        self.assertLessEqual({location for item_locations in world._item_locations.values()
+                              for location in item_locations}, locations)
+
+    def test_gives_up_after_attempts(self):
+        with mock.patch.object(Main, 'link_player_entrances', sabotage('Eastern Palace', calls=10)):
+            with self.assertRaises(FillError):
+                Main.create_world(self.args, 1234)
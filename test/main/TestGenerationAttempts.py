@@ -0,0 +1,79 @@
+import logging
+import multiprocessing
+import shlex
+import tempfile
+import unittest
+from unittest import mock
+
+import Main
+from EntranceRandomizer import parse_arguments
+from Fill import FillError
+
+
+def fail_seed(failing_seed):
+    distribute_items_restrictive = Main.distribute_items_restrictive
+
+    def fill(world, *args):
+        if world.seed == failing_seed:
+            raise FillError('Test failure')
+        return distribute_items_restrictive(world, *args)
+    return fill
+
+
+class TestGenerationAttempts(unittest.TestCase):
+    def setUp(self):
+        self.args = parse_arguments(shlex.split(f'--suppress_rom --skip_playthrough --generation_attempts 3 '
+                                                f'--outputpath {tempfile.mkdtemp()}'))
+        self.args.dark_room_logic = {1: 'lamp'}
+
+    def test_derived_seeds(self):
+        seeds = Main.derive_seeds(1234, 3)
+        self.assertEqual(seeds[0], 1234)
+        self.assertEqual(seeds, Main.derive_seeds(1234, 3))
+        self.assertEqual(len(set(seeds)), 3)
+
+    def test_seed_that_generates(self):
+        world = Main.main(self.args, 1234)
+        self.assertEqual(world.seed, 1234)
+        self.assertIsNone(world.derived_from_seed)
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', 'attempts need to inherit the patched fill')
+    def test_failing_seed_uses_derived_seed(self):
+        with mock.patch.object(Main, 'distribute_items_restrictive', fail_seed(1234)):
+            world = Main.main(self.args, 1234)
+        self.assertIn(world.seed, Main.derive_seeds(1234, 3)[1:])
+        self.assertEqual(world.derived_from_seed, 1234)
+        world.spoiler.parse_data()
+        self.assertEqual(world.spoiler.metadata['derived_from_seed'], 1234)
+
+    def test_attempt_writes_nothing(self):
+        self.args.timing = True
+        self.args.profile = 'cprofile'
+        self.args.json_spoiler = True
+        self.addCleanup(logging.disable, logging.NOTSET)
+        with mock.patch.object(Main, 'main') as main:
+            self.assertEqual(Main._generation_attempt(self.args, 1234), 1234)
+        attempt_args = main.call_args[0][0]
+        self.assertFalse(attempt_args.timing or attempt_args.profile or attempt_args.json_spoiler)
+        self.assertTrue(attempt_args.suppress_rom and attempt_args.skip_playthrough)
+        self.assertTrue(self.args.timing)
+
+    def test_attempt_error_moves_on(self):
+        self.addCleanup(logging.disable, logging.NOTSET)
+        with mock.patch.object(Main, 'main', side_effect=RuntimeError('Test failure')):
+            with self.assertLogs(level='ERROR') as logs:
+                self.assertIsNone(Main._generation_attempt(self.args, 1234))
+        self.assertIn('1234', logs.output[0])
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', 'attempts need to inherit the patched fill')
+    def test_failing_attempt_skipped(self):
+        seeds = Main.derive_seeds(1234, 3)
+        distribute_items_restrictive = fail_seed(1234)
+
+        def fill(world, *args):
+            if world.seed == seeds[1]:
+                raise RuntimeError('Test failure')
+            return distribute_items_restrictive(world, *args)
+        with mock.patch.object(Main, 'distribute_items_restrictive', fill):
+            world = Main.main(self.args, 1234)
+        self.assertEqual(world.seed, seeds[2])
@@ -0,0 +1,57 @@
+import glob
+import json
+import os
+import shlex
+import tempfile
+import unittest
+from unittest import mock
+
+import BaseClasses
+import Main
+from EntranceRandomizer import parse_arguments
+
+
+class TestGenerationStats(unittest.TestCase):
+    def setUp(self):
+        self.outputpath = tempfile.mkdtemp()
+        self.args = parse_arguments(shlex.split(f'--suppress_rom --multi 2 --outputpath {self.outputpath}'))
+        self.args.dark_room_logic = {1: 'lamp', 2: 'lamp'}
+
+    def test_timing_file(self):
+        self.args.timing = True
+        world = Main.main(self.args, 1234)
+        with open(os.path.join(self.outputpath, 'BM_1234_Timing.json')) as f:
+            timing = json.load(f)
+        stages = [stage['name'] for stage in timing['stages']]
+        self.assertEqual(stages, ['setup', 'create regions', 'link entrances', 'item pool', 'access rules',
+                                  'validate entrances', 'dungeon prizes', 'dungeon items', 'fill',
+                                  'progression balancing', 'playthrough', 'roms', 'multidata'])
+        self.assertEqual(timing['stages'], json.loads(json.dumps(world.generation_stats.stages)))
+        fill = timing['stages'][stages.index('fill')]
+        for counter in ('entrance rule evaluations', 'location rule evaluations', 'state copies', 'sweeps',
+                        'update_reachable_regions', 'fill_restrictive'):
+            self.assertGreater(fill['counters'][counter], 0, counter)
+        self.assertGreater(fill['times']['fill_restrictive'], 0)
+        for stage in ('dungeon prizes', 'dungeon items'):
+            self.assertGreater(timing['stages'][stages.index(stage)]['counters']['fill_restrictive'], 0, stage)
+        self.assertGreaterEqual(timing['wall'], sum(stage['wall'] for stage in timing['stages']))
+        self.assertEqual(timing['counters']['sweeps'],
+                         sum(stage['counters'].get('sweeps', 0) for stage in timing['stages']))
+
+    def test_counted_functions_are_restored(self):
+        self.args.timing = True
+        update_reachable_regions = BaseClasses.CollectionState.update_reachable_regions
+        with mock.patch.object(Main, 'create_playthrough', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                Main.main(self.args, 1234)
+        self.assertIs(BaseClasses.CollectionState.update_reachable_regions, update_reachable_regions)
+        Main.main(self.args, 1234)
+        self.assertIs(BaseClasses.CollectionState.update_reachable_regions, update_reachable_regions)
+
+    def test_profile_per_stage(self):
+        self.args.profile = 'cprofile'
+        Main.main(self.args, 1234)
+        self.assertFalse(os.path.exists(os.path.join(self.outputpath, 'BM_1234_Timing.json')))
+        profiles = sorted(os.path.basename(path) for path in glob.glob(os.path.join(self.outputpath, '*.prof')))
+        self.assertIn('BM_1234_09_fill.prof', profiles)
+        self.assertEqual(len(profiles), 13)
@@ -0,0 +1,28 @@
+import shlex
+import tempfile
+import unittest
+
+import Main
+from EntranceRandomizer import parse_arguments
+
+
+class TestParallelSetup(unittest.TestCase):
+    def setUp(self):
+        self.args = parse_arguments(shlex.split(f'--suppress_rom --skip_playthrough --parallel_setup --multi 3 '
+                                                f'--outputpath {tempfile.mkdtemp()}'))
+        self.args.dark_room_logic = {player: 'lamp' for player in range(1, 4)}
+
+    def placements(self, world):
+        return [(location.name, location.player, location.item.name, location.item.player)
+                for location in world.get_locations() if location.item]
+
+    def test_parallel_world_is_beatable(self):
+        world = Main.main(self.args, 1234)
+        self.assertEqual(world.get_unfilled_locations(), [])
+        self.assertTrue(world.can_beat_game())
+        for player in range(1, 4):
+            self.assertTrue(world.get_regions(player))
+            self.assertTrue(all(region.world is world for region in world.get_regions(player)))
+
+    def test_parallel_setup_is_deterministic(self):
+        self.assertEqual(self.placements(Main.main(self.args, 1234)), self.placements(Main.main(self.args, 1234)))
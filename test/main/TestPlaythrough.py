@@ -0,0 +1,84 @@
+import random
+import shlex
+import tempfile
+import unittest
+
+import Main
+from EntranceRandomizer import parse_arguments
+
+
+def cull_one_by_one(candidates, can_beat_game):
+    """Culling as create_playthrough did it before cull_required, one candidate at a time."""
+    removed = set()
+    for candidate in candidates:
+        removed.add(candidate)
+        if not can_beat_game(removed):
+            removed.discard(candidate)
+    return [candidate for candidate in candidates if candidate not in removed]
+
+
+class TestCullRequired(unittest.TestCase):
+    def cull(self, candidates, can_beat_game, may_beat_game=lambda removed: True):
+        removed = set()
+        return Main.cull_required(candidates, removed.update, removed.difference_update,
+                                  lambda: can_beat_game(removed), lambda block: may_beat_game(removed))
+
+    def test_matches_one_by_one(self):
+        generator = random.Random(0)
+        candidates = list(range(40))
+        for _ in range(50):
+            # beatable while some item of each requirement remains, removing items never makes it beatable again
+            requirements = [set(generator.sample(candidates, generator.randint(1, 4))) for _ in range(8)]
+
+            def can_beat_game(removed):
+                return all(requirement - removed for requirement in requirements)
+
+            expected = cull_one_by_one(candidates, can_beat_game)
+            with self.subTest(requirements=requirements):
+                self.assertEqual(self.cull(candidates, can_beat_game), expected)
+                self.assertEqual(self.cull(candidates, can_beat_game, can_beat_game), expected)
+
+    def test_nothing_required(self):
+        checks = []
+        self.assertEqual(self.cull(list(range(100)), lambda removed: checks.append(len(removed)) or True), [])
+        self.assertLess(len(checks), 10)
+
+
+class TestFilledWorld(unittest.TestCase):
+    def setUp(self):
+        args = parse_arguments(shlex.split(f'--suppress_rom --multi 2 --outputpath {tempfile.mkdtemp()}'))
+        args.dark_room_logic = {1: 'lamp', 2: 'lamp'}
+        self.world = Main.create_world(args, 1234)
+        Main.fill_world(self.world, args)
+
+    def test_requirement_bound_rejects_only_required_items(self):
+        bound = Main.RequirementBound(self.world)
+        self.assertTrue(bound.can_beat_game({1, 2}))
+        rejected = 0
+        for location in self.world.get_filled_locations():
+            if not location.item.advancement:
+                continue
+            item, location.item = location.item, None
+            if not bound.can_beat_game({item.player}):
+                rejected += 1
+                self.assertFalse(self.world.can_beat_game(), location)
+            location.item = item
+        self.assertGreater(rejected, 0)
+
+    def test_create_playthrough_leaves_world_unchanged(self):
+        placements = [(location, location.item) for location in self.world.get_locations()]
+        precollected_items = list(self.world.precollected_items)
+        state = self.world.state
+        Main.create_playthrough(self.world)
+        self.assertEqual([(location, location.item) for location in self.world.get_locations()], placements)
+        self.assertEqual(self.world.precollected_items, precollected_items)
+        self.assertIs(self.world.state, state)
+        self.assertTrue(self.world.required_locations)
+        self.assertEqual(len(self.world.required_locations), sum(map(len, list(self.world.spoiler.playthrough.values())[1:])))
+
+    def test_only_playthrough_records_paths(self):
+        self.assertIsNone(self.world.state.path)
+        Main.create_playthrough(self.world)
+        self.assertIsNone(self.world.state.path)
+        for name, player in self.world.required_locations:
+            self.assertTrue(self.world.spoiler.paths[str(self.world.get_location(name, player))])
@@ -0,0 +1,103 @@
+import concurrent.futures
+import json
+import os
+import shlex
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import Main
+from BaseClasses import SpoilerWriter
+from EntranceRandomizer import parse_arguments
+
+
+def wait_written(writer, timeout=10):
+    """Waits until every section submitted to writer is written, as the executor threads write them on their own."""
+    deadline = time.monotonic() + timeout
+    while any(writer.pending) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestSpoiler(unittest.TestCase):
+    def setUp(self):
+        self.outputpath = tempfile.mkdtemp()
+        args = parse_arguments(shlex.split(f'--suppress_rom --multi 2 --shuffle crossed --shufflebosses basic '
+                                           f'--outputpath {self.outputpath}'))
+        args.dark_room_logic = {1: 'lamp', 2: 'lamp'}
+        self.world = Main.create_world(args, 1234)
+        Main.fill_world(self.world, args)
+        Main.create_playthrough(self.world)
+        self.spoiler = self.world.spoiler
+
+    def path(self, name):
+        return os.path.join(self.outputpath, name)
+
+    def read(self, name):
+        with open(self.path(name), encoding='utf-8-sig') as f:
+            return f.read()
+
+    def set_hashes(self):
+        for player in (1, 2):
+            self.spoiler.hashes[player, 0] = f'Hash {player}'
+
+    def test_locations_listed_once(self):
+        self.spoiler.parse_data()
+        listed = [location for area in self.spoiler.locations.values() for location in area]
+        self.assertEqual(sorted(listed), sorted(str(location) for location in self.world.get_locations()))
+        self.assertIn('Eastern Palace (Player2)', self.spoiler.locations)
+
+    def test_json_lines_match_json(self):
+        self.set_hashes()
+        self.spoiler.to_json_lines(self.path('spoiler.jsonl'))
+        sections = {}
+        with open(self.path('spoiler.jsonl')) as f:
+            for line in f:
+                sections.update(json.loads(line))
+        self.assertEqual(sections, json.loads(self.spoiler.to_json()))
+        self.assertIn('Hashes', sections)
+
+    def test_writer_matches_to_file(self):
+        self.set_hashes()
+        self.spoiler.to_file(self.path('expected.txt'))
+        self.spoiler.to_json_lines(self.path('expected.jsonl'))
+        SpoilerWriter(self.spoiler, self.path('inline.txt')).close()
+        with concurrent.futures.ThreadPoolExecutor() as pool:
+            SpoilerWriter(self.spoiler, self.path('pool.txt'), self.path('pool.jsonl'), pool).close()
+        self.assertEqual(self.read('inline.txt'), self.read('expected.txt'))
+        self.assertEqual(self.read('pool.txt'), self.read('expected.txt'))
+        self.assertEqual(self.read('pool.jsonl'), self.read('expected.jsonl'))
+
+    def test_writer_waits_for_hashes(self):
+        with concurrent.futures.ThreadPoolExecutor() as pool:
+            writer = SpoilerWriter(self.spoiler, self.path('spoiler.txt'), self.path('spoiler.jsonl'), pool)
+            wait_written(writer)
+            for outfile, _ in writer.outputs:
+                outfile.flush()
+            self.assertTrue(self.read('spoiler.txt').startswith('ALttP Berserker'))
+            self.assertNotIn('Hash', self.read('spoiler.txt'))
+            self.assertIn('"Entrances"', self.read('spoiler.jsonl'))
+            self.assertNotIn('"Hashes"', self.read('spoiler.jsonl'))
+            self.set_hashes()
+            writer.hashes_done()
+            writer.close()
+        self.assertIn('Hash 2', self.read('spoiler.txt'))
+        self.assertIn('"Hashes"', self.read('spoiler.jsonl'))
+
+    def test_abort_removes_files(self):
+        with concurrent.futures.ThreadPoolExecutor() as pool:
+            writer = SpoilerWriter(self.spoiler, self.path('spoiler.txt'), self.path('spoiler.jsonl'), pool)
+            writer.abort()
+        self.assertTrue(writer.closed)
+        self.assertTrue(all(outfile.closed for outfile, _ in writer.outputs))
+        self.assertFalse(os.path.exists(self.path('spoiler.txt')) or os.path.exists(self.path('spoiler.jsonl')))
+
+    def test_failed_generation_leaves_no_spoiler(self):
+        args = parse_arguments(shlex.split(f'--suppress_rom --create_spoiler --json_spoiler '
+                                           f'--outputpath {self.outputpath}'))
+        args.dark_room_logic = {1: 'lamp'}
+        with mock.patch.object(SpoilerWriter, 'hashes_done', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                Main.main(args, 1234)
+        self.assertFalse(os.path.exists(self.path('BM_1234_Spoiler.txt')))
+        self.assertFalse(os.path.exists(self.path('BM_1234_Spoiler.jsonl')))
@@ -0,0 +1,44 @@
+import shlex
+import tempfile
+import unittest
+
+import Main
+from EntranceRandomizer import parse_arguments
+
+
+def placements(world):
+    return [(location.name, location.player, location.item.name, location.item.player)
+            for location in world.get_locations() if location.item]
+
+
+class TestWorldSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.args = parse_arguments(shlex.split(f'--suppress_rom --multi 2 --mode inverted '
+                                                f'--outputpath {tempfile.mkdtemp()}'))
+        self.args.dark_room_logic = {1: 'lamp', 2: 'lamp'}
+        self.world = Main.create_world(self.args, 1234)
+        self.events = placements(self.world)
+        self.snapshot = Main.WorldSnapshot(self.world)
+
+    def test_fill_matches_fresh_world(self):
+        Main.fill_world(self.world, self.args)
+        self.assertEqual(placements(self.snapshot.fill(self.args)), placements(self.world))
+
+    def test_fills(self):
+        worlds = dict(self.snapshot.fills(self.args, range(3)))
+        self.assertEqual(list(worlds), [0, 1, 2])
+        for world in worlds.values():
+            self.assertTrue(world.can_beat_game())
+            self.assertEqual(world.get_unfilled_locations(), [])
+        self.assertNotEqual(placements(worlds[0]), placements(worlds[1]))
+        self.assertEqual(placements(worlds[0]), placements(self.snapshot.fill(self.args, 0)))
+        self.assertEqual(placements(self.world), self.events)
+
+    def test_restored_rules_use_restored_world(self):
+        world = self.snapshot.restore()
+        self.assertTrue(world.get_location('Ether Tablet', 1).can_reach(world.get_all_state(True)))
+        originals = {id(self.world)} | {id(region) for region in self.world.regions} | \
+                    {id(location) for location in self.world.get_locations()}
+        for spot in world.get_locations() + world.get_entrances():
+            for cell in spot.access_rule.__closure__ or ():
+                self.assertNotIn(id(cell.cell_contents), originals)
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import Rom
+from Rom import LocalRom
+
+
+class TestBaseRom(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.directory, 'data'))
+        open(os.path.join(self.directory, 'data', 'basepatch.bmbp'), 'wb').close()
+        self.base_rom = bytes(range(256)) * 16
+        with open(os.path.join(self.directory, 'basepatch.sfc'), 'wb') as stream:
+            stream.write(self.base_rom)
+        patches = (mock.patch.object(Rom, 'local_path', lambda *path: os.path.join(self.directory, *path)),
+                   mock.patch.object(LocalRom, 'verify', mock.Mock(return_value=True)),
+                   mock.patch.object(Rom.get_patched_base_rom_bytes, 'base_rom_bytes', None, create=True))
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_base_rom_loaded_once(self):
+        first = LocalRom('unused.sfc')
+        second = LocalRom('unused.sfc')
+        LocalRom.verify.assert_called_once()
+        self.assertEqual(first.buffer, self.base_rom)
+        self.assertIsInstance(first.buffer, bytearray)
+        self.assertIs(first.orig_buffer, second.orig_buffer)
+
+    def test_roms_patched_independently(self):
+        first = LocalRom('unused.sfc')
+        second = LocalRom('unused.sfc')
+        first.write_byte(0, 0xFF)
+        self.assertEqual(second.read_byte(0), 0)
+        self.assertEqual(first.orig_buffer[0], 0)
+        self.assertEqual(LocalRom('unused.sfc').buffer, self.base_rom)
+
+    def test_missing_base_patch(self):
+        LocalRom.verify.return_value = False
+        with mock.patch.object(Rom.Patch, 'create_rom_bytes', return_value=({}, '', bytearray(16))) as patch:
+            with self.assertRaises(RuntimeError):
+                LocalRom('unused.sfc')
+            with self.assertRaises(RuntimeError):
+                LocalRom('unused.sfc')
+        self.assertEqual(patch.call_count, 2)
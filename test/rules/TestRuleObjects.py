@@ -0,0 +1,72 @@
+import pickle
+import unittest
+
+from BaseClasses import World, CollectionState
+from ItemPool import difficulties
+from Items import ItemFactory
+from RuleObjects import Always, Never, Has, HasCount, And, Or, Not, Function, as_rule, compile_rule, \
+    combine_rules, ItemRule, dumps
+
+
+class TestRuleObjects(unittest.TestCase):
+    def setUp(self):
+        self.world = World(1, {1: 'vanilla'}, {1: 'noglitches'}, {1: 'open'}, {1: 'random'}, {1: 'normal'},
+                           {1: 'normal'}, {1: False}, {1: 'on'}, {1: 'ganon'}, 'balanced', {1: 'items'},
+                           True, {1: False}, False, None, {1: False})
+        self.world.difficulty_requirements[1] = difficulties['normal']
+        self.state = CollectionState(self.world)
+        for item in ItemFactory(['Lamp', 'Progressive Sword', 'Progressive Sword'], 1):
+            self.state.collect(item, True)
+
+    def test_evaluation(self):
+        self.assertTrue(compile_rule(Has('Lamp', 1))(self.state))
+        self.assertFalse(compile_rule(Has('Hammer', 1))(self.state))
+        self.assertTrue(compile_rule(HasCount('Fighter Sword', 1, 1) & Has('Master Sword', 1))(self.state))
+        self.assertTrue(compile_rule(Has('Hammer', 1) | Not(Has('Hookshot', 1)))(self.state))
+        self.assertFalse(compile_rule(Function(lambda state: state.has('Hammer', 1)) & Has('Lamp', 1))(self.state))
+
+    def test_simplify(self):
+        lamp, hammer = Has('Lamp', 1), Has('Hammer', 1)
+        self.assertEqual(And(lamp, Always, And(hammer, lamp)).simplify(), And(lamp, hammer))
+        self.assertEqual(And(lamp, Never).simplify(), Never)
+        self.assertEqual(Or(lamp, Or(Always, hammer)).simplify(), Always)
+        self.assertEqual(Or(Never, lamp).simplify(), lamp)
+        self.assertEqual(Not(Not(lamp)).simplify(), lamp)
+        self.assertEqual(HasCount('Lamp', 1, 0).simplify(), Always)
+
+    def test_combine_flattens(self):
+        rule = compile_rule(Has('Lamp', 1))
+        rule = combine_rules(rule, Has('Hammer', 1))
+        rule = combine_rules(rule, Has('Hookshot', 1))
+        self.assertEqual(rule.rule, And(Has('Hookshot', 1), Has('Hammer', 1), Has('Lamp', 1)))
+        self.assertEqual(set(rule.dependencies), {('Lamp', 1), ('Hammer', 1), ('Hookshot', 1)})
+        rule = combine_rules(rule, Always, 'or')
+        self.assertEqual(rule.rule, Always)
+
+    def test_escape(self):
+        function = lambda state: True
+        self.assertIs(compile_rule(function), function)
+        self.assertEqual(as_rule(function), Function(function))
+        self.assertIsNone(combine_rules(function, Has('Lamp', 1)).dependencies)
+
+    def test_item_rule(self):
+        lamp, hammer = ItemFactory(['Lamp', 'Hammer'], 1)
+        rule = ItemRule.extend(lambda item: True, 1, {'Lamp'})
+        self.assertFalse(rule(lamp))
+        self.assertTrue(rule(hammer))
+        rule = ItemRule.extend(rule, rule=lambda item: item.name != 'Hammer')
+        self.assertFalse(rule(hammer))
+
+    def test_dumps_closures(self):
+        world = self.world
+
+        def recursive(count):
+            return count if count < 1 else recursive(count - 1) + 1
+        rules = {'world': world, 'closure': lambda state: state.world is world, 'recursive': recursive,
+                 'compiled': compile_rule(Has('Lamp', 1) & Has('Hammer', 1))}
+        loaded = pickle.loads(dumps(rules))
+        self.assertIsNot(loaded['world'], world)
+        self.assertIs(loaded['closure'].__closure__[0].cell_contents, loaded['world'])
+        self.assertEqual(loaded['recursive'](3), 3)
+        self.assertEqual(loaded['compiled'].rule, rules['compiled'].rule)
+        self.assertFalse(loaded['compiled'](self.state))
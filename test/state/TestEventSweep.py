@@ -0,0 +1,59 @@
+import unittest
+
+from BaseClasses import World, CollectionState
+from Dungeons import create_dungeons, get_dungeon_item_pool
+from EntranceShuffle import link_entrances
+from InvertedRegions import mark_dark_world_regions
+from ItemPool import difficulties, generate_itempool
+from Items import ItemFactory
+from Regions import create_regions, create_shops
+from Rules import set_rules
+
+
+class TestEventSweep(unittest.TestCase):
+    def setUp(self):
+        self.world = World(1, {1: 'vanilla'}, {1: 'noglitches'}, {1: 'open'}, {1: 'random'}, {1: 'normal'},
+                           {1: 'normal'}, {1: False}, {1: 'on'}, {1: 'ganon'}, 'balanced', {1: 'items'},
+                           True, {1: False}, False, None, {1: False})
+        self.world.difficulty_requirements[1] = difficulties['normal']
+        create_regions(self.world, 1)
+        create_dungeons(self.world, 1)
+        create_shops(self.world, 1)
+        link_entrances(self.world, 1)
+        generate_itempool(self.world, 1)
+        self.world.itempool.extend(get_dungeon_item_pool(self.world))
+        self.world.itempool.extend(ItemFactory(['Green Pendant', 'Red Pendant', 'Blue Pendant', 'Crystal 1',
+                                                'Crystal 2', 'Crystal 3', 'Crystal 4', 'Crystal 5', 'Crystal 6',
+                                                'Crystal 7'], 1))
+        mark_dark_world_regions(self.world, 1)
+        set_rules(self.world, 1)
+
+    def test_indexed_sweep_matches_full_sweep(self):
+        items = [item for item in self.world.itempool if item.advancement]
+        self.world.random.seed(0)
+        self.world.random.shuffle(items)
+        indexed = CollectionState(self.world)
+        for collected, item in enumerate(items, 1):
+            indexed.collect(item, True)
+            indexed.sweep_for_events()
+            full = CollectionState(self.world)
+            for previous in items[:collected]:
+                full.collect(previous, True)
+            full._sweep_locations()
+            with self.subTest(item=item.name, collected=collected):
+                self.assertEqual(indexed.events, full.events)
+
+    def test_new_events_are_picked_up(self):
+        state = CollectionState(self.world)
+        state.sweep_for_events()
+        location = self.world.get_location('Sahasrahla', 1)
+        location.item = ItemFactory('Moon Pearl', 1)
+        state.sweep_for_events()
+        self.assertNotIn(location, state.events)
+        location.event = True
+        state.sweep_for_events()
+        self.assertNotIn(location, state.events)
+        state.collect(ItemFactory('Green Pendant', 1), True)
+        state.sweep_for_events()
+        self.assertIn(location, state.events)
+        self.assertTrue(state.has('Moon Pearl', 1))
@@ -0,0 +1,51 @@
+import unittest
+
+from BaseClasses import World, CollectionState
+from Dungeons import create_dungeons, get_dungeon_item_pool
+from EntranceShuffle import link_entrances
+from InvertedRegions import mark_dark_world_regions
+from ItemPool import difficulties, generate_itempool
+from Items import ItemFactory
+from Regions import create_regions, create_shops
+from Rules import set_rules
+
+
+class TestIncrementalReachability(unittest.TestCase):
+    def setUp(self):
+        self.world = World(1, {1: 'vanilla'}, {1: 'noglitches'}, {1: 'open'}, {1: 'random'}, {1: 'normal'},
+                           {1: 'normal'}, {1: False}, {1: 'on'}, {1: 'ganon'}, 'balanced', {1: 'items'},
+                           True, {1: False}, False, None, {1: False})
+        self.world.difficulty_requirements[1] = difficulties['normal']
+        create_regions(self.world, 1)
+        create_dungeons(self.world, 1)
+        create_shops(self.world, 1)
+        link_entrances(self.world, 1)
+        generate_itempool(self.world, 1)
+        self.world.itempool.extend(get_dungeon_item_pool(self.world))
+        self.world.itempool.extend(ItemFactory(['Green Pendant', 'Red Pendant', 'Blue Pendant', 'Crystal 1',
+                                                'Crystal 2', 'Crystal 3', 'Crystal 4', 'Crystal 5', 'Crystal 6',
+                                                'Crystal 7'], 1))
+        mark_dark_world_regions(self.world, 1)
+        set_rules(self.world, 1)
+
+    def test_matches_full_update(self):
+        items = [item for item in self.world.itempool if item.advancement or item.smallkey or item.bigkey]
+        self.world.random.seed(0)
+        self.world.random.shuffle(items)
+        incremental = CollectionState(self.world)
+        for collected, item in enumerate(items, 1):
+            incremental.collect(item, True)
+            full = CollectionState(self.world)
+            for previous in items[:collected]:
+                full.collect(previous, True)
+            full.update_reachable_regions(1)
+            with self.subTest(item=item.name, collected=collected):
+                incremental.can_reach('Menu', 'Region', 1)
+                self.assertEqual(incremental.reachable_regions[1], full.reachable_regions[1])
+                self.assertEqual(self.blocked(incremental), self.blocked(full))
+
+    @staticmethod
+    def blocked(state):
+        # connections into regions that were reached some other way are only dropped lazily
+        return {connection for connection in state.blocked_connections[1]
+                if connection.connected_region not in state.reachable_regions[1]}
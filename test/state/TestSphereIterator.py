@@ -0,0 +1,99 @@
+import unittest
+
+from BaseClasses import World, CollectionState, SphereIterator
+from Dungeons import create_dungeons, fill_dungeons_restrictive
+from EntranceShuffle import link_entrances
+from Fill import distribute_items_restrictive
+from InvertedRegions import mark_dark_world_regions
+from ItemPool import difficulties, generate_itempool, fill_prizes
+from Regions import create_regions, create_shops
+from Rules import set_rules
+
+
+def scan_spheres(state, locations):
+    """Spheres as they were built before SphereIterator, by testing every remaining location each time."""
+    spheres = []
+    locations = list(locations)
+    while locations:
+        sphere = [location for location in locations if location.can_reach(state)]
+        if not sphere:
+            break
+        for location in sphere:
+            locations.remove(location)
+            state.collect(location.item, True, location)
+        spheres.append(sphere)
+    return spheres
+
+
+class TestSphereIterator(unittest.TestCase):
+    def setUp(self):
+        self.world = World(2, {1: 'vanilla', 2: 'vanilla'}, {1: 'noglitches', 2: 'noglitches'}, {1: 'open', 2: 'open'},
+                           {1: 'random', 2: 'random'}, {1: 'normal', 2: 'normal'}, {1: 'normal', 2: 'normal'},
+                           {1: False, 2: False}, {1: 'on', 2: 'on'}, {1: 'ganon', 2: 'ganon'}, 'balanced',
+                           {1: 'items', 2: 'items'}, True, {1: False, 2: False}, False, None, {1: False, 2: False})
+        for player in (1, 2):
+            self.world.difficulty_requirements[player] = difficulties['normal']
+            create_regions(self.world, player)
+            create_dungeons(self.world, player)
+            create_shops(self.world, player)
+            link_entrances(self.world, player)
+        for player in (1, 2):
+            generate_itempool(self.world, player)
+            mark_dark_world_regions(self.world, player)
+        for player in (1, 2):
+            set_rules(self.world, player)
+        self.world.random.seed(0)
+        fill_prizes(self.world)
+        fill_dungeons_restrictive(self.world)
+        distribute_items_restrictive(self.world, True)
+
+    def spheres(self, state, locations, until_beaten=False):
+        spheres = []
+        for sphere in SphereIterator(state, locations, until_beaten):
+            for location in sphere:
+                state.collect(location.item, True, location)
+            spheres.append(sphere)
+        return spheres
+
+    def partial_state(self, spheres):
+        state = CollectionState(self.world)
+        for sphere in spheres:
+            for location in sphere:
+                state.collect(location.item, True, location)
+        return state
+
+    def test_spheres_match_full_scan(self):
+        locations = self.world.get_filled_locations()
+        self.world.random.shuffle(locations)
+        expected = scan_spheres(CollectionState(self.world), locations)
+        self.assertGreater(len(expected), 1)
+        self.assertEqual(self.spheres(CollectionState(self.world), locations), expected)
+
+    def test_progress_spheres_match_full_scan(self):
+        locations = [location for location in self.world.get_filled_locations() if location.item.advancement]
+        expected = scan_spheres(CollectionState(self.world), locations)
+        self.assertEqual(self.spheres(CollectionState(self.world), locations), expected)
+
+    def test_stops_when_beaten(self):
+        locations = self.world.get_filled_locations()
+        state = CollectionState(self.world)
+        spheres = self.spheres(state, locations, until_beaten=True)
+        self.assertTrue(self.world.has_beaten_game(state))
+        self.assertFalse(self.world.has_beaten_game(self.partial_state(spheres[:-1])))
+
+    def test_unreachable_locations_remain(self):
+        location = self.world.get_location('Master Sword Pedestal', 1)
+        for dependency in [l for l in self.world.get_filled_locations() if l.item.name == 'Green Pendant']:
+            dependency.item = None
+        iterator = SphereIterator(CollectionState(self.world), self.world.get_filled_locations())
+        for sphere in iterator:
+            for collected in sphere:
+                iterator.state.collect(collected.item, True, collected)
+        self.assertIn(location, iterator.remaining)
+
+    def test_can_beat_game(self):
+        self.assertTrue(self.world.can_beat_game())
+        for location in self.world.get_filled_locations():
+            if location.item.name == 'Triforce':
+                location.item = None
+        self.assertFalse(self.world.can_beat_game())
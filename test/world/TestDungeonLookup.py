@@ -0,0 +1,37 @@
+import unittest
+
+from BaseClasses import World
+from Dungeons import create_dungeons
+from Items import ItemFactory
+from Regions import create_regions
+
+
+class TestDungeonLookup(unittest.TestCase):
+    def setUp(self):
+        self.world = World(2, {1: 'vanilla', 2: 'vanilla'}, {1: 'noglitches', 2: 'noglitches'}, {1: 'open', 2: 'open'},
+                           {1: 'random', 2: 'random'}, {1: 'normal', 2: 'normal'}, {1: 'normal', 2: 'normal'},
+                           {1: False, 2: False}, {1: 'on', 2: 'on'}, {1: 'ganon', 2: 'ganon'}, 'balanced',
+                           {1: 'items', 2: 'items'}, True, {1: False, 2: False}, False, None, {1: False, 2: False})
+        create_regions(self.world, 1)
+        create_dungeons(self.world, 1)
+
+    def test_lookup_follows_new_dungeons(self):
+        dungeon = self.world.get_dungeon('Ice Palace', 1)
+        self.assertEqual((dungeon.name, dungeon.player), ('Ice Palace', 1))
+        with self.assertRaises(KeyError):
+            self.world.get_dungeon('Ice Palace', 2)
+        create_regions(self.world, 2)
+        create_dungeons(self.world, 2)
+        self.assertIs(self.world.get_dungeon('Ice Palace', 2), self.world.dungeons[-4])
+        self.assertIs(self.world._debug_get_dungeon('Ice Palace', 1), dungeon)
+
+    def test_can_fill_follows_shuffle_settings(self):
+        region = self.world.get_region('Ice Palace (Main)', 1)
+        outside = self.world.get_region('Links House', 1)
+        key = ItemFactory('Small Key (Ice Palace)', 1)
+        self.assertTrue(region.can_fill(key))
+        self.assertFalse(region.can_fill(ItemFactory('Small Key (Misery Mire)', 1)))
+        self.assertFalse(outside.can_fill(key))
+        self.world.keyshuffle[1] = True
+        self.assertTrue(outside.can_fill(key))
+        self.assertTrue(outside.can_fill(ItemFactory('Hookshot', 1)))
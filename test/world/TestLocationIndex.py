@@ -0,0 +1,71 @@
+import unittest
+
+from BaseClasses import World, CollectionState
+from Dungeons import create_dungeons, get_dungeon_item_pool
+from EntranceShuffle import link_entrances
+from InvertedRegions import mark_dark_world_regions
+from ItemPool import difficulties, generate_itempool
+from Items import ItemFactory
+from Regions import create_regions, create_shops
+from Rules import set_rules
+
+
+class TestLocationIndex(unittest.TestCase):
+    def setUp(self):
+        self.world = World(1, {1: 'vanilla'}, {1: 'noglitches'}, {1: 'open'}, {1: 'random'}, {1: 'normal'},
+                           {1: 'normal'}, {1: False}, {1: 'on'}, {1: 'ganon'}, 'balanced', {1: 'items'},
+                           True, {1: False}, False, None, {1: False})
+        self.world.difficulty_requirements[1] = difficulties['normal']
+        create_regions(self.world, 1)
+        create_dungeons(self.world, 1)
+        create_shops(self.world, 1)
+        link_entrances(self.world, 1)
+        generate_itempool(self.world, 1)
+        self.world.itempool.extend(get_dungeon_item_pool(self.world))
+        mark_dark_world_regions(self.world, 1)
+        set_rules(self.world, 1)
+
+    def assertIndexesMatchScan(self):
+        locations = self.world.get_locations()
+        self.assertEqual(self.world.get_filled_locations(), [location for location in locations if location.item])
+        self.assertEqual(self.world.get_unfilled_locations(1), [location for location in locations if not location.item])
+        self.assertEqual(self.world.get_unfilled_dungeon_locations(),
+                         [location for location in locations if not location.item and location.parent_region.dungeon])
+        for name in ('Progressive Sword', 'Moon Pearl', 'Triforce'):
+            self.assertEqual(self.world.find_items(name, 1),
+                             [location for location in locations if location.item and location.item.name == name])
+
+    def test_follows_placements(self):
+        self.assertIndexesMatchScan()
+        self.world.random.seed(0)
+        locations = self.world.get_unfilled_locations()
+        self.world.random.shuffle(locations)
+        for location, item in zip(locations, self.world.itempool):
+            if location.can_fill(self.world.state, item, False):
+                self.world.push_item(location, item, False)
+        self.assertIndexesMatchScan()
+        # direct assignments, as done when culling the playthrough
+        for location in locations[:20]:
+            location.item = None
+        locations[20].item = ItemFactory('Moon Pearl', 1)
+        self.assertIndexesMatchScan()
+
+    def test_reachable_locations(self):
+        state = CollectionState(self.world)
+        for item in ItemFactory(['Lamp', 'Progressive Glove', 'Moon Pearl', 'Hammer'], 1):
+            state.collect(item, True)
+        locations = self.world.get_locations()
+        self.assertEqual(self.world.get_reachable_locations(state, 1),
+                         [location for location in locations if location.can_reach(state)])
+        self.assertEqual(self.world.get_placeable_locations(state),
+                         [location for location in locations if not location.item and location.can_reach(state)])
+
+    def test_dungeons_created_after_indexing(self):
+        world = World(1, {1: 'vanilla'}, {1: 'noglitches'}, {1: 'open'}, {1: 'random'}, {1: 'normal'},
+                      {1: 'normal'}, {1: False}, {1: 'on'}, {1: 'ganon'}, 'balanced', {1: 'items'},
+                      True, {1: False}, False, None, {1: False})
+        create_regions(world, 1)
+        self.assertEqual(world.get_unfilled_dungeon_locations(), [])
+        create_dungeons(world, 1)
+        self.assertEqual(world.get_unfilled_dungeon_locations(),
+                         [location for location in world.get_locations() if location.parent_region.dungeon])